@@ -83,6 +83,53 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {"default": env.db()}
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Serialized recipe documents are cached in this cache, keyed by recipe version.
+# Superseded versions are never read again, and expire after the timeout.
+RECIPE_DOCUMENT_CACHE = "default"
+RECIPE_DOCUMENT_CACHE_TIMEOUT = 60 * 60
+
+# The number of recipes in each page of the recipes view.
+RECIPES_PAGE_SIZE = 100
+
+# The number of recipes loaded at a time when the recipes view streams all of
+# them (with ?stream=true).
+RECIPES_STREAM_CHUNK_SIZE = 500
+
+# The most recipes that can be requested at once from the recipes_batch view.
+RECIPES_BATCH_MAX_SIZE = 100
+
+# The most changes returned at once by the sync view. Clients keep requesting
+# until has_more is false.
+SYNC_PAGE_SIZE = 500
+
+# Whether the read-heavy views are routed to their async versions (see
+# main.async_views). Only turn on when serving with ASGI (config.asgi), where
+# they handle concurrent requests in parallel. Under WSGI each request pays for
+# the event loop without the concurrency, and they're slower than the sync
+# views (394 against 583 requests a second). It also turns off streaming:
+# streamed recipes (?stream=true) need WSGI, and are refused with a 422.
+ASYNC_READ_VIEWS = env.bool("ASYNC_READ_VIEWS", default=False)
+
+# The most memory each process uses for in-memory autocomplete indexes (see
+# main.autocomplete), in bytes. The least recently used are evicted past it, and
+# vocabularies too large for it are matched in the database instead.
+AUTOCOMPLETE_INDEX_MAX_BYTES = 64 * 2**20
+
+# A Redis URL to serve autocomplete matches from instead, shared by every
+# process, or empty to use the in-memory indexes. Fill it with the
+# rebuild_autocomplete_store command after setting it.
+AUTOCOMPLETE_REDIS_URL = env("AUTOCOMPLETE_REDIS_URL", default="")
+
+# Vocabulary uses are buffered in each process, and written to the database
+# after this many uses or seconds, whichever comes first (see main.usage).
+USAGE_FLUSH_SIZE = 100
+USAGE_FLUSH_INTERVAL = 60
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -126,11 +173,27 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "main.User"
 
+# Either "stdlib" or "orjson", which is faster but requires the orjson package.
+JSON_LIBRARY = env("JSON_LIBRARY", default="stdlib")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication"
     ],
-    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": [
+        {
+            "orjson": "main.parsers.ORJSONParser",
+            "stdlib": "rest_framework.parsers.JSONParser",
+        }[JSON_LIBRARY],
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        {
+            "orjson": "main.renderers.ORJSONRenderer",
+            "stdlib": "rest_framework.renderers.JSONRenderer",
+        }[JSON_LIBRARY]
+    ],
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }
 
@@ -1,6 +1,17 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core import signals
 
 
 class MainConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "main"
+
+    def ready(self):
+        from main import usage
+
+        signals.request_finished.connect(
+            usage.flush_overdue, dispatch_uid="main.usage.flush_overdue"
+        )
+        atexit.register(usage.flush)
@@ -0,0 +1,77 @@
+import functools
+
+from asgiref import sync
+from django import db, http
+from django.utils.translation import gettext as _
+from rest_framework import serializers, status
+
+from main import views
+
+# Async versions of the read-heavy views, routed to when serving with ASGI (see
+# settings.ASYNC_READ_VIEWS).
+#
+# Django runs sync views under ASGI in a single shared thread, so concurrent
+# requests to them queue up behind each other. Django 4.0 has no async ORM, and
+# DRF has no async views, so these run the sync views in the executor's thread
+# pool instead. Each thread has its own database connection, managed per
+# request like Django does for WSGI workers.
+#
+# Streamed recipes (?stream=true) still read the database while the response
+# is sent, which Django 4.0's ASGI handler does from the event loop, where the
+# ORM refuses to run. So they need WSGI, and are refused here (see
+# _without_streaming()).
+
+
+def _in_executor(view):
+    def run(request, *args, **kwargs):
+        db.close_old_connections()
+
+        try:
+            response = view(request, *args, **kwargs)
+
+            # DRF responses are rendered here too, rather than in the shared
+            # thread.
+            if hasattr(response, "render"):
+                response.render()
+
+            return response
+        finally:
+            db.close_old_connections()
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        return await sync.sync_to_async(run, thread_sensitive=False)(
+            request, *args, **kwargs
+        )
+
+    return async_view
+
+
+def _without_streaming(view):
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.GET.get("stream") in serializers.BooleanField.TRUE_VALUES:
+            return http.JsonResponse(
+                {
+                    "errors": {
+                        "stream": [_("Streaming isn't available on this server.")]
+                    },
+                    "message": _("The information you provided was invalid."),
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        return await view(request, *args, **kwargs)
+
+    return async_view
+
+
+ingredient_brand_search = _in_executor(views.ingredient_brand_search)
+ingredient_description_search = _in_executor(views.ingredient_description_search)
+ingredient_unit_search = _in_executor(views.ingredient_unit_search)
+recipe = _in_executor(views.recipe)
+recipe_equipment_search = _in_executor(views.recipe_equipment_search)
+recipe_tag_search = _in_executor(views.recipe_tag_search)
+recipes = _without_streaming(_in_executor(views.recipes))
+recipes_search = _in_executor(views.recipes_search)
+vocabulary_search = _in_executor(views.vocabulary_search)
@@ -0,0 +1,532 @@
+import collections
+import contextlib
+import functools
+import heapq
+import logging
+import sys
+import threading
+import uuid
+
+import redis
+from django.conf import settings
+from django.db import models as db_models
+from django.db.models import functions
+
+from main import models
+
+logger = logging.getLogger(__name__)
+
+MAX_MATCHES = 5
+
+# Fuzzy matches share at least this fraction of the term's trigrams (see
+# Index.fuzzy_matches()).
+FUZZY_MIN_SCORE = 0.5
+# Per fuzzy search, the most trigram positions read, and the most entries
+# scored.
+FUZZY_MAX_POSITIONS = 10_000
+FUZZY_MAX_CANDIDATES = 50
+
+# The vocabularies suggested by the autocomplete views, by kind: each one's
+# model and text field.
+VOCABULARIES = {
+    "ingredient_brand": (models.IngredientBrand, "name"),
+    "ingredient_description": (models.IngredientDescription, "text"),
+    "ingredient_unit": (models.IngredientUnit, "name"),
+    "recipe_equipment": (models.RecipeEquipment, "description"),
+    "recipe_tag": (models.RecipeTag, "name"),
+}
+
+# The kinds by their names in the vocabulary search view's kinds parameter.
+KIND_NAMES = {
+    "brand": "ingredient_brand",
+    "description": "ingredient_description",
+    "equipment": "recipe_equipment",
+    "tag": "recipe_tag",
+    "unit": "ingredient_unit",
+}
+
+
+class Index:
+    # One user's vocabulary of one kind, for matching in memory: the entries,
+    # (pk, text, usage count), in match_queryset() order, and for each trigram
+    # of their uppercased text, the positions of the entries containing it, in
+    # order. Since positions are in ranking order, the first matches found are
+    # the top ones.
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda e: (-e[2], len(e[1]), e[0]))
+        self.texts = [text for _, text, _ in entries]
+        self.keys = [text.upper() for text in self.texts]
+        self.trigrams = {}
+
+        for position, key in enumerate(self.keys):
+            for trigram in set(_trigrams(key)):
+                self.trigrams.setdefault(trigram, []).append(position)
+
+        # Roughly, in bytes, for IndexCache's memory cap.
+        self.size = sys.getsizeof(self.trigrams) + sum(
+            sys.getsizeof(t) for t in [*self.texts, *self.keys]
+        )
+
+        for trigram, positions in self.trigrams.items():
+            self.size += sys.getsizeof(trigram) + sys.getsizeof(positions)
+
+    def matches(self, search_term, limit=MAX_MATCHES):
+        # The same matches as match_queryset(). Every entry containing a term
+        # contains each of its trigrams, so only those with the term's rarest
+        # trigram are checked. Shorter terms are checked against every entry.
+        term = search_term.upper()
+        positions = range(len(self.keys))
+
+        if trigrams := _trigrams(term):
+            positions = min((self.trigrams.get(t, []) for t in trigrams), key=len)
+
+        matches = []
+
+        for position in positions:
+            if term in self.keys[position]:
+                matches.append(self.texts[position])
+
+                if len(matches) == limit:
+                    break
+
+        return matches
+
+    def fuzzy_matches(self, search_term, limit=MAX_MATCHES):
+        # Entries sharing at least FUZZY_MIN_SCORE of the term's trigrams, so
+        # misspellings still match, most similar first, then in matches()
+        # order. At most FUZZY_MAX_POSITIONS positions are read, and only the
+        # FUZZY_MAX_CANDIDATES entries sharing the most are scored, so the
+        # cost doesn't grow with the vocabulary. Past that, only the first
+        # positions of common trigrams are read, which are the most used
+        # entries. Shorter terms have no trigrams to compare,
+        # so they're matched as usual.
+        term = search_term.upper()
+
+        if not (trigrams := set(_trigrams(term))):
+            return self.matches(search_term, limit)
+
+        shared = collections.Counter()
+        budget = FUZZY_MAX_POSITIONS
+        postings = sorted(
+            (self.trigrams.get(t, []) for t in trigrams), key=lambda p: len(p)
+        )
+
+        # Each trigram gets an even share of what's left of the budget.
+        for i, positions in enumerate(postings):
+            share = budget // (len(postings) - i)
+            positions = positions[:share]
+            shared.update(positions)
+            budget -= len(positions)
+
+        candidates = heapq.nsmallest(
+            FUZZY_MAX_CANDIDATES, shared, key=lambda p: (-shared[p], p)
+        )
+        scored = []
+
+        for position in candidates:
+            key_trigrams = set(_trigrams(self.keys[position]))
+            common = len(trigrams & key_trigrams)
+
+            if common / len(trigrams) >= FUZZY_MIN_SCORE:
+                # Then by similarity of the whole text, so closer ones come
+                # first.
+                similarity = common / len(trigrams | key_trigrams)
+                scored.append((-common, -similarity, position))
+
+        return [self.texts[p] for _, _, p in sorted(scored)[:limit]]
+
+
+class IndexCache:
+    # Indexes by key, each for a version of its vocabulary, evicting the least
+    # recently used ones to stay under settings.AUTOCOMPLETE_INDEX_MAX_BYTES.
+    # Shared by the threads of a process.
+    def __init__(self):
+        self.size = 0
+        self._indexes = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self.size = 0
+
+    def get(self, key, version, load):
+        # Returns the index for key at version, calling load() to build it if
+        # it isn't cached at that version, or None if it's too large to keep.
+        return self.get_many([key], version, lambda keys: {key: load()})[key]
+
+    def get_many(self, keys, version, load):
+        # Returns the indexes for keys at version, by key, calling load() with
+        # the keys that aren't cached at that version to build them all at
+        # once. Indexes too large to keep are built once per version, and
+        # None from then on, so callers can match in the database instead.
+        found = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._indexes and self._indexes[key][0] == version:
+                    self._indexes.move_to_end(key)
+                    found[key] = self._indexes[key][1]
+
+        if len(found) == len(keys):
+            return found
+
+        # Loaded outside the lock, so other users' lookups don't wait on it.
+        loaded = load([k for k in keys if k not in found])
+
+        with self._lock:
+            for key, index in loaded.items():
+                found[key] = index
+
+                # A request that started earlier may have loaded an older
+                # version.
+                if key in self._indexes and self._indexes[key][0] > version:
+                    continue
+
+                self._discard(key)
+
+                if index.size <= settings.AUTOCOMPLETE_INDEX_MAX_BYTES:
+                    self._indexes[key] = (version, index)
+                    self.size += index.size
+                else:
+                    self._indexes[key] = (version, None)
+
+            while self.size > settings.AUTOCOMPLETE_INDEX_MAX_BYTES:
+                self._discard(next(iter(self._indexes)))
+
+        return found
+
+    def _discard(self, key):
+        if key in self._indexes and (index := self._indexes.pop(key)[1]):
+            self.size -= index.size
+
+
+indexes = IndexCache()
+
+
+class RedisStore:
+    # Every user's vocabularies, mirrored into Redis, so any process can match
+    # them without querying the database or holding an index in memory (see
+    # settings.AUTOCOMPLETE_REDIS_URL). Written through by the views that
+    # change entries (see entries_saved() and entries_deleted()).
+    #
+    # Each vocabulary is a sorted set of its entries, in match_queryset()
+    # order, plus one for each trigram of their uppercased text, and a hash of
+    # each entry's member by pk, to find it again when it's renamed or
+    # deleted. Members sort by -usage count, then by member, which starts with
+    # the text's length and the pk, zero padded, then the text.
+    BATCH_SIZE = 100
+    # The most members of each kind a search reads, so its cost doesn't grow
+    # with the vocabulary. They're read in ranking order, so past this, only
+    # matches among the least used entries are missed.
+    MAX_SCANNED = 1000
+
+    def __init__(self, client):
+        self.client = client
+
+    def delete_user(self, user_id):
+        if keys := list(self.client.scan_iter(match=f"autocomplete:{{{user_id}}}:*")):
+            self.client.delete(*keys)
+
+    def delete(self, entries):
+        # Deletes entries, (kind, user ID, pk) tuples.
+        members = self._members(entries)
+        pipeline = self.client.pipeline()
+
+        for (kind, user_id, pk), member in zip(entries, members):
+            if member is not None:
+                self._remove(pipeline, kind, user_id, pk, member)
+
+        pipeline.execute()
+
+    def rebuild(self, batch_size=1000):
+        # Rebuilds every vocabulary from the database. Returns the number of
+        # entries written.
+        if keys := list(self.client.scan_iter(match="autocomplete:*")):
+            self.client.delete(*keys)
+
+        count = 0
+
+        for kind, (model, field) in VOCABULARIES.items():
+            entries = model.objects.values_list("user", "pk", field, "usage_count")
+            pipeline = self.client.pipeline()
+
+            for i, (user_id, pk, text, usage_count) in enumerate(
+                entries.order_by("pk").iterator(chunk_size=batch_size)
+            ):
+                self._add(pipeline, kind, user_id, pk, text, usage_count)
+                count += 1
+
+                if (i + 1) % batch_size == 0:
+                    pipeline.execute()
+
+            pipeline.execute()
+
+        return count
+
+    def save(self, entries):
+        # Adds or updates entries, (kind, user ID, pk, text, usage count)
+        # tuples.
+        members = self._members([e[:3] for e in entries])
+        pipeline = self.client.pipeline()
+
+        for (kind, user_id, pk, text, usage_count), member in zip(entries, members):
+            if member is not None:
+                self._remove(pipeline, kind, user_id, pk, member)
+
+            self._add(pipeline, kind, user_id, pk, text, usage_count)
+
+        pipeline.execute()
+
+    def search(self, user_id, search_term, kinds, limit=MAX_MATCHES):
+        # The same matches as match_queryset(), among the first MAX_SCANNED
+        # candidates, with a round trip for all of kinds. Every entry
+        # containing a term contains each of its trigrams, so only those in all
+        # of their sets are checked. Shorter terms are checked against every
+        # entry, a batch at a time.
+        term = search_term.upper()
+        trigrams = sorted(set(_trigrams(term)))
+        pipeline = self.client.pipeline(transaction=False)
+
+        for kind in kinds:
+            key = self._key(user_id, kind)
+
+            if trigrams:
+                # Intersected into a temporary key, so only the first
+                # candidates are read back. Weighted so each member's score is
+                # its score in one set.
+                candidates = f"{key}:search:{uuid.uuid4().hex}"
+                pipeline.zinterstore(
+                    candidates,
+                    {f"{key}:{t}": int(t == trigrams[0]) for t in trigrams},
+                )
+                pipeline.zrange(candidates, 0, self.MAX_SCANNED - 1)
+                pipeline.delete(candidates)
+            else:
+                pipeline.zrange(key, 0, self.BATCH_SIZE - 1)
+
+        results = pipeline.execute()
+
+        if trigrams:
+            results = results[1::3]
+
+        found = {}
+
+        for kind, members in zip(kinds, results):
+            found[kind] = self._matches(members, term, limit)
+            start = len(members)
+
+            # Only a full batch of every entry may have more after it.
+            more = not trigrams and len(members) == self.BATCH_SIZE
+
+            while more and len(found[kind]) < limit and start < self.MAX_SCANNED:
+                members = self.client.zrange(
+                    self._key(user_id, kind), start, start + self.BATCH_SIZE - 1
+                )
+                found[kind] += self._matches(members, term, limit - len(found[kind]))
+                start += len(members)
+                more = len(members) == self.BATCH_SIZE
+
+        return found
+
+    def _add(self, pipeline, kind, user_id, pk, text, usage_count):
+        key = self._key(user_id, kind)
+        member = f"{len(text):03}{pk:020}:{text}"
+        pipeline.hset(f"{key}:members", pk, member)
+        pipeline.zadd(key, {member: -usage_count})
+
+        for trigram in set(_trigrams(text.upper())):
+            pipeline.zadd(f"{key}:{trigram}", {member: -usage_count})
+
+    def _key(self, user_id, kind):
+        # The braces keep a user's keys on one Redis Cluster node.
+        return f"autocomplete:{{{user_id}}}:{kind}"
+
+    def _matches(self, members, term, limit):
+        matches = []
+
+        for member in members:
+            text = member.decode()[24:]
+
+            if term in text.upper():
+                matches.append(text)
+
+                if len(matches) == limit:
+                    break
+
+        return matches
+
+    def _members(self, entries):
+        # The current members of entries, (kind, user ID, pk) tuples, or None
+        # for those not in the store.
+        pipeline = self.client.pipeline(transaction=False)
+
+        for kind, user_id, pk in entries:
+            pipeline.hget(f"{self._key(user_id, kind)}:members", pk)
+
+        return [m and m.decode() for m in pipeline.execute()]
+
+    def _remove(self, pipeline, kind, user_id, pk, member):
+        key = self._key(user_id, kind)
+        pipeline.hdel(f"{key}:members", pk)
+        pipeline.zrem(key, member)
+
+        for trigram in set(_trigrams(member[24:].upper())):
+            pipeline.zrem(f"{key}:{trigram}", member)
+
+
+@functools.cache
+def _redis_store(url):
+    return RedisStore(redis.Redis.from_url(url))
+
+
+def redis_store():
+    # The RedisStore, if settings.AUTOCOMPLETE_REDIS_URL is set.
+    if settings.AUTOCOMPLETE_REDIS_URL:
+        return _redis_store(settings.AUTOCOMPLETE_REDIS_URL)
+
+    return None
+
+
+def vocabularies_changed(*user_ids):
+    # Reloads the users' in-memory indexes on their next search.
+    models.User.objects.filter(pk__in=user_ids).update(
+        vocabularies_version=db_models.F("vocabularies_version") + 1
+    )
+
+
+@contextlib.contextmanager
+def _writing_through():
+    # The database has the writes already, so a failed write through only
+    # leaves the store behind, until the rebuild_autocomplete_store command.
+    try:
+        yield
+    except redis.RedisError:
+        logger.exception("failed to write through to the autocomplete Redis store")
+
+
+def entries_saved(*entries):
+    # Called after every write to vocabulary entries, (kind, entry) tuples, to
+    # write them through to the RedisStore, if there is one. None entries, for
+    # optional fields, are skipped.
+    entries = [(k, e) for k, e in entries if e is not None]
+
+    if not entries:
+        return
+
+    vocabularies_changed(*{e.user_id for _, e in entries})
+
+    if store := redis_store():
+        with _writing_through():
+            store.save(
+                [
+                    (k, e.user_id, e.pk, getattr(e, VOCABULARIES[k][1]), e.usage_count)
+                    for k, e in entries
+                ]
+            )
+
+
+def entries_deleted(kind, user_id, *pks):
+    # Called after deleting the user's entries of kind, to delete them from
+    # the RedisStore too, if there is one.
+    vocabularies_changed(user_id)
+
+    if store := redis_store():
+        with _writing_through():
+            store.delete([(kind, user_id, pk) for pk in pks])
+
+
+def user_deleted(user_id):
+    if store := redis_store():
+        with _writing_through():
+            store.delete_user(user_id)
+
+
+def load_indexes(user, kinds):
+    # The user's indexes of kinds, by kind, loaded with one query.
+    querysets = []
+
+    for kind in kinds:
+        model, field = VOCABULARIES[kind]
+        querysets.append(
+            model.objects.filter(user=user)
+            # Aliased, so each column's position is the same in every
+            # vocabulary.
+            .annotate(
+                entry_kind=db_models.Value(kind),
+                entry_id=db_models.F("pk"),
+                entry_text=db_models.F(field),
+                entry_usage_count=db_models.F("usage_count"),
+            ).values_list("entry_kind", "entry_id", "entry_text", "entry_usage_count")
+        )
+
+    entries = {kind: [] for kind in kinds}
+
+    for kind, *entry in querysets[0].union(*querysets[1:], all=True):
+        entries[kind].append(entry)
+
+    return {kind: Index(e) for kind, e in entries.items()}
+
+
+def match_queryset(kind, user, search_term):
+    # The user's entries containing search_term, ignoring case, most used
+    # first, then shortest first. On PostgreSQL, icontains compares
+    # UPPER(field), which is what each vocabulary's trigram index is built on
+    # (see migration 0033), so matches are read from that instead of scanning
+    # the vocabulary. For short terms, which match much of it, the usage index
+    # (see the models) is read in order instead, stopping at the limit.
+    model, field = VOCABULARIES[kind]
+    return (
+        model.objects.filter(**{f"{field}__icontains": search_term}, user=user)
+        .order_by("-usage_count", functions.Length(field), "pk")
+        .values_list(field, flat=True)
+    )
+
+
+def matches(kind, user, search_term, limit=MAX_MATCHES, fuzzy=False):
+    return search(user, search_term, [kind], limit, fuzzy)[kind]
+
+
+def search(user, search_term, kinds, limit=MAX_MATCHES, fuzzy=False):
+    # Matches of each of kinds, by kind, from the RedisStore if there is one.
+    # Fuzzy matches are scored on the trigram positions of the in-memory
+    # indexes, which the store doesn't keep, so they always come from those.
+    if (store := redis_store()) and not fuzzy:
+        return store.search(user.pk, search_term, kinds, limit)
+
+    # Otherwise, from the user's in-memory indexes, which are reloaded after
+    # any write to their vocabularies, including flushed usage counts, since
+    # each of those bumps their vocabularies version (see entries_saved()).
+    # The user is loaded for every request anyway, so checking the version
+    # costs nothing. Unlike SQLite's LIKE, case is ignored for non-ASCII
+    # letters too, as on PostgreSQL.
+    found = indexes.get_many(
+        [(user.pk, kind) for kind in kinds],
+        user.vocabularies_version,
+        lambda keys: {
+            (user.pk, kind): index
+            for kind, index in load_indexes(user, [k for _, k in keys]).items()
+        },
+    )
+    matched = {}
+
+    for kind in kinds:
+        index = found[(user.pk, kind)]
+
+        # Vocabularies too large to keep in memory are matched in the
+        # database, without fuzzy matching, rather than reloaded each time.
+        if index is None:
+            matched[kind] = list(match_queryset(kind, user, search_term)[:limit])
+        elif fuzzy:
+            matched[kind] = index.fuzzy_matches(search_term, limit)
+        else:
+            matched[kind] = index.matches(search_term, limit)
+
+    return matched
+
+
+def _trigrams(value):
+    return [a + b + c for a, b, c in zip(value, value[1:], value[2:])]
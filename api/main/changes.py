@@ -0,0 +1,65 @@
+import logging
+
+from django.db import transaction
+
+from main import models
+
+logger = logging.getLogger(__name__)
+
+
+def record(*recipe_ids):
+    # Moves the given recipes to the end of the change log, so syncing from any
+    # earlier cursor picks them up. Recipes that no longer exist are recorded
+    # as deleted, for whoever owned them when they were last recorded. Returns
+    # the number of changes written.
+    if not recipe_ids:
+        return 0
+
+    logger.info(
+        "recording changes for recipe IDs %(recipe_ids)s", {"recipe_ids": recipe_ids}
+    )
+
+    owners = dict(
+        models.Recipe.objects.filter(pk__in=recipe_ids).values_list("id", "user_id")
+    )
+    deleted_ids = set(recipe_ids) - owners.keys()
+    previous_owners = (
+        dict(
+            models.RecipeChange.objects.filter(recipe_id__in=deleted_ids).values_list(
+                "recipe_id", "user_id"
+            )
+        )
+        if deleted_ids
+        else {}
+    )
+    changes = [
+        models.RecipeChange(
+            deleted=recipe_id in deleted_ids,
+            recipe_id=recipe_id,
+            user_id=owners.get(recipe_id, previous_owners.get(recipe_id)),
+        )
+        # Sorted, so a batch is written in a predictable order.
+        for recipe_id in sorted(set(recipe_ids))
+        if recipe_id in owners or recipe_id in previous_owners
+    ]
+
+    # The row is replaced rather than updated in place, since its ID is the
+    # sync cursor. IDs are handed out on insert, but only seen once committed,
+    # so each user's rows are written one transaction at a time, holding a lock
+    # on the user until the write's transaction commits. Otherwise a slower
+    # transaction could commit a lower ID after a sync had read past it.
+    user_ids = sorted({c.user_id for c in changes})
+
+    with transaction.atomic():
+        # Locked in order, so concurrent writes for several users can't
+        # deadlock.
+        list(
+            models.User.objects.select_for_update()
+            .filter(pk__in=user_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        models.RecipeChange.objects.filter(recipe_id__in=recipe_ids).delete()
+        models.RecipeChange.objects.bulk_create(changes)
+
+    return len(changes)
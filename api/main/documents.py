@@ -0,0 +1,237 @@
+import decimal
+import json
+import logging
+
+from django import db
+from django.conf import settings
+from django.core import cache as django_cache
+from django.db.models import F
+from django.utils import timezone
+
+from main import changes, compilers, models, search, serializers, summaries
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = "recipe_document:hits"
+MISSES_KEY = "recipe_document:misses"
+RELATIONS = ("ingredients", "recipe_equipment", "recipe_tags", "recipe_times")
+
+# Builds the same documents as RecipeSerializer in a single statement. Children
+# are ordered by ID, as in RecipeManager.prefetch_document().
+POSTGRESQL_DOCUMENTS_SQL = """
+SELECT r.id, r.version, json_build_object(
+    'id', r.id,
+    'ingredients', COALESCE((
+        SELECT json_agg(json_build_object(
+            'amount', i.amount,
+            'brand', CASE WHEN b.id IS NULL THEN NULL
+                ELSE json_build_object('id', b.id, 'name', b.name) END,
+            'description', json_build_object('id', d.id, 'text', d.text),
+            'id', i.id,
+            'unit', CASE WHEN u.id IS NULL THEN NULL
+                ELSE json_build_object('id', u.id, 'name', u.name) END
+        ) ORDER BY i.id)
+        FROM main_ingredient i
+        JOIN main_ingredientdescription d ON d.id = i.description_id
+        LEFT JOIN main_ingredientbrand b ON b.id = i.brand_id
+        LEFT JOIN main_ingredientunit u ON u.id = i.unit_id
+        WHERE i.recipe_id = r.id
+    ), '[]'),
+    'notes', r.notes,
+    'rating', r.rating,
+    'recipe_equipment', COALESCE((
+        SELECT json_agg(json_build_object(
+            'id', e.id, 'description', e.description
+        ) ORDER BY e.id)
+        FROM main_recipe_recipe_equipment re
+        JOIN main_recipeequipment e ON e.id = re.recipeequipment_id
+        WHERE re.recipe_id = r.id
+    ), '[]'),
+    'recipe_tags', COALESCE((
+        SELECT json_agg(json_build_object('id', t.id, 'name', t.name) ORDER BY t.id)
+        FROM main_recipe_recipe_tags rt
+        JOIN main_recipetag t ON t.id = rt.recipetag_id
+        WHERE rt.recipe_id = r.id
+    ), '[]'),
+    'recipe_times', COALESCE((
+        SELECT json_agg(json_build_object(
+            'days', rt.days,
+            'hours', rt.hours,
+            'id', rt.id,
+            'minutes', rt.minutes,
+            'note', rt.note,
+            'time_type', rt.time_type
+        ) ORDER BY rt.id)
+        FROM main_recipetime rt
+        WHERE rt.recipe_id = r.id
+    ), '[]'),
+    'servings', r.servings,
+    'title', r.title
+)::text
+FROM main_recipe r
+WHERE r.id = ANY(%s)
+"""
+
+
+def _cache():
+    return django_cache.caches[settings.RECIPE_DOCUMENT_CACHE]
+
+
+# Documents are keyed by version, so bumping a recipe's version invalidates its
+# document, and a request racing with a write can't cache a stale document
+# under the new version.
+def _document_key(recipe_id, version):
+    return f"recipe_document:{recipe_id}:{version}"
+
+
+def _increment(key, delta=1):
+    cache = _cache()
+    cache.add(key, 0, timeout=None)
+
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter was evicted between add() and incr().
+        cache.add(key, delta, timeout=None)
+
+
+def document_queryset(fields=None):
+    queryset = models.Recipe.objects.prefetch_document(fields)
+
+    if fields is not None:
+        queryset = queryset.only(*(f for f in fields if f not in RELATIONS))
+
+    return queryset
+
+
+def get_recipe_document(recipe, fields=None):
+    key = _document_key(recipe.id, recipe.version)
+    data = _cache().get(key)
+
+    if data is not None:
+        _increment(HITS_KEY)
+        return data if fields is None else {f: data[f] for f in fields}
+
+    _increment(MISSES_KEY)
+
+    # Sparse documents aren't cached, only the full ones they can be cut from.
+    if fields is not None:
+        recipe = document_queryset(fields).get(pk=recipe.id)
+        return compilers.compile_serializer(serializers.RecipeSerializer, fields)(
+            recipe
+        )
+
+    version, data = load_documents([recipe.id])[recipe.id]
+    _cache().set(
+        _document_key(recipe.id, version),
+        data,
+        timeout=settings.RECIPE_DOCUMENT_CACHE_TIMEOUT,
+    )
+    return data
+
+
+def get_recipe_documents(recipes):
+    # Like get_recipe_document(), for many recipes at once: cached documents
+    # are fetched together, and the rest are loaded with one set of queries.
+    keys = {r.id: _document_key(r.id, r.version) for r in recipes}
+    cached = _cache().get_many(keys.values())
+    documents = {i: cached[k] for i, k in keys.items() if k in cached}
+    missing_ids = [i for i in keys if i not in documents]
+
+    if documents:
+        _increment(HITS_KEY, len(documents))
+
+    if missing_ids:
+        _increment(MISSES_KEY, len(missing_ids))
+        loaded = {}
+
+        for recipe_id, (version, data) in load_documents(missing_ids).items():
+            documents[recipe_id] = data
+            loaded[_document_key(recipe_id, version)] = data
+
+        _cache().set_many(loaded, timeout=settings.RECIPE_DOCUMENT_CACHE_TIMEOUT)
+
+    return [documents[r.id] for r in recipes if r.id in documents]
+
+
+def load_documents(recipe_ids):
+    # Returns {recipe_id: (version, document)}, bypassing the cache. PostgreSQL
+    # builds the documents itself, in one query.
+    if db.connection.vendor == "postgresql":
+        return _aggregate_documents(recipe_ids)
+
+    represent = compilers.compile_serializer(serializers.RecipeSerializer)
+    return {
+        r.id: (r.version, represent(r))
+        for r in document_queryset().filter(pk__in=recipe_ids)
+    }
+
+
+def _aggregate_documents(recipe_ids):
+    with db.connection.cursor() as cursor:
+        cursor.execute(POSTGRESQL_DOCUMENTS_SQL, [list(recipe_ids)])
+        rows = cursor.fetchall()
+
+    # Servings are parsed as Decimals, as RecipeSerializer outputs them.
+    return {
+        recipe_id: (version, json.loads(data, parse_float=decimal.Decimal))
+        for recipe_id, version, data in rows
+    }
+
+
+def parse_fields(value):
+    # Returns the requested document fields in serializer order, or None for
+    # the whole document. Raises ValueError when given an unknown field.
+    if value is None:
+        return None
+
+    requested = {f for f in value.split(",") if f}
+
+    if unknown := requested - set(serializers.RecipeSerializer.Meta.fields):
+        raise ValueError(", ".join(sorted(unknown)))
+
+    return tuple(f for f in serializers.RecipeSerializer.Meta.fields if f in requested)
+
+
+def recipes_changed(*recipe_ids):
+    # Called after every write to recipes or their children, including deletes
+    # (call it after the delete, so the recipe is recorded as deleted).
+    if not recipe_ids:
+        return
+
+    logger.info(
+        "bumping versions for recipe IDs %(recipe_ids)s", {"recipe_ids": recipe_ids}
+    )
+
+    now = timezone.now()
+    models.Recipe.objects.filter(pk__in=recipe_ids).update(
+        updated_at=now, version=F("version") + 1
+    )
+    summaries.refresh(*recipe_ids)
+    search.refresh(*recipe_ids)
+    changes.record(*recipe_ids)
+    # The change log has the owners of deleted recipes too.
+    _bump_users(
+        now,
+        pk__in=models.RecipeChange.objects.filter(recipe_id__in=recipe_ids).values(
+            "user_id"
+        ),
+    )
+
+
+def vocabulary_changed(user_id):
+    # For writes to tags and equipment, which are part of the bootstrap bundle
+    # even when no recipe uses them (if one does, recipes_changed() is enough).
+    logger.info("bumping recipes version for user ID %(user_id)s", {"user_id": user_id})
+    _bump_users(timezone.now(), pk=user_id)
+
+
+def _bump_users(now, **filters):
+    models.User.objects.filter(**filters).update(
+        recipes_modified_at=now, recipes_version=F("recipes_version") + 1
+    )
+
+
+def stats():
+    cache = _cache()
+    return {"hits": cache.get(HITS_KEY, 0), "misses": cache.get(MISSES_KEY, 0)}
@@ -0,0 +1,17 @@
+from django.core.management import base
+
+from main import autocomplete
+
+
+class Command(base.BaseCommand):
+    help = "Rebuilds the Redis autocomplete store from every vocabulary."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", default=1000, type=int)
+
+    def handle(self, *args, **options):
+        if not (store := autocomplete.redis_store()):
+            raise base.CommandError("AUTOCOMPLETE_REDIS_URL isn't set.")
+
+        count = store.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(f"Rebuilt the autocomplete store with {count} entries.")
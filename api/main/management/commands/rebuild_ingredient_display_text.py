@@ -0,0 +1,16 @@
+from django.core.management import base
+
+from main import models
+
+
+class Command(base.BaseCommand):
+    help = "Rebuilds the denormalized display text of every ingredient."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", default=1000, type=int)
+
+    def handle(self, *args, **options):
+        count = models.Ingredient.objects.rebuild_display_text(
+            batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Rebuilt display text for {count} ingredients.")
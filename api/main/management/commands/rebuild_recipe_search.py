@@ -0,0 +1,14 @@
+from django.core.management import base
+
+from main import search
+
+
+class Command(base.BaseCommand):
+    help = "Rebuilds the search entry of every recipe."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", default=1000, type=int)
+
+    def handle(self, *args, **options):
+        count = search.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(f"Rebuilt search entries for {count} recipes.")
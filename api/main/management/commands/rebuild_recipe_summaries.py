@@ -0,0 +1,14 @@
+from django.core.management import base
+
+from main import summaries
+
+
+class Command(base.BaseCommand):
+    help = "Rebuilds the summary of every recipe."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", default=1000, type=int)
+
+    def handle(self, *args, **options):
+        count = summaries.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(f"Rebuilt summaries for {count} recipes.")
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.6 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0024_ingredient_ingredientbrand_ingredientdescription_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
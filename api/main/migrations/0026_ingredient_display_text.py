@@ -0,0 +1,38 @@
+# Generated by Django 4.0.6 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+def set_ingredient_display_text(apps, schema_editor):
+    Ingredient = apps.get_model("main", "Ingredient")
+    ingredients = Ingredient.objects.select_related("brand", "description", "unit")
+    changed = []
+    for ingredient in ingredients.iterator(chunk_size=1000):
+        ingredient.display_text = " ".join(
+            a
+            for a in [
+                ingredient.amount,
+                ingredient.unit.name if ingredient.unit else None,
+                ingredient.brand.name if ingredient.brand else None,
+                ingredient.description.text,
+            ]
+            if a
+        )
+        changed.append(ingredient)
+    Ingredient.objects.bulk_update(changed, ["display_text"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0025_recipe_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='display_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(set_ingredient_display_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0026_ingredient_display_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'title', 'id'], name='main_recipe_user_title_id'),
+        ),
+    ]
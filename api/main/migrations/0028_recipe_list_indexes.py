@@ -0,0 +1,33 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0027_recipe_user_title_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'id'], name='main_recipe_user_id'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'rating', 'id'], name='main_recipe_user_rating_id'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'servings', 'id'], name='main_recipe_user_servings_id'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('notes', ''), _negated=True), fields=['user', 'title', 'id'], name='main_recipe_user_title_notes'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('notes', '')), fields=['user', 'title', 'id'], name='main_recipe_user_title_nonotes'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_recipe_summaries(apps, schema_editor):
+    Recipe = apps.get_model("main", "Recipe")
+    RecipeSummary = apps.get_model("main", "RecipeSummary")
+    recipes = Recipe.objects.prefetch_related("ingredients", "recipe_tags", "recipe_times")
+    summaries = []
+    for recipe in recipes:
+        times = list(recipe.recipe_times.all())
+        summaries.append(
+            RecipeSummary(
+                has_notes=bool(recipe.notes),
+                ingredient_count=len(recipe.ingredients.all()),
+                rating=recipe.rating,
+                recipe_id=recipe.id,
+                servings=recipe.servings,
+                tag_names=[t.name for t in sorted(recipe.recipe_tags.all(), key=lambda t: t.id)],
+                title=recipe.title,
+                total_minutes=sum(
+                    (t.days or 0) * 24 * 60 + (t.hours or 0) * 60 + (t.minutes or 0)
+                    for t in times
+                ) if times else None,
+                user_id=recipe.user_id,
+            )
+        )
+    RecipeSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0028_recipe_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeSummary',
+            fields=[
+                ('has_notes', models.BooleanField(default=False)),
+                ('ingredient_count', models.PositiveIntegerField(default=0)),
+                ('rating', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='main.recipe')),
+                ('servings', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('tag_names', models.JSONField(default=list)),
+                ('title', models.CharField(max_length=256)),
+                ('total_minutes', models.PositiveIntegerField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipe_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recipesummary',
+            index=models.Index(fields=['user', 'recipe'], name='main_summary_user_recipe'),
+        ),
+        migrations.AddIndex(
+            model_name='recipesummary',
+            index=models.Index(fields=['user', 'rating', 'recipe'], name='main_summary_user_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='recipesummary',
+            index=models.Index(fields=['user', 'servings', 'recipe'], name='main_summary_user_servings'),
+        ),
+        migrations.AddIndex(
+            model_name='recipesummary',
+            index=models.Index(fields=['user', 'title', 'recipe'], name='main_summary_user_title'),
+        ),
+        migrations.AddIndex(
+            model_name='recipesummary',
+            index=models.Index(fields=['user', 'has_notes', 'title', 'recipe'], name='main_summary_user_notes_title'),
+        ),
+        migrations.RunPython(create_recipe_summaries, migrations.RunPython.noop),
+    ]
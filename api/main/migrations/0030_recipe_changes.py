@@ -0,0 +1,67 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_recipe_changes(apps, schema_editor):
+    Recipe = apps.get_model("main", "Recipe")
+    RecipeChange = apps.get_model("main", "RecipeChange")
+    RecipeChange.objects.bulk_create(
+        (
+            RecipeChange(recipe_id=recipe_id, user_id=user_id)
+            for recipe_id, user_id in Recipe.objects.order_by("id").values_list("id", "user_id")
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0029_recipe_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recipeequipment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recipetag',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recipetime',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='RecipeChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('recipe_id', models.BigIntegerField(unique=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipe_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recipechange',
+            index=models.Index(fields=['user', 'id'], name='main_recipechange_user_id'),
+        ),
+        migrations.RunPython(create_recipe_changes, migrations.RunPython.noop),
+    ]
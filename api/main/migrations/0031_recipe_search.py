@@ -0,0 +1,76 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:13
+
+from django.db import migrations
+
+# See main.search. The table isn't a model, since its schema differs on each
+# database.
+POSTGRESQL_SQL = [
+    """
+    CREATE TABLE main_recipesearch (
+        recipe_id bigint PRIMARY KEY REFERENCES main_recipe (id) ON DELETE CASCADE,
+        user_id bigint NOT NULL,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX main_recipesearch_document ON main_recipesearch USING gin (document)",
+    """
+    INSERT INTO main_recipesearch (recipe_id, user_id, document)
+    SELECT r.id, r.user_id,
+        setweight(to_tsvector('english', r.title), 'A')
+        || setweight(to_tsvector('english', r.notes), 'B')
+        || setweight(to_tsvector('english', COALESCE((
+            SELECT string_agg(d.text, ' ' ORDER BY i.id)
+            FROM main_ingredient i
+            JOIN main_ingredientdescription d ON d.id = i.description_id
+            WHERE i.recipe_id = r.id
+        ), '')), 'C')
+    FROM main_recipe r
+    """,
+]
+
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE main_recipesearch USING fts5(
+        title, notes, ingredients, recipe_id UNINDEXED, user_id UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    INSERT INTO main_recipesearch (title, notes, ingredients, recipe_id, user_id)
+    SELECT r.title, r.notes, COALESCE((
+        SELECT group_concat(text, ' ') FROM (
+            SELECT d.text
+            FROM main_ingredient i
+            JOIN main_ingredientdescription d ON d.id = i.description_id
+            WHERE i.recipe_id = r.id
+            ORDER BY i.id
+        )
+    ), ''), r.id, r.user_id
+    FROM main_recipe r
+    """,
+]
+
+
+def create_recipe_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        statements = POSTGRESQL_SQL
+    else:
+        statements = SQLITE_SQL
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_recipe_search(apps, schema_editor):
+    schema_editor.execute("DROP TABLE main_recipesearch")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0030_recipe_changes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_recipe_search, drop_recipe_search),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:15
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0031_recipe_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recipes_modified_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:21
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# See main.autocomplete. The indexes are on UPPER(field), which is what
+# icontains compares on PostgreSQL. They're PostgreSQL-only, so they aren't on
+# the models.
+INDEXES = [
+    ("main_ingredientbrand", "name", "main_ingredientbrand_name_trgm"),
+    ("main_ingredientdescription", "text", "main_ingredientdesc_text_trgm"),
+    ("main_ingredientunit", "name", "main_ingredientunit_name_trgm"),
+    ("main_recipeequipment", "description", "main_recipeequip_desc_trgm"),
+    ("main_recipetag", "name", "main_recipetag_name_trgm"),
+]
+
+
+class PostgreSQLTrigramExtension(TrigramExtension):
+    # Django 4.0 skips other databases when applying it, but not when
+    # reversing it.
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, column, name in INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for _table, _column, name in INDEXES:
+        schema_editor.execute(f"DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0032_user_recipes_version'),
+    ]
+
+    operations = [
+        # A no-op on other databases. pg_trgm is a trusted extension from
+        # PostgreSQL 13, which the database owner can create. On PostgreSQL 12
+        # and earlier, this needs a superuser, or the extension created by one
+        # beforehand.
+        PostgreSQLTrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:25
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.text
+
+# Starts each entry's count at the number of recipes using it now.
+USES = [
+    ('IngredientBrand', 'Ingredient', 'brand'),
+    ('IngredientDescription', 'Ingredient', 'description'),
+    ('IngredientUnit', 'Ingredient', 'unit'),
+    ('RecipeEquipment', 'Recipe', 'recipe_equipment'),
+    ('RecipeTag', 'Recipe', 'recipe_tags'),
+]
+
+
+def count_usage(apps, schema_editor):
+    for model_name, user_model_name, field in USES:
+        uses = (
+            apps.get_model('main', user_model_name)
+            .objects.filter(**{field: models.OuterRef('pk')})
+            .values(field)
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        )
+        apps.get_model('main', model_name).objects.update(
+            usage_count=models.functions.Coalesce(models.Subquery(uses), 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0033_vocabulary_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredientbrand',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ingredientdescription',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ingredientunit',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='recipeequipment',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='recipetag',
+            name='usage_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='ingredientbrand',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('usage_count'), descending=True), django.db.models.functions.text.Length('name'), django.db.models.expressions.F('id'), name='main_ingredientbrand_usage'),
+        ),
+        migrations.AddIndex(
+            model_name='ingredientdescription',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('usage_count'), descending=True), django.db.models.functions.text.Length('text'), django.db.models.expressions.F('id'), name='main_ingredientdesc_usage'),
+        ),
+        migrations.AddIndex(
+            model_name='ingredientunit',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('usage_count'), descending=True), django.db.models.functions.text.Length('name'), django.db.models.expressions.F('id'), name='main_ingredientunit_usage'),
+        ),
+        migrations.AddIndex(
+            model_name='recipeequipment',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('usage_count'), descending=True), django.db.models.functions.text.Length('description'), django.db.models.expressions.F('id'), name='main_recipeequip_usage'),
+        ),
+        migrations.AddIndex(
+            model_name='recipetag',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('usage_count'), descending=True), django.db.models.functions.text.Length('name'), django.db.models.expressions.F('id'), name='main_recipetag_usage'),
+        ),
+        migrations.RunPython(count_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.6 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0034_vocabulary_usage_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='vocabularies_version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.6 on 2026-10-18 10:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0035_user_vocabularies_version'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='ingredient',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='recipeequipment',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='recipetag',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='recipetime',
+            name='updated_at',
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.0.6 on 2026-10-18 10:10
+
+from django.db import migrations
+
+# The search table's foreign key to recipes kept Django from flushing the
+# database (it truncates only the tables it knows about), and searches, which
+# are by user, had no index to find a user's rows with. See main.search.
+POSTGRESQL_SQL = [
+    "ALTER TABLE main_recipesearch DROP CONSTRAINT main_recipesearch_recipe_id_fkey",
+    "CREATE INDEX main_recipesearch_user_id ON main_recipesearch (user_id)",
+]
+
+POSTGRESQL_REVERSE_SQL = [
+    "DROP INDEX main_recipesearch_user_id",
+    """
+    DELETE FROM main_recipesearch s
+    WHERE NOT EXISTS (SELECT FROM main_recipe r WHERE r.id = s.recipe_id)
+    """,
+    """
+    ALTER TABLE main_recipesearch ADD CONSTRAINT main_recipesearch_recipe_id_fkey
+    FOREIGN KEY (recipe_id) REFERENCES main_recipe (id) ON DELETE CASCADE
+    """,
+]
+
+
+def drop_recipe_foreign_key(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for statement in POSTGRESQL_SQL:
+        schema_editor.execute(statement)
+
+
+def add_recipe_foreign_key(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for statement in POSTGRESQL_REVERSE_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0036_remove_unused_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_recipe_foreign_key, add_recipe_foreign_key),
+    ]
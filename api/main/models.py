@@ -4,11 +4,61 @@ from django.contrib.auth import validators as auth_validators
 from django.core import exceptions
 from django.core import validators as core_validators
 from django.db import models as db_models
+from django.db.models import functions as db_functions
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from main import utils
 
 
+class IngredientManager(db_models.Manager):
+    def rebuild_display_text(self, batch_size=1000, **filters):
+        # Rewrites display_text for the ingredients matching filters (or all of
+        # them), in batches. Returns the number of ingredients changed.
+        ingredients = (
+            self.filter(**filters)
+            .select_related("brand", "description", "unit")
+            .order_by("id")
+        )
+        changed = []
+
+        for ingredient in ingredients.iterator(chunk_size=batch_size):
+            display_text = ingredient.build_display_text()
+
+            if ingredient.display_text != display_text:
+                ingredient.display_text = display_text
+                changed.append(ingredient)
+
+        self.bulk_update(changed, ["display_text"], batch_size=batch_size)
+        return len(changed)
+
+
+class RecipeManager(db_models.Manager):
+    def prefetch_document(self, fields=None):
+        # Only relations named in fields (if given) are prefetched.
+        prefetches = {
+            "ingredients": db_models.Prefetch(
+                "ingredients",
+                queryset=Ingredient.objects.select_related(
+                    "brand", "description", "unit"
+                ).order_by("id"),
+            ),
+            "recipe_equipment": db_models.Prefetch(
+                "recipe_equipment", queryset=RecipeEquipment.objects.order_by("id")
+            ),
+            "recipe_tags": db_models.Prefetch(
+                "recipe_tags", queryset=RecipeTag.objects.order_by("id")
+            ),
+            "recipe_times": db_models.Prefetch(
+                "recipe_times", queryset=RecipeTime.objects.order_by("id")
+            ),
+        }
+
+        return self.prefetch_related(
+            *(p for f, p in prefetches.items() if fields is None or f in fields)
+        )
+
+
 class Recipe(db_models.Model):
     notes = db_models.TextField(blank=True)
     rating = db_models.PositiveSmallIntegerField(
@@ -31,16 +81,77 @@ class Recipe(db_models.Model):
         validators=[core_validators.MinValueValidator(0)],
     )
     title = db_models.CharField(max_length=256)
+    # Set by every write to the recipe or its children, like version.
+    updated_at = db_models.DateTimeField(auto_now=True)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=db_models.CASCADE, related_name="recipes"
     )
+    # Bumped by every write to the recipe or its children (see
+    # main.documents.recipes_changed()), and used to build ETags.
+    version = db_models.PositiveBigIntegerField(default=1)
+
+    objects = RecipeManager()
+
+    class Meta:
+        # Each sort and filter combination supported by views.recipes (see
+        # serializers.RecipesQuerySerializer) is backed by one of these.
+        indexes = [
+            db_models.Index(fields=["user", "id"], name="main_recipe_user_id"),
+            db_models.Index(
+                fields=["user", "rating", "id"], name="main_recipe_user_rating_id"
+            ),
+            db_models.Index(
+                fields=["user", "servings", "id"], name="main_recipe_user_servings_id"
+            ),
+            db_models.Index(
+                fields=["user", "title", "id"], name="main_recipe_user_title_id"
+            ),
+            db_models.Index(
+                condition=~db_models.Q(notes=""),
+                fields=["user", "title", "id"],
+                name="main_recipe_user_title_notes",
+            ),
+            db_models.Index(
+                condition=db_models.Q(notes=""),
+                fields=["user", "title", "id"],
+                name="main_recipe_user_title_nonotes",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class RecipeChange(db_models.Model):
+    # The latest change to each recipe, for clients syncing a copy of their
+    # recipes (see views.sync). The autoincrementing primary key is the sync
+    # cursor: each change replaces the recipe's previous row with a new one,
+    # at the end. Deleted recipes keep a row, with deleted set, as a tombstone.
+    # Written by main.changes.record() (see main.documents.recipes_changed()),
+    # which locks the user, so each user's IDs are committed in order.
+    changed_at = db_models.DateTimeField(auto_now=True)
+    deleted = db_models.BooleanField(default=False)
+    # Not a foreign key, so it outlives the recipe.
+    recipe_id = db_models.BigIntegerField(unique=True)
+    user = db_models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=db_models.CASCADE,
+        related_name="recipe_changes",
+    )
+
+    class Meta:
+        indexes = [
+            db_models.Index(fields=["user", "id"], name="main_recipechange_user_id"),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe_id}{' (deleted)' if self.deleted else ''}"
+
+
 class RecipeEquipment(db_models.Model):
     description = db_models.CharField(max_length=256)
+    # How often the entry has been used in a recipe (see main.usage).
+    usage_count = db_models.PositiveIntegerField(default=0)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=False,
@@ -50,14 +161,73 @@ class RecipeEquipment(db_models.Model):
     )
 
     class Meta:
+        # For autocomplete matches, most used first (see main.autocomplete).
+        indexes = [
+            db_models.Index(
+                db_models.F("user"),
+                db_models.F("usage_count").desc(),
+                db_functions.Length("description"),
+                db_models.F("id"),
+                name="main_recipeequip_usage",
+            ),
+        ]
         unique_together = ["description", "user"]
 
     def __str__(self):
         return self.description
 
 
+class RecipeSummary(db_models.Model):
+    # A denormalized row per recipe, for the recipes list, so listing needs no
+    # joins. Kept up to date by main.summaries.refresh(), which runs on every
+    # recipe write (see main.documents.recipes_changed()).
+    has_notes = db_models.BooleanField(default=False)
+    ingredient_count = db_models.PositiveIntegerField(default=0)
+    rating = db_models.PositiveSmallIntegerField(blank=True, null=True)
+    recipe = db_models.OneToOneField(
+        Recipe, on_delete=db_models.CASCADE, primary_key=True, related_name="summary"
+    )
+    servings = db_models.DecimalField(
+        blank=True, decimal_places=2, max_digits=6, null=True
+    )
+    tag_names = db_models.JSONField(default=list)
+    title = db_models.CharField(max_length=256)
+    # None when the recipe has no times.
+    total_minutes = db_models.PositiveIntegerField(blank=True, null=True)
+    user = db_models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=db_models.CASCADE,
+        related_name="recipe_summaries",
+    )
+
+    class Meta:
+        # The same sorts and filters as on Recipe (see its indexes).
+        indexes = [
+            db_models.Index(fields=["user", "recipe"], name="main_summary_user_recipe"),
+            db_models.Index(
+                fields=["user", "rating", "recipe"], name="main_summary_user_rating"
+            ),
+            db_models.Index(
+                fields=["user", "servings", "recipe"],
+                name="main_summary_user_servings",
+            ),
+            db_models.Index(
+                fields=["user", "title", "recipe"], name="main_summary_user_title"
+            ),
+            db_models.Index(
+                fields=["user", "has_notes", "title", "recipe"],
+                name="main_summary_user_notes_title",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
 class RecipeTag(db_models.Model):
     name = db_models.CharField(max_length=256)
+    # How often the entry has been used in a recipe (see main.usage).
+    usage_count = db_models.PositiveIntegerField(default=0)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=False,
@@ -67,6 +237,16 @@ class RecipeTag(db_models.Model):
     )
 
     class Meta:
+        # For autocomplete matches, most used first (see main.autocomplete).
+        indexes = [
+            db_models.Index(
+                db_models.F("user"),
+                db_models.F("usage_count").desc(),
+                db_functions.Length("name"),
+                db_models.F("id"),
+                name="main_recipetag_usage",
+            ),
+        ]
         unique_together = ["name", "user"]
 
     def __str__(self):
@@ -120,6 +300,15 @@ class User(auth_models.AbstractUser):
             "Unselect this instead of deleting accounts."
         ),
     )
+    # Set by every write to the user's recipes (see
+    # main.documents.recipes_changed()), and used for conditional requests on
+    # the recipes list.
+    recipes_modified_at = db_models.DateTimeField(default=timezone.now)
+    recipes_version = db_models.PositiveBigIntegerField(default=1)
+    # Bumped by every write to the user's vocabulary entries (see
+    # main.autocomplete.vocabularies_changed()), to reload their in-memory
+    # autocomplete indexes.
+    vocabularies_version = db_models.PositiveBigIntegerField(default=1)
     username = db_models.CharField(
         _("username"),
         error_messages={"unique": _("That username already exists.")},
@@ -157,6 +346,8 @@ class Token(db_models.Model):
 
 class IngredientBrand(db_models.Model):
     name = db_models.CharField(max_length=256)
+    # How often the entry has been used in a recipe (see main.usage).
+    usage_count = db_models.PositiveIntegerField(default=0)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=False,
@@ -166,14 +357,33 @@ class IngredientBrand(db_models.Model):
     )
 
     class Meta:
+        # For autocomplete matches, most used first (see main.autocomplete).
+        indexes = [
+            db_models.Index(
+                db_models.F("user"),
+                db_models.F("usage_count").desc(),
+                db_functions.Length("name"),
+                db_models.F("id"),
+                name="main_ingredientbrand_usage",
+            ),
+        ]
         unique_together = ["name", "user"]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        if not adding:
+            Ingredient.objects.rebuild_display_text(brand=self)
+
 
 class IngredientDescription(db_models.Model):
     text = db_models.CharField(max_length=256)
+    # How often the entry has been used in a recipe (see main.usage).
+    usage_count = db_models.PositiveIntegerField(default=0)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=False,
@@ -183,14 +393,33 @@ class IngredientDescription(db_models.Model):
     )
 
     class Meta:
+        # For autocomplete matches, most used first (see main.autocomplete).
+        indexes = [
+            db_models.Index(
+                db_models.F("user"),
+                db_models.F("usage_count").desc(),
+                db_functions.Length("text"),
+                db_models.F("id"),
+                name="main_ingredientdesc_usage",
+            ),
+        ]
         unique_together = ["text", "user"]
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        if not adding:
+            Ingredient.objects.rebuild_display_text(description=self)
+
 
 class IngredientUnit(db_models.Model):
     name = db_models.CharField(max_length=256)
+    # How often the entry has been used in a recipe (see main.usage).
+    usage_count = db_models.PositiveIntegerField(default=0)
     user = db_models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=False,
@@ -200,11 +429,28 @@ class IngredientUnit(db_models.Model):
     )
 
     class Meta:
+        # For autocomplete matches, most used first (see main.autocomplete).
+        indexes = [
+            db_models.Index(
+                db_models.F("user"),
+                db_models.F("usage_count").desc(),
+                db_functions.Length("name"),
+                db_models.F("id"),
+                name="main_ingredientunit_usage",
+            ),
+        ]
         unique_together = ["name", "user"]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+
+        if not adding:
+            Ingredient.objects.rebuild_display_text(unit=self)
+
 
 class Ingredient(db_models.Model):
     amount = db_models.CharField(max_length=16)
@@ -218,6 +464,10 @@ class Ingredient(db_models.Model):
     description = db_models.ForeignKey(
         IngredientDescription, on_delete=db_models.CASCADE, related_name="ingredients"
     )
+    # Denormalized from the amount, unit, brand, and description, so listing
+    # ingredients doesn't need joins. Kept up to date by save() here and in the
+    # related models (rename them with save(), not update()).
+    display_text = db_models.TextField(blank=True, editable=False)
     recipe = db_models.ForeignKey(
         Recipe, on_delete=db_models.CASCADE, related_name="ingredients"
     )
@@ -229,7 +479,12 @@ class Ingredient(db_models.Model):
         related_name="ingredients",
     )
 
+    objects = IngredientManager()
+
     def __str__(self):
+        return self.display_text
+
+    def build_display_text(self):
         return " ".join(
             a
             for a in [
@@ -240,3 +495,11 @@ class Ingredient(db_models.Model):
             ]
             if a
         )
+
+    def save(self, *args, **kwargs):
+        self.display_text = self.build_display_text()
+
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "display_text"}
+
+        super().save(*args, **kwargs)
@@ -0,0 +1,145 @@
+import base64
+import binascii
+import json
+
+from django import db
+from django.core import exceptions
+from django.db.models import Q
+
+
+def decode_cursor(cursor, ordering, fields):
+    # Raises ValueError for cursors that weren't made by encode_cursor() for
+    # the same ordering. Each value is converted by its field in fields (see
+    # ordering_fields()), so tampered values are rejected here rather than
+    # failing in the query.
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError("invalid cursor") from error
+
+    if not isinstance(data, dict) or data.get("ordering") != list(ordering):
+        raise ValueError("invalid cursor")
+
+    if not isinstance(data.get("values"), list) or len(data["values"]) != len(ordering):
+        raise ValueError("invalid cursor")
+
+    values = []
+
+    for field, value in zip(fields, data["values"]):
+        if value is None:
+            if not field.null:
+                raise ValueError("invalid cursor")
+
+            values.append(None)
+            continue
+
+        # Only JSON scalars, since to_python() stringifies some others.
+        if not isinstance(value, (bool, float, int, str)):
+            raise ValueError("invalid cursor")
+
+        try:
+            values.append(field.to_python(value))
+        except (exceptions.ValidationError, TypeError, ValueError) as error:
+            raise ValueError("invalid cursor") from error
+
+    return values
+
+
+def encode_cursor(instance, ordering):
+    data = {"ordering": list(ordering), "values": _values(instance, ordering)}
+    # Decimals are written as strings, which lookups convert back.
+    return base64.urlsafe_b64encode(json.dumps(data, default=str).encode()).decode()
+
+
+def iterate(queryset, ordering, cursor, chunk_size):
+    # Yields every page after cursor (which may be None), chunk_size instances
+    # at a time, so only one chunk is held in memory. Unlike a server-side
+    # cursor, this doesn't hold a transaction open, and works with
+    # prefetch_related().
+    while True:
+        page, next_cursor = paginate(queryset, ordering, cursor, chunk_size)
+        yield page
+
+        if next_cursor is None:
+            return
+
+        cursor = _values(page[-1], ordering)
+
+
+def keyset_filters(model, ordering, values):
+    # Returns filters matching the rows after values in ordering, as segments
+    # to be read one after the other. For ("title", "id"), they're
+    # (title = t AND id > i) and then (title > t). Unlike a single filter with
+    # OR, each segment is an equality prefix and one range, so it can be read
+    # from an index on the ordering, starting at the cursor.
+    segments = []
+
+    for index in reversed(range(len(ordering))):
+        equal = Q()
+
+        for field, value in zip(ordering[:index], values[:index]):
+            name = field.lstrip("-")
+            equal &= Q(**{f"{name}__isnull": True} if value is None else {name: value})
+
+        segments.extend(
+            equal & after for after in _after(model, ordering[index], values[index])
+        )
+
+    return segments
+
+
+def ordering_fields(model, ordering):
+    # The model fields of ordering, for decode_cursor().
+    names = [f.lstrip("-") for f in ordering]
+    return [model._meta.pk if n == "pk" else model._meta.get_field(n) for n in names]
+
+
+def paginate(queryset, ordering, cursor, page_size):
+    # Returns a page of instances and the cursor for the next page (or None).
+    # The last field in ordering must be unique, so the ordering is total.
+    queryset = queryset.order_by(*ordering)
+    segments = (
+        [Q()] if cursor is None else keyset_filters(queryset.model, ordering, cursor)
+    )
+    page = []
+
+    for segment in segments:
+        page.extend(queryset.filter(segment)[: page_size + 1 - len(page)])
+
+        if len(page) > page_size:
+            return page[:page_size], encode_cursor(page[page_size - 1], ordering)
+
+    return page, None
+
+
+def _values(instance, ordering):
+    return [getattr(instance, f.lstrip("-")) for f in ordering]
+
+
+def _after(model, field, value):
+    # NULLs sort where the database puts them by default, so the ordering can
+    # still be read from an index. Rows after a value are in two segments when
+    # NULLs come last.
+    name = field.lstrip("-")
+    nulls_after = _nulls_after(model, field)
+
+    if value is None:
+        return [] if nulls_after else [Q(**{f"{name}__isnull": False})]
+
+    lookup = "lt" if field.startswith("-") else "gt"
+    after = [Q(**{f"{name}__{lookup}": value})]
+
+    if nulls_after:
+        after.append(Q(**{f"{name}__isnull": True}))
+
+    return after
+
+
+def _nulls_after(model, field):
+    # Whether NULLs follow the non-NULL values of field in the ordering.
+    name = field.lstrip("-")
+
+    if name == "pk" or not model._meta.get_field(name).null:
+        return False
+
+    return db.connection.features.nulls_order_largest != field.startswith("-")
@@ -0,0 +1,22 @@
+import orjson
+from django.conf import settings
+from rest_framework import exceptions, parsers
+
+from main import renderers
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = renderers.ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        # orjson only reads UTF-8.
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,31 @@
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    # Anything orjson can't serialize natively (e.g. Decimal, lazy translation
+    # strings, and datetimes, which are passed through so they're formatted the
+    # same way) is handed to DRF's encoder.
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.default, option=OPTIONS)
+
+        # Match JSONRenderer, which escapes these to keep output a strict
+        # subset of JavaScript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+
+        return ret
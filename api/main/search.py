@@ -0,0 +1,157 @@
+import collections
+import logging
+
+from django import db
+from django.db import models as db_models
+from django.db import transaction
+
+from main import models
+
+logger = logging.getLogger(__name__)
+
+# Matches are ordered best first. Scores are higher for better matches on both
+# databases, and recipe IDs break ties.
+ORDERING = ("-score", "recipe_id")
+# For decoding cursors (see pagination.decode_cursor()).
+ORDERING_FIELDS = (db_models.FloatField(), db_models.BigIntegerField())
+
+# The search table is created by migration 0031, with a different schema on
+# each database: a tsvector column with a GIN index on PostgreSQL, and an FTS5
+# virtual table on SQLite. Titles weigh most, then notes, then ingredients. It
+# has no foreign keys (see migration 0037), so Django can flush the database
+# without knowing about it, and rows are removed here instead (see refresh()
+# and user_deleted()).
+POSTGRESQL_INSERT_SQL = """
+INSERT INTO main_recipesearch (recipe_id, user_id, document)
+SELECT r.id, r.user_id,
+    setweight(to_tsvector('english', r.title), 'A')
+    || setweight(to_tsvector('english', r.notes), 'B')
+    || setweight(to_tsvector('english', COALESCE((
+        SELECT string_agg(d.text, ' ' ORDER BY i.id)
+        FROM main_ingredient i
+        JOIN main_ingredientdescription d ON d.id = i.description_id
+        WHERE i.recipe_id = r.id
+    ), '')), 'C')
+FROM main_recipe r
+WHERE r.id = ANY(%s)
+"""
+
+POSTGRESQL_DELETE_SQL = "DELETE FROM main_recipesearch WHERE recipe_id = ANY(%s)"
+
+POSTGRESQL_SEARCH_SQL = """
+SELECT recipe_id, score FROM (
+    SELECT s.recipe_id, ts_rank(s.document, q.query)::float8 AS score
+    FROM main_recipesearch s, plainto_tsquery('english', %s) AS q(query)
+    WHERE s.user_id = %s AND s.document @@ q.query
+) matches
+{where}
+ORDER BY score DESC, recipe_id
+LIMIT %s
+"""
+
+SQLITE_INSERT_SQL = """
+INSERT INTO main_recipesearch (title, notes, ingredients, recipe_id, user_id)
+SELECT r.title, r.notes, COALESCE((
+    SELECT group_concat(text, ' ') FROM (
+        SELECT d.text
+        FROM main_ingredient i
+        JOIN main_ingredientdescription d ON d.id = i.description_id
+        WHERE i.recipe_id = r.id
+        ORDER BY i.id
+    )
+), ''), r.id, r.user_id
+FROM main_recipe r
+WHERE r.id IN ({placeholders})
+"""
+
+SQLITE_DELETE_SQL = "DELETE FROM main_recipesearch WHERE recipe_id IN ({placeholders})"
+
+USER_DELETE_SQL = "DELETE FROM main_recipesearch WHERE user_id = %s"
+
+SQLITE_SEARCH_SQL = """
+SELECT recipe_id, score FROM (
+    SELECT recipe_id, -bm25(main_recipesearch, 10.0, 5.0, 1.0) AS score
+    FROM main_recipesearch
+    WHERE main_recipesearch MATCH %s AND user_id = %s
+) matches
+{where}
+ORDER BY score DESC, recipe_id
+LIMIT %s
+"""
+
+Match = collections.namedtuple("Match", ["recipe_id", "score"])
+
+
+def rebuild(batch_size=1000):
+    # Refreshes every recipe's search entry, batch_size recipes at a time, e.g.
+    # to backfill the table or repair drift. Returns the number of recipes.
+    recipe_ids = models.Recipe.objects.order_by("id").values_list("id", flat=True)
+    count = 0
+    batch = []
+
+    for recipe_id in recipe_ids.iterator(chunk_size=batch_size):
+        batch.append(recipe_id)
+
+        if len(batch) == batch_size:
+            count += refresh(*batch)
+            batch = []
+
+    return count + refresh(*batch)
+
+
+def refresh(*recipe_ids):
+    # Rewrites the search entries of the given recipes, and removes those of
+    # recipes that no longer exist. Returns the number of entries written.
+    if not recipe_ids:
+        return 0
+
+    logger.info(
+        "refreshing search entries for recipe IDs %(recipe_ids)s",
+        {"recipe_ids": recipe_ids},
+    )
+
+    if db.connection.vendor == "postgresql":
+        statements = [POSTGRESQL_DELETE_SQL, POSTGRESQL_INSERT_SQL]
+        params = [list(recipe_ids)]
+    else:
+        placeholders = ", ".join(["%s"] * len(recipe_ids))
+        statements = [
+            SQLITE_DELETE_SQL.format(placeholders=placeholders),
+            SQLITE_INSERT_SQL.format(placeholders=placeholders),
+        ]
+        params = list(recipe_ids)
+
+    with transaction.atomic(), db.connection.cursor() as cursor:
+        cursor.execute(statements[0], params)
+        cursor.execute(statements[1], params)
+        return cursor.rowcount
+
+
+def user_deleted(user_id):
+    # Removes the search entries of a deleted user's recipes.
+    with db.connection.cursor() as cursor:
+        cursor.execute(USER_DELETE_SQL, [user_id])
+
+
+def search(user, query, cursor, limit):
+    # Returns up to limit of user's recipes matching every word in query, as
+    # Matches, best first. cursor is the values of the last Match of the
+    # previous page (see pagination.decode_cursor()), or None.
+    if db.connection.vendor == "postgresql":
+        sql = POSTGRESQL_SEARCH_SQL
+    else:
+        sql = SQLITE_SEARCH_SQL
+        # Each word is quoted, so FTS5 query syntax in it is matched literally.
+        query = " ".join('"' + w.replace('"', '""') + '"' for w in query.split())
+
+    params = [query, user.id]
+    where = ""
+
+    if cursor is not None:
+        score, recipe_id = cursor
+        where = "WHERE score < %s OR (score = %s AND recipe_id > %s)"
+        params += [score, score, recipe_id]
+
+    with db.connection.cursor() as db_cursor:
+        db_cursor.execute(sql.format(where=where), [*params, limit])
+        return [Match(*row) for row in db_cursor.fetchall()]
@@ -4,7 +4,7 @@ from django.contrib import auth
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers, validators
 
-from main import models
+from main import autocomplete, models
 
 logger = logging.getLogger(__name__)
 User = auth.get_user_model()
@@ -198,10 +198,63 @@ class RecipeServingsUpdateSerializer(serializers.ModelSerializer):
     )
 
 
+class RecipesQuerySerializer(serializers.Serializer):
+    # The filters allowed with each sort field. Each combination can be read
+    # from a single index on Recipe, in order, so none of them needs a scan of
+    # all the user's recipes.
+    PLANS = {
+        "id": [set()],
+        "rating": [set(), {"rating_min"}],
+        "servings": [
+            set(),
+            {"servings_min"},
+            {"servings_max"},
+            {"servings_max", "servings_min"},
+        ],
+        "title": [set(), {"has_notes"}],
+    }
+
+    has_notes = serializers.BooleanField(required=False)
+    rating_min = serializers.IntegerField(max_value=5, min_value=1, required=False)
+    servings_max = serializers.DecimalField(
+        decimal_places=2, max_digits=6, min_value=0, required=False
+    )
+    servings_min = serializers.DecimalField(
+        decimal_places=2, max_digits=6, min_value=0, required=False
+    )
+    sort = serializers.ChoiceField(
+        choices=[f"{d}{f}" for f in PLANS for d in ["", "-"]],
+        default="title",
+        required=False,
+    )
+    stream = serializers.BooleanField(default=False, required=False)
+
+    def validate(self, data):
+        filters = {f for f in data if f not in ("sort", "stream")}
+
+        if filters not in self.PLANS[data["sort"].lstrip("-")]:
+            raise serializers.ValidationError(
+                {"sort": _("These filters can't be used with this sort.")}
+            )
+
+        return data
+
+
 class RecipesSerializer(serializers.ModelSerializer):
     class Meta:
-        model = models.Recipe
-        fields = ("id", "title")
+        model = models.RecipeSummary
+        fields = (
+            "id",
+            "ingredient_count",
+            "rating",
+            "tag_names",
+            "title",
+            "total_minutes",
+        )
+
+    id = serializers.IntegerField(source="recipe_id")
+    # Just the names, unlike recipe_tags elsewhere, which are {id, name}.
+    tag_names = serializers.ListField(child=serializers.CharField())
 
 
 class RecipeTagSerializer(serializers.ModelSerializer):
@@ -311,3 +364,19 @@ class RecipeTitleUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Recipe
         fields = ("title",)
+
+
+class VocabularySearchQuerySerializer(serializers.Serializer):
+    fuzzy = serializers.BooleanField(default=False, required=False)
+    # Kind names (see autocomplete.KIND_NAMES), comma separated.
+    kinds = serializers.CharField(required=False)
+
+    def validate_kinds(self, value):
+        names = list(dict.fromkeys(n.strip() for n in value.split(",")))
+
+        if unknown := [n for n in names if n not in autocomplete.KIND_NAMES]:
+            raise serializers.ValidationError(
+                _("Unknown kinds: %s.") % ", ".join(unknown)
+            )
+
+        return names
@@ -0,0 +1,13 @@
+def json_envelope(chunks, renderer):
+    # Yields {"data": [...]} as bytes, rendering each chunk (a list of items)
+    # as it's reached, so the whole list is never held in memory.
+    yield b'{"data":['
+    separator = b""
+
+    for chunk in chunks:
+        if chunk:
+            # Each chunk renders as "[...]", so only its items are kept.
+            yield separator + renderer.render(chunk)[1:-1]
+            separator = b","
+
+    yield b"]}"
@@ -0,0 +1,90 @@
+import logging
+
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from main import models
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild(batch_size=1000):
+    # Refreshes every recipe's summary, batch_size recipes at a time, e.g. to
+    # backfill the table or repair drift. Returns the number of recipes.
+    recipe_ids = models.Recipe.objects.order_by("id").values_list("id", flat=True)
+    count = 0
+    batch = []
+
+    for recipe_id in recipe_ids.iterator(chunk_size=batch_size):
+        batch.append(recipe_id)
+
+        if len(batch) == batch_size:
+            count += refresh(*batch)
+            batch = []
+
+    return count + refresh(*batch)
+
+
+def refresh(*recipe_ids):
+    # Rewrites the summaries of the given recipes, in a fixed number of queries
+    # however many there are. Returns the number of summaries written.
+    if not recipe_ids:
+        return 0
+
+    logger.info(
+        "refreshing summaries for recipe IDs %(recipe_ids)s",
+        {"recipe_ids": recipe_ids},
+    )
+
+    ingredient_counts = dict(
+        models.Ingredient.objects.filter(recipe_id__in=recipe_ids)
+        .values("recipe_id")
+        .annotate(count=Count("id"))
+        .values_list("recipe_id", "count")
+    )
+    days = Coalesce("days", 0) * 24 * 60
+    hours = Coalesce("hours", 0) * 60
+    total_minutes = dict(
+        models.RecipeTime.objects.filter(recipe_id__in=recipe_ids)
+        .values("recipe_id")
+        .annotate(minutes=Sum(days + hours + Coalesce("minutes", 0)))
+        .values_list("recipe_id", "minutes")
+    )
+    tag_names = {}
+
+    for recipe_id, name in (
+        models.Recipe.recipe_tags.through.objects.filter(recipe_id__in=recipe_ids)
+        .order_by("recipetag_id")
+        .values_list("recipe_id", F("recipetag__name"))
+    ):
+        tag_names.setdefault(recipe_id, []).append(name)
+
+    # Notes can be long, so only whether there are any is loaded.
+    recipes = (
+        models.Recipe.objects.filter(pk__in=recipe_ids)
+        .annotate(
+            has_notes=ExpressionWrapper(~Q(notes=""), output_field=BooleanField())
+        )
+        .values("has_notes", "id", "rating", "servings", "title", "user_id")
+    )
+    summaries = [
+        models.RecipeSummary(
+            has_notes=r["has_notes"],
+            ingredient_count=ingredient_counts.get(r["id"], 0),
+            rating=r["rating"],
+            recipe_id=r["id"],
+            servings=r["servings"],
+            tag_names=tag_names.get(r["id"], []),
+            title=r["title"],
+            total_minutes=total_minutes.get(r["id"]),
+            user_id=r["user_id"],
+        )
+        for r in recipes
+    ]
+
+    with transaction.atomic():
+        models.RecipeSummary.objects.filter(recipe_id__in=recipe_ids).delete()
+        models.RecipeSummary.objects.bulk_create(summaries)
+
+    return len(summaries)
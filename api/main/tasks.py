@@ -1,16 +1,49 @@
+import collections
 import smtplib
 
 import celery
 from celery.utils import log
 from django.conf import settings
+from django.db import models as db_models
 from django.template import loader
 from django.utils.translation import gettext as _
 
-from main import models
+from main import autocomplete, models
 
 logger = log.get_logger(__name__)
 
 
+@celery.shared_task
+def increment_usage_counts(counts):
+    _increment_usage_counts(counts)
+
+
+# Adds counts, {kind: {pk: count}}, as buffered by main.usage, to the entries'
+# usage counts, with an UPDATE for each distinct count. Entries deleted since
+# are skipped. The new counts reach autocomplete like any other write to the
+# entries (see autocomplete.entries_saved()). Returns the number of entries
+# updated.
+def _increment_usage_counts(counts):
+    updated = 0
+
+    for kind, entry_counts in counts.items():
+        model, _field = autocomplete.VOCABULARIES[kind]
+        pks_by_count = collections.defaultdict(list)
+
+        for pk, count in entry_counts.items():
+            pks_by_count[count].append(int(pk))
+
+        for count, pks in sorted(pks_by_count.items()):
+            updated += model.objects.filter(pk__in=pks).update(
+                usage_count=db_models.F("usage_count") + count
+            )
+
+        entries = model.objects.filter(pk__in=[int(pk) for pk in entry_counts])
+        autocomplete.entries_saved(*((kind, e) for e in entries))
+
+    return updated
+
+
 @celery.shared_task
 def send_signup_confirmation(user_id, site_uri, confirmation_uri):
     _send_signup_confirmation(user_id, site_uri, confirmation_uri)
@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import json
+import threading
+
+import pytest
+from asgiref import sync
+from django import http, test, urls
+from rest_framework import status
+
+import config.urls
+import main.urls
+from main import async_views, summaries, views
+from main.tests import factories
+from main.tests.support.request_helpers import authenticate
+
+VIEW_NAMES = [
+    "ingredient_brand_search",
+    "ingredient_description_search",
+    "ingredient_unit_search",
+    "recipe",
+    "recipe_equipment_search",
+    "recipe_tag_search",
+    "recipes",
+    "recipes_search",
+    "vocabulary_search",
+]
+
+
+@pytest.mark.parametrize("name", VIEW_NAMES)
+def test_async_views(name):
+    view = getattr(async_views, name)
+    assert asyncio.iscoroutinefunction(view)
+    assert view.view_class is getattr(views, name).view_class
+    assert view.csrf_exempt
+
+
+# The views run in other threads, with their own database connections, so the
+# test data has to be committed.
+@pytest.mark.django_db(transaction=True)
+def test_getting_recipe(api_rf):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    request = api_rf.get(urls.reverse("recipe", kwargs={"recipe_id": recipe.id}))
+    authenticate(request, user)
+    response = sync.async_to_sync(async_views.recipe)(request, recipe.id)
+    assert json.loads(response.content)["data"]["title"] == recipe.title
+
+
+@pytest.fixture
+def async_read_views(settings):
+    # The URLconf picks the read views when it's imported.
+    def reload():
+        importlib.reload(main.urls)
+        importlib.reload(config.urls)
+        urls.clear_url_caches()
+
+    settings.ASYNC_READ_VIEWS = True
+    reload()
+    yield
+    settings.ASYNC_READ_VIEWS = False
+    reload()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "stream, status_code",
+    [
+        ("false", status.HTTP_200_OK),
+        ("true", status.HTTP_422_UNPROCESSABLE_ENTITY),
+        ("1", status.HTTP_422_UNPROCESSABLE_ENTITY),
+    ],
+)
+def test_streaming_recipes(async_read_views, stream, status_code):
+    # Streamed responses read the database from the event loop, so they're
+    # refused rather than failing once the response has started.
+    user = factories.UserFactory.create(is_active=True)
+    factories.RecipeFactory.create(user=user)
+    summaries.rebuild()
+    client = test.AsyncClient()
+    client.force_login(user)
+    get = sync.async_to_sync(client.get)
+    response = get(urls.reverse("recipes"), {"stream": stream})
+    assert response.status_code == status_code
+
+    if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
+        assert len(json.loads(response.content)["errors"]["stream"]) > 0
+
+
+def test_views_run_concurrently(rf):
+    # Each call waits for the other, so this only returns if they overlap.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def view(request):
+        barrier.wait()
+        return http.HttpResponse(status=204)
+
+    async_view = async_views._in_executor(view)
+
+    async def get_both():
+        return await asyncio.gather(async_view(rf.get("/")), async_view(rf.get("/")))
+
+    assert [r.status_code for r in sync.async_to_sync(get_both)()] == [204, 204]
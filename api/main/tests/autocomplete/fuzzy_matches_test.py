@@ -0,0 +1,60 @@
+from main import autocomplete
+
+
+def build_index(*texts, usage_counts=None):
+    usage_counts = usage_counts or [0] * len(texts)
+    return autocomplete.Index(
+        (pk, text, n) for pk, (text, n) in enumerate(zip(texts, usage_counts))
+    )
+
+
+def test_fuzzy_matches():
+    index = build_index(
+        "Parmesan cheese",
+        "parmesan",
+        "Pecorino",
+        "Mozzarella",
+        "grated parmesean",
+        usage_counts=[3, 0, 0, 0, 0],
+    )
+
+    # Most shared trigrams first ("Parmesan cheese" shares "ESE" too), then
+    # most similar, then in match order.
+    assert index.fuzzy_matches("parmesean") == [
+        "grated parmesean",
+        "Parmesan cheese",
+        "parmesan",
+    ]
+    assert index.fuzzy_matches("parmesian") == [
+        "parmesan",
+        "Parmesan cheese",
+        "grated parmesean",
+    ]
+    assert index.fuzzy_matches("PARMESAN") == [
+        "parmesan",
+        "Parmesan cheese",
+        "grated parmesean",
+    ]
+    assert index.fuzzy_matches("mozarela") == ["Mozzarella"]
+    assert index.fuzzy_matches("parmesean", limit=1) == ["grated parmesean"]
+    assert index.fuzzy_matches("cheddar") == []
+
+
+def test_short_terms_are_matched_as_usual():
+    index = build_index("Pecorino", "pepper", "Mozzarella")
+    assert index.fuzzy_matches("pe") == index.matches("pe") == ["pepper", "Pecorino"]
+
+
+def test_fuzzy_search_cost_is_bounded(mocker):
+    texts = [f"salt {i}" for i in range(20)] + ["salty", "salted"]
+    index = build_index(*texts)
+    assert index.fuzzy_matches("salty", limit=3) == ["salty", "salt 0", "salt 1"]
+
+    # Only the first position of each trigram is read, which is "salty"'s.
+    mocker.patch.object(autocomplete, "FUZZY_MAX_POSITIONS", 3)
+    assert index.fuzzy_matches("salty", limit=3) == ["salty"]
+
+    # Only the entry sharing the most trigrams is scored.
+    mocker.patch.object(autocomplete, "FUZZY_MAX_POSITIONS", 100)
+    mocker.patch.object(autocomplete, "FUZZY_MAX_CANDIDATES", 1)
+    assert index.fuzzy_matches("salty", limit=3) == ["salty"]
@@ -0,0 +1,66 @@
+from django.test import override_settings
+
+from main import autocomplete
+
+
+def build_index(*texts):
+    return autocomplete.Index((pk, text, 0) for pk, text in enumerate(texts))
+
+
+def test_get():
+    cache = autocomplete.IndexCache()
+    index = build_index("a")
+    assert cache.get("key", 1, lambda: index) is index
+    assert cache.get("key", 1, lambda: build_index("b")) is index
+    assert cache.get("key", 2, lambda: build_index("b")).texts == ["b"]
+    assert len(cache) == 1
+
+
+def test_get_many():
+    cache = autocomplete.IndexCache()
+    cache.get("a", 1, lambda: build_index("a"))
+    loaded = []
+
+    def load(keys):
+        loaded.append(keys)
+        return {k: build_index(k) for k in keys}
+
+    indexes = cache.get_many(["a", "b", "c"], 1, load)
+    assert {k: i.texts for k, i in indexes.items()} == {
+        "a": ["a"],
+        "b": ["b"],
+        "c": ["c"],
+    }
+    assert cache.get_many(["b", "c"], 1, load) == {"b": indexes["b"], "c": indexes["c"]}
+    # Only the indexes that weren't cached are loaded, all at once.
+    assert loaded == [["b", "c"]]
+
+
+def test_get_older_version():
+    cache = autocomplete.IndexCache()
+    cache.get("key", 2, lambda: build_index("new"))
+    assert cache.get("key", 1, lambda: build_index("old")).texts == ["old"]
+    assert cache.get("key", 2, lambda: build_index("other")).texts == ["new"]
+
+
+def test_least_recently_used_are_evicted():
+    size = build_index("text").size
+
+    with override_settings(AUTOCOMPLETE_INDEX_MAX_BYTES=size * 2):
+        cache = autocomplete.IndexCache()
+        cache.get("a", 1, lambda: build_index("text"))
+        cache.get("b", 1, lambda: build_index("text"))
+        cache.get("a", 1, lambda: build_index("text"))
+        cache.get("c", 1, lambda: build_index("text"))
+        assert list(cache._indexes) == ["a", "c"]
+        assert cache.size == size * 2
+
+
+def test_indexes_over_the_cap_are_not_cached():
+    with override_settings(AUTOCOMPLETE_INDEX_MAX_BYTES=1):
+        cache = autocomplete.IndexCache()
+        assert cache.get("a", 1, lambda: build_index("text")).texts == ["text"]
+        assert cache.size == 0
+        # Nor are they built again at that version.
+        assert cache.get("a", 1, lambda: build_index("other")) is None
+        assert cache.get("a", 2, lambda: build_index("other")).texts == ["other"]
@@ -0,0 +1,155 @@
+import pytest
+from django import db
+
+from main import autocomplete, documents
+from main.tests import factories
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("in_memory", [False, True])
+def test_matches(in_memory):
+    user = factories.UserFactory.create()
+
+    for name, usage_count in [
+        ("Weeknight Dinner", 0),
+        ("dinner", 0),
+        ("Dinners", 0),
+        ("Lunch", 0),
+        ("DINNER", 0),
+        ("Dinner Party", 2),
+        ("Sunday Dinner", 1),
+    ]:
+        factories.RecipeTagFactory.create(name=name, usage_count=usage_count, user=user)
+
+    factories.RecipeTagFactory.create(name="Dinner")
+
+    def matches(search_term, limit=autocomplete.MAX_MATCHES):
+        if in_memory:
+            return autocomplete.matches("recipe_tag", user, search_term, limit)
+
+        queryset = autocomplete.match_queryset("recipe_tag", user, search_term)
+        return list(queryset[:limit])
+
+    # Most used first, then shortest first, then oldest first.
+    assert matches("dInN") == [
+        "Dinner Party",
+        "Sunday Dinner",
+        "dinner",
+        "DINNER",
+        "Dinners",
+    ]
+    assert matches("dinner", limit=1) == ["Dinner Party"]
+    assert matches("dinners") == ["Dinners"]
+    assert matches("t d") == ["Weeknight Dinner"]
+    assert matches("%") == []
+
+
+@pytest.mark.django_db
+def test_in_memory_matches_are_the_same(django_assert_num_queries):
+    user = factories.UserFactory.create()
+    words = ["salt", "sea salt", "salted butter", "Butter", "bUTTERMILK", "milk"]
+
+    for i in range(60):
+        factories.IngredientBrandFactory.create(
+            name=f"{words[i % len(words)]} {i // len(words)}",
+            usage_count=i % 4,
+            user=user,
+        )
+
+    search_terms = ["s", "sa", "salt", "butter", "MILK", "t 3", "x", "lted b"]
+    expected = [
+        list(
+            autocomplete.match_queryset("ingredient_brand", user, t)[
+                : autocomplete.MAX_MATCHES
+            ]
+        )
+        for t in search_terms
+    ]
+
+    # The index is loaded once, with one query.
+    with django_assert_num_queries(1):
+        assert [
+            autocomplete.matches("ingredient_brand", user, t) for t in search_terms
+        ] == expected
+
+
+@pytest.mark.django_db
+def test_in_memory_matches_are_reloaded_after_writes():
+    user = factories.UserFactory.create()
+    assert autocomplete.matches("recipe_tag", user, "dinner") == []
+    tag = factories.RecipeTagFactory.create(name="Dinner", user=user)
+    autocomplete.entries_saved(("recipe_tag", tag))
+    user.refresh_from_db()
+    assert autocomplete.matches("recipe_tag", user, "dinner") == ["Dinner"]
+    tag.delete()
+    autocomplete.entries_deleted("recipe_tag", user.pk, tag.pk)
+    user.refresh_from_db()
+    assert autocomplete.matches("recipe_tag", user, "dinner") == []
+
+
+@pytest.mark.django_db
+def test_in_memory_matches_are_kept_after_recipe_writes(django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    factories.RecipeTagFactory.create(name="Dinner", user=user)
+    assert autocomplete.matches("recipe_tag", user, "dinner") == ["Dinner"]
+    documents.recipes_changed(recipe.id)
+    user.refresh_from_db()
+
+    with django_assert_num_queries(0):
+        assert autocomplete.matches("recipe_tag", user, "dinner") == ["Dinner"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fuzzy", [False, True])
+def test_matches_over_the_cap(settings, django_assert_num_queries, fuzzy):
+    # Vocabularies too large for memory are matched in the database, rather
+    # than loaded for every search.
+    settings.AUTOCOMPLETE_INDEX_MAX_BYTES = 1
+    user = factories.UserFactory.create()
+
+    for name in ["Dinner", "Sunday Dinner", "Lunch"]:
+        factories.RecipeTagFactory.create(name=name, user=user)
+
+    # The index is loaded, and then found to be over the cap.
+    with django_assert_num_queries(1):
+        assert autocomplete.matches("recipe_tag", user, "dinner", fuzzy=fuzzy) == [
+            "Dinner",
+            "Sunday Dinner",
+        ]
+
+    with django_assert_num_queries(1):
+        assert autocomplete.matches("recipe_tag", user, "dinner", fuzzy=fuzzy) == [
+            "Dinner",
+            "Sunday Dinner",
+        ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", autocomplete.VOCABULARIES)
+@pytest.mark.parametrize("search_term", ["a", "bread"])
+def test_match_query_plans(kind, search_term):
+    # Matches are read from an index, without scanning the whole table, and on
+    # PostgreSQL, from a trigram index. On SQLite, they're read in order from
+    # the usage index, without sorting them.
+    user = factories.UserFactory.create()
+    queryset = autocomplete.match_queryset(kind, user, search_term)[
+        : autocomplete.MAX_MATCHES
+    ]
+
+    if db.connection.vendor == "postgresql":
+        with db.connection.cursor() as cursor:
+            # The tables are tiny, so scanning them would otherwise be cheaper.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = queryset.explain()
+        assert "Seq Scan" not in plan
+
+        # Terms shorter than a trigram are read from the user's entries.
+        if len(search_term) >= 3:
+            assert "_trgm" in plan
+    else:
+        plan = queryset.explain()
+        assert "USING INDEX main_" in plan and "_usage" in plan
+        assert "TEMP B-TREE" not in plan
+        assert f"SCAN {queryset.model._meta.db_table}" not in plan
@@ -0,0 +1,189 @@
+import pytest
+import redis
+from django import urls
+
+from main import autocomplete, views
+from main.tests import factories
+from main.tests.support import request_helpers as rh
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def store(mocker):
+    store = autocomplete.RedisStore(fakeredis.FakeRedis())
+    mocker.patch("main.autocomplete.redis_store", return_value=store)
+    return store
+
+
+def entry(kind, instance):
+    _, field = autocomplete.VOCABULARIES[kind]
+    return (
+        kind,
+        instance.user_id,
+        instance.pk,
+        getattr(instance, field),
+        instance.usage_count,
+    )
+
+
+@pytest.mark.django_db
+def test_matches_are_the_same(mocker, store):
+    # Small batches, so short terms are matched over several.
+    mocker.patch.object(autocomplete.RedisStore, "BATCH_SIZE", 7)
+    user = factories.UserFactory.create()
+    words = ["salt", "sea salt", "salted butter", "Butter", "bUTTERMILK", "Crème"]
+    brands = [
+        factories.IngredientBrandFactory.create(
+            name=f"{words[i % len(words)]} {i // len(words)}",
+            usage_count=i % 4,
+            user=user,
+        )
+        for i in range(60)
+    ]
+    factories.IngredientBrandFactory.create(name="salt", usage_count=100)
+    store.save([entry("ingredient_brand", b) for b in brands])
+
+    for search_term in ["s", "sa", "salt", "butter", "MILK", "t 3", "x", "Crè", "e"]:
+        expected = list(
+            autocomplete.match_queryset("ingredient_brand", user, search_term)[
+                : autocomplete.MAX_MATCHES
+            ]
+        )
+        found = autocomplete.search(user, search_term, ["ingredient_brand"])
+        assert found == {"ingredient_brand": expected}, search_term
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("search_term", ["s", "salt"])
+def test_search_cost_is_bounded(mocker, store, search_term):
+    mocker.patch.object(autocomplete.RedisStore, "BATCH_SIZE", 3)
+    mocker.patch.object(autocomplete.RedisStore, "MAX_SCANNED", 6)
+    user = factories.UserFactory.create()
+    store.save(
+        [
+            *(("ingredient_brand", user.pk, pk, f"Salt {pk}", 1) for pk in range(1, 7)),
+            ("ingredient_brand", user.pk, 7, "Unsalted", 0),
+        ]
+    )
+    zrange = mocker.spy(store.client, "zrange")
+    found = store.search(user.pk, search_term, ["ingredient_brand"], limit=10)
+    # Only the first six, the most used, are read, so "Unsalted" is missed.
+    assert found == {"ingredient_brand": [f"Salt {pk}" for pk in range(1, 7)]}
+    assert zrange.call_count <= 1
+    # The candidates' temporary keys are deleted.
+    assert not store.client.keys("*:search:*")
+
+
+def test_failed_writes_through_are_logged(mocker, store, caplog):
+    mocker.patch.object(store, "save", side_effect=redis.ConnectionError)
+    mocker.patch.object(store, "delete", side_effect=redis.ConnectionError)
+    mocker.patch.object(store, "delete_user", side_effect=redis.ConnectionError)
+    mocker.patch("main.autocomplete.vocabularies_changed")
+    tag = factories.RecipeTagFactory.build(id=1, user_id=1)
+    autocomplete.entries_saved(("recipe_tag", tag))
+    autocomplete.entries_deleted("recipe_tag", 1, 1)
+    autocomplete.user_deleted(1)
+    assert [r.levelname for r in caplog.records] == ["ERROR"] * 3
+
+
+@pytest.mark.django_db
+def test_saving_and_deleting(store):
+    user = factories.UserFactory.create()
+    tags = [
+        factories.RecipeTagFactory.create(name=name, user=user)
+        for name in ["Dinner", "Lunch", "Dinner Party"]
+    ]
+    unit = factories.IngredientUnitFactory.create(name="dinner plate", user=user)
+    store.save([entry("recipe_tag", t) for t in tags])
+    store.save([entry("ingredient_unit", unit)])
+
+    def search(term):
+        return store.search(user.pk, term, ["ingredient_unit", "recipe_tag"])
+
+    assert search("din") == {
+        "ingredient_unit": ["dinner plate"],
+        "recipe_tag": ["Dinner", "Dinner Party"],
+    }
+
+    # Renamed, and used more.
+    tags[0].name = "Supper"
+    tags[2].usage_count = 1
+    store.save([entry("recipe_tag", t) for t in [tags[0], tags[2]]])
+    assert search("din")["recipe_tag"] == ["Dinner Party"]
+    assert search("r")["recipe_tag"] == ["Dinner Party", "Supper"]
+
+    store.delete([("recipe_tag", user.pk, tags[2].pk), ("recipe_tag", user.pk, 0)])
+    assert search("r")["recipe_tag"] == ["Supper"]
+
+    store.delete_user(user.pk)
+    assert search("r") == {"ingredient_unit": [], "recipe_tag": []}
+    assert store.client.keys() == []
+
+
+@pytest.mark.django_db
+def test_rebuild(store):
+    users = factories.UserFactory.create_batch(2)
+
+    for user in users:
+        factories.RecipeEquipmentFactory.create(description="Bread pan", user=user)
+        factories.IngredientDescriptionFactory.create(text="bread flour", user=user)
+
+    store.save([("recipe_tag", users[0].pk, 1, "Deleted tag", 0)])
+    assert store.rebuild(batch_size=3) == 4
+
+    for user in users:
+        assert store.search(user.pk, "bread", list(autocomplete.VOCABULARIES)) == {
+            "ingredient_brand": [],
+            "ingredient_description": ["bread flour"],
+            "ingredient_unit": [],
+            "recipe_equipment": ["Bread pan"],
+            "recipe_tag": [],
+        }
+
+    assert store.search(users[0].pk, "deleted", ["recipe_tag"]) == {"recipe_tag": []}
+
+
+@pytest.mark.django_db
+def test_views_write_through(api_rf, store):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+
+    def post(name, data, **kwargs):
+        request = api_rf.post(urls.reverse(name, kwargs=kwargs), data)
+        rh.authenticate(request, user)
+        return getattr(views, name)(request, **kwargs)
+
+    def search(term):
+        return store.search(user.pk, term, list(autocomplete.VOCABULARIES))
+
+    post(
+        "ingredient_associate",
+        {"brand": "Acme", "description": "sugar", "unit": "cup"},
+        recipe_id=recipe.id,
+    )
+    tag_id = post("recipe_tag_associate", {"name": "Dessert"}, recipe_id=recipe.id)
+    tag_id = tag_id.data["data"]["id"]
+    assert search("c") == {
+        "ingredient_brand": ["Acme"],
+        "ingredient_description": [],
+        "ingredient_unit": ["cup"],
+        "recipe_equipment": [],
+        "recipe_tag": [],
+    }
+    assert search("s")["recipe_tag"] == ["Dessert"]
+
+    post("recipe_tag_update", {"name": "Sweets"}, tag_id=tag_id)
+    assert search("s")["recipe_tag"] == ["Sweets"]
+
+    post("recipe_tag_destroy", {}, tag_id=tag_id)
+    assert search("s")["recipe_tag"] == []
+
+
+@pytest.mark.django_db
+def test_fuzzy_matches_are_read_from_memory(store):
+    user = factories.UserFactory.create()
+    factories.RecipeTagFactory.create(name="Parmesan", user=user)
+    assert autocomplete.search(user, "parmesean", ["recipe_tag"], fuzzy=True) == {
+        "recipe_tag": ["Parmesan"]
+    }
@@ -0,0 +1,111 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/asgi_benchmark.py
+import asyncio
+import contextlib
+import importlib
+import time
+from concurrent import futures
+
+import pytest
+from django import test, urls
+from django.conf import settings
+from django.db.backends import utils as db_utils
+
+import config.urls
+import main.urls
+from main import search, summaries
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+
+CONCURRENCY = 32
+REQUESTS = 320
+
+
+@contextlib.contextmanager
+def read_views(async_read_views):
+    # The URLconf picks the read views when it's imported.
+    def reload():
+        importlib.reload(main.urls)
+        importlib.reload(config.urls)
+        urls.clear_url_caches()
+
+    with test.override_settings(ASYNC_READ_VIEWS=async_read_views):
+        reload()
+        yield
+
+    reload()
+
+
+# The views run in other threads, with their own database connections, so the
+# data has to be committed. The test database is in memory, so a round trip to
+# a database server is simulated by waiting latency seconds for each query.
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("latency", [0, 0.001])
+def test_asgi(mocker, latency):
+    user = factories.UserFactory.create(is_active=True)
+    recipes = factories.RecipeFactory.create_batch(100, title="Soup", user=user)
+
+    for recipe in recipes:
+        factories.IngredientFactory.create_batch(
+            5, description__user=user, recipe=recipe
+        )
+        recipe.recipe_tags.add(factories.RecipeTagFactory.create(user=user))
+
+    summaries.rebuild()
+    search.rebuild()
+    paths = [
+        *(urls.reverse("recipe", kwargs={"recipe_id": r.id}) for r in recipes[:10]),
+        urls.reverse("recipes"),
+        urls.reverse("recipes_search") + "?q=soup",
+        urls.reverse("ingredient_description_search") + "?search_term=a",
+        urls.reverse("recipe_tag_search") + "?search_term=a",
+    ]
+    paths = [paths[i % len(paths)] for i in range(REQUESTS)]
+    execute = db_utils.CursorWrapper._execute
+
+    def slow_execute(self, *args, **kwargs):
+        time.sleep(latency)
+        return execute(self, *args, **kwargs)
+
+    mocker.patch.object(db_utils.CursorWrapper, "_execute", slow_execute)
+    client = test.Client()
+    client.force_login(user)
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+    def wsgi():
+        # A threaded WSGI server, with a worker per concurrent request.
+        def get(path):
+            assert test.Client(HTTP_COOKIE=cookie).get(path).status_code == 200
+
+        with futures.ThreadPoolExecutor(CONCURRENCY) as executor:
+            list(executor.map(get, paths))
+
+    def asgi():
+        async_client = test.AsyncClient()
+        async_client.cookies = client.cookies
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def get(path):
+            async with semaphore:
+                assert (await async_client.get(path)).status_code == 200
+
+        async def get_all():
+            await asyncio.gather(*(get(p) for p in paths))
+
+        asyncio.run(get_all())
+
+    with read_views(False):
+        wsgi_time = bh.best_time(wsgi, number=1, repeat=3)
+        asgi_sync_time = bh.best_time(asgi, number=1, repeat=3)
+
+    with read_views(True):
+        assert asyncio.iscoroutinefunction(urls.resolve(paths[0]).func)
+        asgi_async_time = bh.best_time(asgi, number=1, repeat=3)
+
+    for name, seconds in [
+        ("WSGI, sync views", wsgi_time),
+        ("ASGI, sync views", asgi_sync_time),
+        ("ASGI, async views", asgi_async_time),
+    ]:
+        bh.report(f"{name} ({REQUESTS} requests, {latency * 1e3:g}ms latency)", seconds)
+        print(f"  {REQUESTS / seconds:.0f} requests/s")
@@ -0,0 +1,35 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.:
+# pytest -s main/tests/benchmarks/document_aggregation_benchmark.py
+import pytest
+from django import db
+
+from main import compilers, documents, serializers
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+
+
+@pytest.mark.skipif(db.connection.vendor != "postgresql", reason="requires PostgreSQL")
+@pytest.mark.django_db
+@pytest.mark.parametrize("ingredient_count", [100, 500])
+def test_document_aggregation(ingredient_count):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    factories.IngredientFactory.create_batch(
+        ingredient_count,
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    factories.RecipeTimeFactory.create_batch(3, recipe=recipe)
+    represent = compilers.compile_serializer(serializers.RecipeSerializer)
+
+    prefetched = bh.best_time(
+        lambda: represent(documents.document_queryset().get(pk=recipe.id))
+    )
+    aggregated = bh.best_time(lambda: documents.load_documents([recipe.id]))
+
+    bh.report(f"prefetch + compiled ({ingredient_count} ingredients)", prefetched)
+    bh.report(f"JSON aggregation ({ingredient_count} ingredients)", aggregated)
+    print(f"speedup: {prefetched / aggregated:.1f}x")
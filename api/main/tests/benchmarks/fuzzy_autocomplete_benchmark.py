@@ -0,0 +1,65 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.:
+# pytest -s main/tests/benchmarks/fuzzy_autocomplete_benchmark.py
+import random
+
+import pytest
+
+from main import autocomplete
+from main.tests.support import benchmark_helpers as bh
+
+WORDS = [
+    "baking",
+    "black",
+    "bread",
+    "butter",
+    "cheese",
+    "chicken",
+    "chopped",
+    "cream",
+    "dried",
+    "flour",
+    "fresh",
+    "garlic",
+    "green",
+    "ground",
+    "lemon",
+    "olive",
+    "onion",
+    "parmesan",
+    "pepper",
+    "powder",
+    "red",
+    "salt",
+    "sauce",
+    "sugar",
+    "tomato",
+    "white",
+]
+SEARCH_TERMS = ["parmesean", "garlik", "tomatoe", "chiken brest", "bred flour"]
+
+
+def build_index(size):
+    rng = random.Random(size)
+    return autocomplete.Index(
+        (pk, f"{' '.join(rng.sample(WORDS, 3))} {pk}", rng.randrange(10))
+        for pk in range(size)
+    )
+
+
+# The index is built once per vocabulary (see autocomplete.IndexCache), so only
+# the searches are timed. Each reads at most FUZZY_MAX_POSITIONS positions and
+# scores FUZZY_MAX_CANDIDATES entries, so the time per search shouldn't grow
+# much past the size where those limits are reached.
+@pytest.mark.parametrize("size", [1_000, 10_000, 100_000])
+def test_fuzzy_matches(size):
+    index = build_index(size)
+
+    def search():
+        for term in SEARCH_TERMS:
+            index.fuzzy_matches(term)
+
+    seconds = bh.best_time(search) / len(SEARCH_TERMS)
+    bh.report(f"fuzzy search ({size} entries)", seconds)
+    assert all(index.fuzzy_matches(t) for t in SEARCH_TERMS)
+    assert seconds < 0.05
@@ -0,0 +1,65 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/json_benchmark.py
+import io
+
+import pytest
+from rest_framework import parsers as rf_parsers
+from rest_framework import renderers as rf_renderers
+
+from main import compilers, documents, models, serializers, summaries
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+
+pytest.importorskip("orjson")
+
+from main import parsers, renderers  # noqa: E402
+
+PAIRS = {
+    "stdlib": (rf_renderers.JSONRenderer(), rf_parsers.JSONParser()),
+    "orjson": (renderers.ORJSONRenderer(), parsers.ORJSONParser()),
+}
+
+
+@pytest.fixture
+def recipe_payload(db):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(notes="Stir. " * 200, user=user)
+    factories.IngredientFactory.create_batch(
+        100,
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    factories.RecipeTimeFactory.create_batch(3, recipe=recipe)
+    return {"data": documents.get_recipe_document(recipe)}
+
+
+@pytest.fixture
+def recipes_payload(db):
+    user = factories.UserFactory.create()
+    factories.RecipeFactory.create_batch(1000, user=user)
+    summaries.rebuild()
+    represent = compilers.compile_serializer(serializers.RecipesSerializer)
+    recipes = models.RecipeSummary.objects.filter(user=user)
+    return {"data": [represent(r) for r in recipes]}
+
+
+@pytest.mark.parametrize("payload_name", ["recipe_payload", "recipes_payload"])
+def test_json_libraries(request, payload_name):
+    payload = request.getfixturevalue(payload_name)
+    times = {}
+
+    for name, (renderer, parser) in PAIRS.items():
+        content = renderer.render(payload)
+        # Bound as defaults, since the loop rebinds them.
+        render = bh.best_time(lambda renderer=renderer: renderer.render(payload))
+        parse = bh.best_time(
+            lambda parser=parser, content=content: parser.parse(io.BytesIO(content))
+        )
+        bh.report(f"{name} render {payload_name}", render)
+        bh.report(f"{name} parse {payload_name}", parse)
+        times[name] = render + parse
+
+    print(f"speedup: {times['stdlib'] / times['orjson']:.1f}x")
+    assert times["orjson"] < times["stdlib"]
@@ -0,0 +1,51 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/recipes_batch_benchmark.py
+import pytest
+from django import urls
+from django.core import cache
+
+from main import views
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+from main.tests.support import request_helpers as rh
+from main.tests.support.request_helpers import authenticate
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1, 10, 50, 100])
+def test_recipes_batch(api_rf, size):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(size, user=user)
+
+    for recipe in recipes:
+        factories.IngredientFactory.create_batch(
+            10, description__user=user, recipe=recipe
+        )
+        factories.RecipeTimeFactory.create_batch(2, recipe=recipe)
+
+    ids = ",".join(str(r.id) for r in recipes)
+
+    def batch():
+        cache.cache.clear()
+        request = api_rf.get(
+            rh.add_query_string(urls.reverse("recipes_batch"), {"ids": ids})
+        )
+        authenticate(request, user)
+        views.recipes_batch(request)
+
+    def sequential():
+        cache.cache.clear()
+
+        for recipe in recipes:
+            url = urls.reverse("recipe", kwargs={"recipe_id": recipe.id})
+            request = api_rf.get(url)
+            authenticate(request, user)
+            views.recipe(request, recipe.id)
+
+    batched = bh.best_time(batch, number=3, repeat=3)
+    sequenced = bh.best_time(sequential, number=3, repeat=3)
+
+    bh.report(f"recipes_batch ({size} recipes)", batched)
+    bh.report(f"sequential recipe ({size} recipes)", sequenced)
+    print(f"per recipe: {batched / size * 1e3:.3f}ms batched")
+    assert size == 1 or batched < sequenced
@@ -0,0 +1,37 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/recipes_pagination_benchmark.py
+import pytest
+from django.conf import settings
+
+from main import models, pagination
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+
+RECIPE_COUNT = 20_000
+
+
+@pytest.mark.django_db
+def test_recipes_pagination():
+    user = factories.UserFactory.create()
+    models.Recipe.objects.bulk_create(
+        models.Recipe(title=f"recipe {i:05}", user=user) for i in range(RECIPE_COUNT)
+    )
+    recipes = models.Recipe.objects.filter(user=user)
+    page_size = settings.RECIPES_PAGE_SIZE
+    ordering = ("title", "id")
+    last = recipes.order_by(*ordering)[RECIPE_COUNT - page_size - 1]
+    last_cursor = [last.title, last.id]
+
+    first_page = bh.best_time(
+        lambda: pagination.paginate(recipes, ordering, None, page_size)
+    )
+    last_page = bh.best_time(
+        lambda: pagination.paginate(recipes, ordering, last_cursor, page_size)
+    )
+    offset = RECIPE_COUNT - page_size
+    last_offset_page = bh.best_time(lambda: list(recipes.order_by(*ordering)[offset:]))
+
+    bh.report("keyset, first page", first_page)
+    bh.report("keyset, last page", last_page)
+    bh.report("offset, last page", last_offset_page)
+    assert last_page < last_offset_page
@@ -0,0 +1,82 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/recipes_query_benchmark.py
+import decimal
+import random
+
+import pytest
+from django import urls
+from django.db.models import Q
+
+from main import models, pagination, summaries, views
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+from main.tests.support import request_helpers as rh
+from main.tests.support.request_helpers import authenticate
+
+RECIPE_COUNT = 100_000
+
+# Each query, with the equivalent filter.
+QUERIES = [
+    ({"sort": "title"}, Q()),
+    ({"sort": "-id"}, Q()),
+    ({"sort": "title", "has_notes": "true"}, Q(has_notes=True)),
+    ({"sort": "-rating"}, Q()),
+    ({"sort": "rating", "rating_min": "4"}, Q(rating__gte=4)),
+    (
+        {"sort": "servings", "servings_min": "2", "servings_max": "6"},
+        Q(servings__gte=2, servings__lte=6),
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def user(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        user = factories.UserFactory.create()
+        randomizer = random.Random(0)
+        models.Recipe.objects.bulk_create(
+            (
+                models.Recipe(
+                    notes=randomizer.choice(["", "Notes."]),
+                    rating=randomizer.choice([None, 1, 2, 3, 4, 5]),
+                    servings=randomizer.choice(
+                        [None, *(decimal.Decimal(i) for i in range(1, 9))]
+                    ),
+                    title=f"recipe {randomizer.random()}",
+                    user=user,
+                )
+                for _ in range(RECIPE_COUNT)
+            ),
+            batch_size=5000,
+        )
+        summaries.rebuild()
+        yield user
+        user.delete()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query,q", QUERIES)
+def test_recipes_query(api_rf, query, q, user):
+    def get(cursor=None):
+        url = rh.add_query_string(
+            urls.reverse("recipes"),
+            query if cursor is None else {**query, "cursor": cursor},
+        )
+        request = api_rf.get(url)
+        authenticate(request, user)
+        return views.recipes(request)
+
+    # A cursor about 90% of the way through the results.
+    sort = query["sort"].replace("id", "pk")
+    direction = "-" if sort.startswith("-") else ""
+    ordering = (sort,) if sort.lstrip("-") == "pk" else (sort, f"{direction}pk")
+    recipes = list(
+        models.RecipeSummary.objects.filter(q, user=user).order_by(*ordering)
+    )
+    deep = pagination.encode_cursor(recipes[len(recipes) * 9 // 10], ordering)
+
+    first_page = bh.best_time(get, number=5, repeat=3)
+    deep_page = bh.best_time(lambda: get(deep), number=5, repeat=3)
+
+    bh.report(f"{query} first page", first_page)
+    bh.report(f"{query} deep page", deep_page)
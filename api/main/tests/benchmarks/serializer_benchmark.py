@@ -0,0 +1,32 @@
+# Benchmarks aren't collected by default (see python_files in pytest.ini). Run
+# them explicitly, e.g.: pytest -s main/tests/benchmarks/serializer_benchmark.py
+import pytest
+
+from main import compilers, models, serializers
+from main.tests import factories
+from main.tests.support import benchmark_helpers as bh
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ingredient_count", [10, 100])
+def test_compiled_recipe_serializer(ingredient_count):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    factories.IngredientFactory.create_batch(
+        ingredient_count,
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    factories.RecipeTimeFactory.create_batch(3, recipe=recipe)
+    recipe = models.Recipe.objects.prefetch_document().get(pk=recipe.pk)
+    represent = compilers.compile_serializer(serializers.RecipeSerializer)
+
+    drf = bh.best_time(lambda: serializers.RecipeSerializer(recipe).data)
+    compiled = bh.best_time(lambda: represent(recipe))
+
+    bh.report(f"DRF RecipeSerializer ({ingredient_count} ingredients)", drf)
+    bh.report(f"compiled RecipeSerializer ({ingredient_count} ingredients)", compiled)
+    print(f"speedup: {drf / compiled:.1f}x")
+    assert compiled < drf
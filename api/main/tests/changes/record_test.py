@@ -0,0 +1,98 @@
+import pytest
+from django import db
+from django.test import utils as test_utils
+
+from main import changes, documents, models
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_record(django_assert_num_queries):
+    recipes = factories.RecipeFactory.create_batch(2)
+
+    # Two reads (the second for the owners of missing recipes), then the
+    # owners are locked, and a delete and an insert made, in a savepoint.
+    # Recipes never recorded are skipped.
+    with django_assert_num_queries(7):
+        assert changes.record(recipes[1].id, recipes[0].id, 0) == 2
+
+    assert list(
+        models.RecipeChange.objects.order_by("id").values_list(
+            "deleted", "recipe_id", "user_id"
+        )
+    ) == [
+        (False, recipes[0].id, recipes[0].user_id),
+        (False, recipes[1].id, recipes[1].user_id),
+    ]
+
+
+@pytest.mark.django_db
+def test_record_moves_changes_to_the_end():
+    recipes = factories.RecipeFactory.create_batch(2)
+    changes.record(recipes[0].id)
+    changes.record(recipes[1].id)
+    first = models.RecipeChange.objects.get(recipe_id=recipes[0].id)
+    changes.record(recipes[0].id)
+    assert models.RecipeChange.objects.count() == 2
+    assert models.RecipeChange.objects.latest("id").recipe_id == recipes[0].id
+    assert models.RecipeChange.objects.get(recipe_id=recipes[0].id).id > first.id
+
+
+@pytest.mark.skipif(
+    db.connection.vendor != "postgresql", reason="SQLite locks the whole database."
+)
+@pytest.mark.django_db
+def test_record_locks_users():
+    # Each user's changes are written a transaction at a time, so their IDs
+    # commit in order.
+    recipes = factories.RecipeFactory.create_batch(2)
+
+    with test_utils.CaptureQueriesContext(db.connection) as context:
+        changes.record(recipes[1].id, recipes[0].id)
+
+    locks = [q["sql"] for q in context.captured_queries if "FOR UPDATE" in q["sql"]]
+    assert len(locks) == 1
+    assert '"main_user"' in locks[0]
+
+
+@pytest.mark.django_db
+def test_record_deleted_recipes():
+    recipe = factories.RecipeFactory.create()
+    recipe_id = recipe.id
+    changes.record(recipe_id)
+    recipe.delete()
+    assert changes.record(recipe_id) == 1
+    change = models.RecipeChange.objects.get(recipe_id=recipe_id)
+    assert change.deleted
+    assert change.user == recipe.user
+
+
+@pytest.mark.django_db
+def test_record_with_no_recipes(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert changes.record() == 0
+
+
+@pytest.mark.django_db
+def test_recipes_changed_records_changes():
+    recipe = factories.RecipeFactory.create()
+    updated_at = recipe.updated_at
+    documents.recipes_changed(recipe.id)
+    recipe.refresh_from_db()
+    assert recipe.updated_at > updated_at
+    assert not models.RecipeChange.objects.get(recipe_id=recipe.id).deleted
+
+
+@pytest.mark.django_db
+def test_recipes_changed_bumps_recipes_versions():
+    recipes = factories.RecipeFactory.create_batch(3)
+    documents.recipes_changed(recipes[0].id, recipes[1].id)
+    recipe_id = recipes[1].id
+    recipes[1].delete()
+    documents.recipes_changed(recipe_id)
+
+    for recipe in recipes:
+        recipe.user.refresh_from_db()
+
+    # Owners of deleted recipes are found from the change log.
+    assert [r.user.recipes_version for r in recipes] == [2, 3, 1]
@@ -0,0 +1,94 @@
+import decimal
+
+import pytest
+from rest_framework import renderers
+from rest_framework import serializers as rf_serializers
+
+from main import compilers, models, serializers
+from main.tests import factories
+
+
+def render(data):
+    return renderers.JSONRenderer().render(data)
+
+
+@pytest.fixture
+def recipe(db):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(
+        notes="Stir well.", rating=4, servings=decimal.Decimal("2.50"), user=user
+    )
+    factories.IngredientFactory.create(
+        amount="2",
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    factories.IngredientFactory.create(description__user=user, recipe=recipe)
+    recipe.recipe_equipment.add(factories.RecipeEquipmentFactory.create(user=user))
+    recipe.recipe_tags.add(*factories.RecipeTagFactory.create_batch(2, user=user))
+    factories.RecipeTimeFactory.create(
+        days=1, note="Overnight", recipe=recipe, time_type=models.RecipeTime.TOTAL
+    )
+    return models.Recipe.objects.prefetch_document().get(pk=recipe.pk)
+
+
+def test_recipe_output_is_identical(recipe):
+    represent = compilers.compile_serializer(serializers.RecipeSerializer)
+    expected = render(serializers.RecipeSerializer(recipe).data)
+    assert render(represent(recipe)) == expected
+
+
+def test_empty_recipe_output_is_identical(db):
+    recipe = factories.RecipeFactory.create()
+    represent = compilers.compile_serializer(serializers.RecipeSerializer)
+    expected = render(serializers.RecipeSerializer(recipe).data)
+    assert render(represent(recipe)) == expected
+
+
+@pytest.mark.parametrize(
+    "serializer_class,relation",
+    [
+        (serializers.IngredientSerializer, "ingredients"),
+        (serializers.RecipeEquipmentSerializer, "recipe_equipment"),
+        (serializers.RecipeTagSerializer, "recipe_tags"),
+        (serializers.RecipeTimeSerializer, "recipe_times"),
+    ],
+)
+def test_nested_output_is_identical(recipe, serializer_class, relation):
+    represent = compilers.compile_serializer(serializer_class)
+
+    for instance in getattr(recipe, relation).all():
+        expected = render(serializer_class(instance).data)
+        assert render(represent(instance)) == expected
+
+
+def test_non_model_sources_use_drf(recipe):
+    class TitleSerializer(rf_serializers.ModelSerializer):
+        class Meta:
+            model = models.Recipe
+            fields = ("id", "shout", "user_name")
+
+        shout = rf_serializers.SerializerMethodField()
+        user_name = rf_serializers.CharField(source="user.username")
+
+        def get_shout(self, recipe):
+            return recipe.title.upper()
+
+    represent = compilers.compile_serializer(TitleSerializer)
+    assert represent(recipe) == TitleSerializer(recipe).data
+
+
+def test_compiled_functions_are_reused():
+    assert compilers.compile_serializer(
+        serializers.RecipeSerializer
+    ) is compilers.compile_serializer(serializers.RecipeSerializer)
+
+
+def test_compiling_with_fields(recipe):
+    represent = compilers.compile_serializer(
+        serializers.RecipeSerializer, ("id", "recipe_tags")
+    )
+    data = serializers.RecipeSerializer(recipe).data
+    assert represent(recipe) == {"id": data["id"], "recipe_tags": data["recipe_tags"]}
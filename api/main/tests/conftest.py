@@ -6,3 +6,18 @@ def api_rf():
     from rest_framework import test
 
     return test.APIRequestFactory()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core import cache
+
+    from main import autocomplete, usage
+
+    yield
+
+    for c in cache.caches.all():
+        c.clear()
+
+    autocomplete.indexes.clear()
+    usage.buffer.take()
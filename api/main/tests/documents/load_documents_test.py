@@ -0,0 +1,53 @@
+import decimal
+
+import pytest
+from django import db
+
+from main import documents, models, serializers
+from main.tests import factories
+
+postgresql_only = pytest.mark.skipif(
+    db.connection.vendor != "postgresql", reason="requires PostgreSQL"
+)
+
+
+@pytest.fixture
+def recipes():
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(
+        notes="Some notes.", rating=3, servings=decimal.Decimal("2.5"), user=user
+    )
+    factories.IngredientFactory.create(
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    factories.IngredientFactory.create(description__user=user, recipe=recipe)
+    factories.RecipeTimeFactory.create(days=None, hours=1, recipe=recipe)
+    recipe.recipe_equipment.add(factories.RecipeEquipmentFactory.create(user=user))
+    recipe.recipe_tags.add(*factories.RecipeTagFactory.create_batch(2, user=user))
+    return [recipe, factories.RecipeFactory.create(user=user)]
+
+
+def expected(recipes):
+    loaded = models.Recipe.objects.prefetch_document().filter(
+        pk__in=[r.id for r in recipes]
+    )
+    return {r.id: (r.version, serializers.RecipeSerializer(r).data) for r in loaded}
+
+
+@pytest.mark.django_db
+def test_loading_documents(recipes):
+    loaded = documents.load_documents([r.id for r in recipes])
+    assert loaded == expected(recipes)
+
+
+@postgresql_only
+@pytest.mark.django_db
+def test_aggregated_documents_match_serializer(recipes, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        loaded = documents.load_documents([r.id for r in recipes])
+
+    assert loaded == expected(recipes)
+    assert loaded[recipes[0].id][1]["servings"] == decimal.Decimal("2.50")
@@ -0,0 +1,20 @@
+import pytest
+
+from main import documents
+
+
+def test_no_fields():
+    assert documents.parse_fields(None) is None
+
+
+def test_fields_are_returned_in_serializer_order():
+    assert documents.parse_fields("title,,ingredients,id,title") == (
+        "id",
+        "ingredients",
+        "title",
+    )
+
+
+def test_unknown_fields():
+    with pytest.raises(ValueError, match="user, version"):
+        documents.parse_fields("title,version,user")
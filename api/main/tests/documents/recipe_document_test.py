@@ -0,0 +1,53 @@
+import pytest
+from django import db
+
+from main import documents, models
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_cache_miss_then_hit(django_assert_num_queries):
+    recipe = factories.RecipeFactory.create()
+    # PostgreSQL builds the document in one query (see load_documents()).
+    queries = 1 if db.connection.vendor == "postgresql" else 5
+
+    with django_assert_num_queries(queries):
+        data = documents.get_recipe_document(recipe)
+
+    with django_assert_num_queries(0):
+        assert documents.get_recipe_document(recipe) == data
+
+    assert data["title"] == recipe.title
+    assert documents.stats() == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.django_db
+def test_recipes_changed():
+    recipes = factories.RecipeFactory.create_batch(2)
+    documents.get_recipe_document(recipes[0])
+    documents.recipes_changed(recipes[0].id)
+
+    for recipe in recipes:
+        recipe.refresh_from_db()
+
+    assert recipes[0].version == 2
+    assert recipes[1].version == 1
+    documents.get_recipe_document(recipes[0])
+    assert documents.stats() == {"hits": 0, "misses": 2}
+
+
+@pytest.mark.django_db
+def test_recipes_changed_with_no_recipes(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        documents.recipes_changed()
+
+
+@pytest.mark.django_db
+def test_document_is_cached_under_loaded_version():
+    recipe = factories.RecipeFactory.create()
+    stale = models.Recipe.objects.get(pk=recipe.id)
+    documents.recipes_changed(recipe.id)
+    documents.get_recipe_document(stale)
+    recipe.refresh_from_db()
+    documents.get_recipe_document(recipe)
+    assert documents.stats() == {"hits": 1, "misses": 1}
@@ -0,0 +1,29 @@
+import pytest
+from django import db
+
+from main import documents, serializers
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_getting_documents(django_assert_num_queries):
+    recipes = factories.RecipeFactory.create_batch(3)
+    factories.IngredientFactory.create(recipe=recipes[1])
+    documents.get_recipe_document(recipes[2])
+
+    # The two uncached recipes are loaded with one set of queries, or just one
+    # query on PostgreSQL.
+    with django_assert_num_queries(1 if db.connection.vendor == "postgresql" else 5):
+        data = documents.get_recipe_documents(recipes)
+
+    assert data == [serializers.RecipeSerializer(r).data for r in recipes]
+    assert documents.stats() == {"hits": 1, "misses": 3}
+
+    with django_assert_num_queries(0):
+        assert documents.get_recipe_documents(recipes[::-1]) == data[::-1]
+
+
+@pytest.mark.django_db
+def test_getting_no_documents(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert documents.get_recipe_documents([]) == []
@@ -0,0 +1,30 @@
+import io
+
+import pytest
+from django.core import management
+
+from main import autocomplete
+from main.tests import factories
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.mark.django_db
+def test_rebuild_autocomplete_store(mocker):
+    store = autocomplete.RedisStore(fakeredis.FakeRedis())
+    mocker.patch("main.autocomplete.redis_store", return_value=store)
+    user = factories.UserFactory.create()
+    factories.RecipeTagFactory.create_batch(3, user=user)
+    stdout = io.StringIO()
+    management.call_command(
+        "rebuild_autocomplete_store", "--batch-size", "2", stdout=stdout
+    )
+    assert "3 entries" in stdout.getvalue()
+    assert len(store.search(user.pk, "tag", ["recipe_tag"])["recipe_tag"]) == 3
+
+
+def test_store_not_configured(settings):
+    settings.AUTOCOMPLETE_REDIS_URL = ""
+
+    with pytest.raises(management.CommandError):
+        management.call_command("rebuild_autocomplete_store")
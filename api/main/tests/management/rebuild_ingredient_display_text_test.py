@@ -0,0 +1,19 @@
+import io
+
+import pytest
+from django.core import management
+
+from main import models
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_rebuild_ingredient_display_text():
+    ingredients = factories.IngredientFactory.create_batch(3)
+    models.Ingredient.objects.update(display_text="")
+    stdout = io.StringIO()
+    management.call_command("rebuild_ingredient_display_text", stdout=stdout)
+    assert "3 ingredients" in stdout.getvalue()
+
+    for ingredient in ingredients:
+        assert str(models.Ingredient.objects.get(pk=ingredient.pk)) == str(ingredient)
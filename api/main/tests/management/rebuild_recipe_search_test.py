@@ -0,0 +1,19 @@
+import io
+
+import pytest
+from django.core import management
+
+from main import search
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_rebuild_recipe_search():
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(3, title="Soup", user=user)
+    stdout = io.StringIO()
+    management.call_command("rebuild_recipe_search", "--batch-size", "2", stdout=stdout)
+    assert "3 recipes" in stdout.getvalue()
+    assert [m.recipe_id for m in search.search(user, "soup", None, 10)] == [
+        r.id for r in recipes
+    ]
@@ -0,0 +1,23 @@
+import io
+
+import pytest
+from django.core import management
+
+from main import models
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_rebuild_recipe_summaries():
+    recipes = factories.RecipeFactory.create_batch(3)
+    models.RecipeSummary.objects.create(
+        recipe=recipes[0], title="Stale", user=recipes[0].user
+    )
+    stdout = io.StringIO()
+    management.call_command(
+        "rebuild_recipe_summaries", "--batch-size", "2", stdout=stdout
+    )
+    assert "3 recipes" in stdout.getvalue()
+    assert sorted(models.RecipeSummary.objects.values_list("recipe_id", "title")) == [
+        (r.id, r.title) for r in recipes
+    ]
@@ -23,3 +23,59 @@ def test_str():
         description=description,
     )
     assert str(ingredient) == f"{amount} {unit} {brand} {description}"
+
+
+@pytest.mark.django_db
+def test_str_without_queries(django_assert_num_queries):
+    ingredient = factories.IngredientFactory(
+        brand=factories.IngredientBrandFactory(name="Acme"),
+        description__text="flour",
+        unit=factories.IngredientUnitFactory(name="cup"),
+    )
+    ingredient = models.Ingredient.objects.get(pk=ingredient.pk)
+
+    with django_assert_num_queries(0):
+        assert str(ingredient) == "1 cup Acme flour"
+
+
+@pytest.mark.django_db
+def test_saving_with_update_fields():
+    ingredient = factories.IngredientFactory(description__text="flour")
+    ingredient.amount = "2"
+    ingredient.save(update_fields=["amount"])
+    ingredient.refresh_from_db()
+    assert ingredient.display_text == "2 flour"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "field,attribute",
+    [("brand", "name"), ("description", "text"), ("unit", "name")],
+)
+def test_renaming_related_rows(field, attribute):
+    ingredient = factories.IngredientFactory(
+        brand=factories.IngredientBrandFactory(name="Acme"),
+        description__text="flour",
+        unit=factories.IngredientUnitFactory(name="cup"),
+    )
+    other = factories.IngredientFactory(description__text="salt")
+    related = getattr(ingredient, field)
+    setattr(related, attribute, "new")
+    related.save()
+    ingredient.refresh_from_db()
+    other.refresh_from_db()
+    assert "new" in ingredient.display_text.split()
+    assert other.display_text == "1 salt"
+
+
+@pytest.mark.django_db
+def test_rebuild_display_text(django_assert_num_queries):
+    ingredients = factories.IngredientFactory.create_batch(3)
+    models.Ingredient.objects.filter(pk=ingredients[0].pk).update(display_text="")
+
+    # One query to read the ingredients, and one to update the changed one.
+    with django_assert_num_queries(2):
+        assert models.Ingredient.objects.rebuild_display_text() == 1
+
+    ingredient = models.Ingredient.objects.get(pk=ingredients[0].pk)
+    assert ingredient.display_text == ingredients[0].display_text
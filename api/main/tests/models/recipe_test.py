@@ -1,3 +1,6 @@
+import pytest
+
+from main import models
 from main.tests import factories
 
 
@@ -5,3 +8,21 @@ def test_str():
     title = "Test Recipe"
     recipe = factories.RecipeFactory.build(title=title)
     assert str(recipe) == title
+
+
+@pytest.mark.django_db
+def test_prefetch_document():
+    recipe = factories.RecipeFactory.create()
+    factories.IngredientFactory.create_batch(
+        3, description__user=recipe.user, recipe=recipe
+    )
+    recipe.recipe_tags.add(factories.RecipeTagFactory.create(user=recipe.user))
+    fetched = models.Recipe.objects.prefetch_document().get(pk=recipe.pk)
+    assert set(fetched._prefetched_objects_cache.keys()) == {
+        "ingredients",
+        "recipe_equipment",
+        "recipe_tags",
+        "recipe_times",
+    }
+    assert len(fetched.ingredients.all()) == 3
+    assert len(fetched.recipe_tags.all()) == 1
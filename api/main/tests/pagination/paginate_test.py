@@ -0,0 +1,90 @@
+import base64
+import json
+
+import pytest
+
+from main import models, pagination
+from main.tests import factories
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "ordering",
+    [
+        ("title", "id"),
+        ("-title", "-id"),
+        ("id",),
+        ("rating", "id"),
+        ("-rating", "-id"),
+        ("-servings", "title", "id"),
+    ],
+)
+@pytest.mark.parametrize("page_size", [1, 2])
+def test_paginating(ordering, page_size):
+    user = factories.UserFactory.create()
+
+    for title, rating, servings in [
+        ("b", None, 2),
+        ("a", 3, None),
+        ("c", None, None),
+        ("a", 3, 1.5),
+        ("b", 1, 2),
+        ("d", 5, None),
+    ]:
+        factories.RecipeFactory.create(
+            rating=rating, servings=servings, title=title, user=user
+        )
+
+    recipes = models.Recipe.objects.filter(user=user)
+    seen = []
+    cursor = None
+
+    while True:
+        page, next_cursor = pagination.paginate(recipes, ordering, cursor, page_size)
+        seen.extend(page)
+
+        if next_cursor is None:
+            break
+
+        fields = pagination.ordering_fields(models.Recipe, ordering)
+        cursor = pagination.decode_cursor(next_cursor, ordering, fields)
+
+    assert seen == list(recipes.order_by(*ordering))
+
+
+@pytest.mark.parametrize("cursor", ["nope", "bm9wZQ==", "WzFd", "eyJhIjogMX0="])
+def test_decoding_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        fields = pagination.ordering_fields(models.Recipe, ("title", "id"))
+        pagination.decode_cursor(cursor, ("title", "id"), fields)
+
+
+@pytest.mark.parametrize(
+    "ordering, values",
+    [
+        (("title", "id"), ["a", "abc"]),
+        (("title", "id"), ["a", [1]]),
+        (("title", "id"), [{"a": 1}, 1]),
+        (("title", "id"), ["a", None]),
+        (("rating", "id"), ["abc", 1]),
+        (("-servings", "pk"), ["1.5.1", 1]),
+    ],
+)
+def test_decoding_badly_typed_cursor(ordering, values):
+    # Well formed, but not made by encode_cursor().
+    data = json.dumps({"ordering": ordering, "values": values})
+    cursor = base64.urlsafe_b64encode(data.encode()).decode()
+    fields = pagination.ordering_fields(models.Recipe, ordering)
+
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(cursor, ordering, fields)
+
+
+def test_decoding_cursor_for_another_ordering():
+    recipe = factories.RecipeFactory.build(id=1, rating=2)
+    cursor = pagination.encode_cursor(recipe, ("rating", "id"))
+    fields = pagination.ordering_fields(models.Recipe, ("rating", "id"))
+    assert pagination.decode_cursor(cursor, ("rating", "id"), fields) == [2, 1]
+
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(cursor, ("-rating", "-id"), fields)
@@ -0,0 +1,28 @@
+import io
+
+import pytest
+from rest_framework import exceptions
+
+pytest.importorskip("orjson")
+
+from main import parsers  # noqa: E402
+
+
+def test_parsing():
+    stream = io.BytesIO('{"title": "Crème brûlée", "rating": 5}'.encode())
+    assert parsers.ORJSONParser().parse(stream) == {
+        "rating": 5,
+        "title": "Crème brûlée",
+    }
+
+
+def test_parsing_other_encodings():
+    stream = io.BytesIO('{"title": "Crème brûlée"}'.encode("latin-1"))
+    parser_context = {"encoding": "latin-1"}
+    data = parsers.ORJSONParser().parse(stream, parser_context=parser_context)
+    assert data == {"title": "Crème brûlée"}
+
+
+def test_parsing_invalid_json():
+    with pytest.raises(exceptions.ParseError):
+        parsers.ORJSONParser().parse(io.BytesIO(b'{"title": '))
@@ -0,0 +1,41 @@
+import datetime
+import decimal
+import zoneinfo
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from rest_framework import renderers as rf_renderers
+
+pytest.importorskip("orjson")
+
+from main import renderers  # noqa: E402
+
+DATA = {
+    "data": {
+        "created": datetime.datetime(
+            2022, 7, 9, 15, 32, tzinfo=zoneinfo.ZoneInfo("UTC")
+        ),
+        "day": datetime.date(2022, 7, 9),
+        "id": 1,
+        "ingredients": [{"amount": "1", "brand": None}],
+        "servings": decimal.Decimal("2.50"),
+        "title": "Crème brûlée\u2028\u2029",
+        7: "non-string key",
+    },
+    "message": _("Your signup was successfully confirmed."),
+}
+
+
+def test_rendering_matches_json_renderer():
+    expected = rf_renderers.JSONRenderer().render(DATA)
+    assert renderers.ORJSONRenderer().render(DATA) == expected
+
+
+def test_rendering_none():
+    assert renderers.ORJSONRenderer().render(None) == b""
+
+
+def test_rendering_with_indent():
+    media_type = "application/json; indent=4"
+    expected = rf_renderers.JSONRenderer().render(DATA, media_type)
+    assert renderers.ORJSONRenderer().render(DATA, media_type) == expected
@@ -0,0 +1,135 @@
+import pytest
+from django import db
+
+from main import documents, pagination, search
+from main.tests import factories
+
+
+def search_ids(user, query, cursor=None, limit=10):
+    return [m.recipe_id for m in search.search(user, query, cursor, limit)]
+
+
+@pytest.mark.django_db
+def test_search():
+    user = factories.UserFactory.create()
+    title = factories.RecipeFactory.create(title="Tomato soup", user=user)
+    notes = factories.RecipeFactory.create(
+        notes="Use ripe tomatoes.", title="Salad", user=user
+    )
+    ingredient = factories.RecipeFactory.create(title="Sauce", user=user)
+    factories.IngredientFactory.create(
+        description__text="tomato", description__user=user, recipe=ingredient
+    )
+    factories.RecipeFactory.create(title="Bread", user=user)
+    factories.RecipeFactory.create(title="Tomato soup")
+    search.rebuild()
+
+    # Titles rank above notes, which rank above ingredients.
+    assert search_ids(user, "tomatoes") == [title.id, notes.id, ingredient.id]
+    assert search_ids(user, "tomato soup") == [title.id]
+    assert search_ids(user, "tomato cake") == []
+
+
+@pytest.mark.django_db
+def test_search_with_cursor():
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(5, title="Soup", user=user)
+    search.refresh(*(r.id for r in recipes))
+    first = search.search(user, "soup", None, 2)
+    cursor = [first[-1].score, first[-1].recipe_id]
+    rest = search_ids(user, "soup", cursor)
+    assert [m.recipe_id for m in first] + rest == [r.id for r in recipes]
+
+
+@pytest.mark.skipif(
+    db.connection.vendor != "postgresql", reason="ts_rank is PostgreSQL-only."
+)
+@pytest.mark.django_db
+def test_search_with_cursor_through_tied_scores():
+    # ts_rank() is a float4, which a cursor's float only equals as a float8, so
+    # a tie at the end of a page would otherwise be repeated on the next one.
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(
+        5, notes="Simmer gently.", title="Tomato soup", user=user
+    )
+    search.refresh(*(r.id for r in recipes))
+    ids = []
+    cursor = None
+
+    while True:
+        page = search.search(user, "soup", cursor, 2)
+        ids.extend(m.recipe_id for m in page)
+
+        if len(page) < 2:
+            break
+
+        encoded = pagination.encode_cursor(page[-1], search.ORDERING)
+        cursor = pagination.decode_cursor(
+            encoded, search.ORDERING, search.ORDERING_FIELDS
+        )
+
+    assert ids == [r.id for r in recipes]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ['"', "soup OR", "NEAR(soup", "title:soup", "*"])
+def test_search_with_query_syntax(query):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(title="Soup", user=user)
+    search.refresh(recipe.id)
+    search_ids(user, query)
+
+
+@pytest.mark.django_db
+def test_refresh_removes_deleted_recipes():
+    recipe = factories.RecipeFactory.create(title="Soup")
+    search.refresh(recipe.id)
+    recipe_id = recipe.id
+    recipe.delete()
+    assert search.refresh(recipe_id) == 0
+    assert search_ids(recipe.user, "soup") == []
+
+
+@pytest.mark.django_db
+def test_user_deleted():
+    recipes = [factories.RecipeFactory.create(title="Soup") for _ in range(2)]
+    search.refresh(*(r.id for r in recipes))
+    user = recipes[0].user
+    user.delete()
+    search.user_deleted(user.pk)
+    assert search_ids(user, "soup") == []
+    assert search_ids(recipes[1].user, "soup") == [recipes[1].id]
+
+
+@pytest.mark.django_db
+def test_refresh_with_no_recipes(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert search.refresh() == 0
+
+
+@pytest.mark.django_db
+def test_recipes_changed_refreshes_search():
+    recipe = factories.RecipeFactory.create(title="Soup")
+    documents.recipes_changed(recipe.id)
+    assert search_ids(recipe.user, "soup") == [recipe.id]
+
+
+@pytest.mark.skipif(
+    db.connection.vendor != "postgresql", reason="The indexes are PostgreSQL-only."
+)
+@pytest.mark.django_db
+def test_search_uses_indexes():
+    # The planner picks the GIN index on documents, the user index, or both,
+    # depending on the statistics, but never scans every user's entries.
+    user = factories.UserFactory.create()
+
+    with db.connection.cursor() as cursor:
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute(
+            "EXPLAIN " + search.POSTGRESQL_SEARCH_SQL.format(where=""),
+            ["soup", user.id, 10],
+        )
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+
+    assert "main_recipesearch_document" in plan or "main_recipesearch_user_id" in plan
+    assert "Seq Scan" not in plan
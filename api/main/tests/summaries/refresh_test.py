@@ -0,0 +1,65 @@
+import decimal
+
+import pytest
+
+from main import documents, models, summaries
+from main.tests import factories
+
+
+@pytest.mark.django_db
+def test_refresh(django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(
+        notes="Notes.", rating=3, servings=decimal.Decimal("2.5"), user=user
+    )
+    recipe.recipe_tags.add(
+        factories.RecipeTagFactory.create(name="b", user=user),
+        factories.RecipeTagFactory.create(name="a", user=user),
+    )
+    factories.IngredientFactory.create_batch(3, description__user=user, recipe=recipe)
+    factories.RecipeTimeFactory.create(days=None, hours=1, minutes=30, recipe=recipe)
+    factories.RecipeTimeFactory.create(days=1, hours=None, minutes=None, recipe=recipe)
+    other = factories.RecipeFactory.create(user=user)
+
+    # Four reads, then a delete and an insert in a savepoint.
+    with django_assert_num_queries(8):
+        assert summaries.refresh(recipe.id, other.id, 0) == 2
+
+    summary = models.RecipeSummary.objects.get(recipe=recipe)
+    assert summary.has_notes
+    assert summary.ingredient_count == 3
+    assert summary.rating == 3
+    assert summary.servings == decimal.Decimal("2.5")
+    assert summary.tag_names == ["b", "a"]
+    assert summary.title == recipe.title
+    assert summary.total_minutes == 90 + 24 * 60
+    assert summary.user == user
+
+    summary = models.RecipeSummary.objects.get(recipe=other)
+    assert not summary.has_notes
+    assert summary.ingredient_count == 0
+    assert summary.tag_names == []
+    assert summary.total_minutes is None
+
+
+@pytest.mark.django_db
+def test_refresh_replaces_summaries():
+    recipe = factories.RecipeFactory.create(title="Old")
+    summaries.refresh(recipe.id)
+    models.Recipe.objects.filter(pk=recipe.id).update(title="New")
+    summaries.refresh(recipe.id)
+    assert models.RecipeSummary.objects.get(recipe=recipe).title == "New"
+
+
+@pytest.mark.django_db
+def test_refresh_with_no_recipes(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert summaries.refresh() == 0
+
+
+@pytest.mark.django_db
+def test_recipes_changed_refreshes_summaries():
+    recipe = factories.RecipeFactory.create()
+    factories.IngredientFactory.create(recipe=recipe)
+    documents.recipes_changed(recipe.id)
+    assert models.RecipeSummary.objects.get(recipe=recipe).ingredient_count == 1
@@ -0,0 +1,9 @@
+import timeit
+
+
+def best_time(func, number=10, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(name, seconds):
+    print(f"{name}: {seconds * 1000:.3f} ms")
@@ -0,0 +1,57 @@
+import pytest
+
+from main import autocomplete, tasks
+from main.tests import factories
+
+
+def test_task_dispatches_logic(mocker):
+    mock = mocker.patch("main.tasks._increment_usage_counts")
+    tasks.increment_usage_counts({"recipe_tag": {"1": 2}})
+    mock.assert_called_with({"recipe_tag": {"1": 2}})
+
+
+@pytest.mark.django_db
+def test_incrementing_usage_counts(django_assert_num_queries):
+    tags = factories.RecipeTagFactory.create_batch(3, usage_count=1)
+    brand = factories.IngredientBrandFactory.create()
+    counts = {
+        "ingredient_brand": {str(brand.id): 1},
+        # An UPDATE for each distinct count.
+        "recipe_tag": {str(tags[0].id): 2, str(tags[1].id): 2, str(tags[2].id): 5},
+    }
+
+    # Then, for each kind, the entries are read and their users' vocabularies
+    # versions bumped.
+    with django_assert_num_queries(7):
+        assert tasks._increment_usage_counts(counts) == 4
+
+    assert [t.usage_count for t in tags[0].__class__.objects.order_by("id")] == [
+        3,
+        3,
+        6,
+    ]
+    brand.refresh_from_db()
+    assert brand.usage_count == 1
+
+
+@pytest.mark.django_db
+def test_deleted_entries_are_skipped():
+    tag = factories.RecipeTagFactory.create()
+    assert tasks._increment_usage_counts({"recipe_tag": {str(tag.id + 1): 1}}) == 0
+
+
+@pytest.mark.django_db
+def test_counts_are_written_through(mocker):
+    fakeredis = pytest.importorskip("fakeredis")
+    store = autocomplete.RedisStore(fakeredis.FakeRedis())
+    mocker.patch("main.autocomplete.redis_store", return_value=store)
+    user = factories.UserFactory.create()
+    tags = [
+        factories.RecipeTagFactory.create(name=name, user=user)
+        for name in ["Dinner", "Dinner Party"]
+    ]
+    store.rebuild()
+    tasks._increment_usage_counts({"recipe_tag": {str(tags[1].id): 1}})
+    assert store.search(user.pk, "dinner", ["recipe_tag"]) == {
+        "recipe_tag": ["Dinner Party", "Dinner"]
+    }
@@ -0,0 +1,59 @@
+from django import test
+
+from main import usage
+
+
+@test.override_settings(USAGE_FLUSH_INTERVAL=60, USAGE_FLUSH_SIZE=3)
+def test_uses_are_flushed_in_batches(mocker):
+    delay_mock = mocker.patch("main.usage.tasks.increment_usage_counts.delay")
+    usage.record("recipe_tag", 1)
+    usage.record("ingredient_brand", None)
+    usage.record("recipe_tag", 1)
+    assert not delay_mock.called
+    usage.record("ingredient_brand", 2)
+    delay_mock.assert_called_once_with(
+        {"ingredient_brand": {"2": 1}, "recipe_tag": {"1": 2}}
+    )
+
+    # The buffer starts over.
+    usage.record("recipe_tag", 1)
+    assert delay_mock.call_count == 1
+
+
+@test.override_settings(USAGE_FLUSH_INTERVAL=60, USAGE_FLUSH_SIZE=100)
+def test_uses_are_flushed_after_the_interval(mocker):
+    delay_mock = mocker.patch("main.usage.tasks.increment_usage_counts.delay")
+    monotonic_mock = mocker.patch("main.usage.time.monotonic", return_value=100)
+    usage.record("recipe_tag", 1)
+    monotonic_mock.return_value = 159
+    usage.record("recipe_tag", 2)
+    assert not delay_mock.called
+    monotonic_mock.return_value = 160
+    usage.record("recipe_tag", 3)
+    delay_mock.assert_called_once_with({"recipe_tag": {"1": 1, "2": 1, "3": 1}})
+
+
+def test_flush(mocker):
+    delay_mock = mocker.patch("main.usage.tasks.increment_usage_counts.delay")
+    usage.flush()
+    assert not delay_mock.called
+    usage.record("recipe_equipment", 4)
+    usage.flush()
+    delay_mock.assert_called_once_with({"recipe_equipment": {"4": 1}})
+
+
+@test.override_settings(USAGE_FLUSH_INTERVAL=60, USAGE_FLUSH_SIZE=100)
+def test_uses_are_flushed_after_requests_past_the_interval(client, mocker):
+    delay_mock = mocker.patch("main.usage.tasks.increment_usage_counts.delay")
+    monotonic_mock = mocker.patch("main.usage.time.monotonic", return_value=100)
+    usage.record("recipe_tag", 1)
+    monotonic_mock.return_value = 159
+    client.get("/")
+    assert not delay_mock.called
+
+    # Without another use.
+    monotonic_mock.return_value = 160
+    client.get("/")
+    delay_mock.assert_called_once_with({"recipe_tag": {"1": 1}})
+    client.get("/")
+    assert delay_mock.call_count == 1
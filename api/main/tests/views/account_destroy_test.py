@@ -43,9 +43,11 @@ def test_deleting_account_successfully(api_rf, mocker):
     authenticate(request, user)
     request.session = {}
     logout_mock = mocker.patch("main.views.auth.logout")
+    search_mock = mocker.patch("main.views.search.user_deleted")
 
     response = views.account_destroy(request)
 
     delete_mock.assert_called()
+    search_mock.assert_called_with(user.pk)
     logout_mock.assert_called()
     assert response.status_code == status.HTTP_204_NO_CONTENT
@@ -0,0 +1,86 @@
+import pytest
+from django import urls
+from django.test import override_settings
+from rest_framework import permissions, status
+
+from main import documents, summaries, views
+from main.tests import factories
+from main.tests.support import drf_view_helpers as dvh
+from main.tests.support.request_helpers import authenticate
+
+
+def test_http_method_names():
+    assert dvh.has_http_method_names(views.bootstrap, ["get", "options"])
+
+
+def test_permission_classes():
+    permission_classes = [permissions.IsAuthenticated]
+    assert dvh.has_permission_classes(views.bootstrap, permission_classes)
+
+
+@override_settings(RECIPES_PAGE_SIZE=2)
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [1, 10])
+def test_getting_bootstrap_successfully(api_rf, django_assert_num_queries, count):
+    user = factories.UserFactory.create()
+    recipes = [
+        factories.RecipeFactory.create(title=f"Recipe {i:02}", user=user)
+        for i in range(count)
+    ]
+    brands = factories.IngredientBrandFactory.create_batch(count, user=user)
+    units = factories.IngredientUnitFactory.create_batch(count, user=user)
+    equipment = factories.RecipeEquipmentFactory.create_batch(count, user=user)
+    tags = factories.RecipeTagFactory.create_batch(count, user=user)
+    factories.RecipeTagFactory.create()
+    summaries.rebuild()
+    request = api_rf.get(urls.reverse("bootstrap"))
+    authenticate(request, user)
+
+    # One query for the user's recipes version, one for the recipes, and one
+    # for each vocabulary.
+    with django_assert_num_queries(6):
+        response = views.bootstrap(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"]
+    data = response.data["data"]
+    assert [r["id"] for r in data["recipes"]] == [r.id for r in recipes[:2]]
+    assert (data["recipes_next_cursor"] is None) == (count <= 2)
+    assert sorted(b["id"] for b in data["ingredient_brands"]) == [b.id for b in brands]
+    assert sorted(u["id"] for u in data["ingredient_units"]) == [u.id for u in units]
+    assert sorted(e["id"] for e in data["recipe_equipment"]) == [
+        e.id for e in equipment
+    ]
+    assert data["recipe_tags"][0] == {"id": tags[0].id, "name": tags[0].name}
+    assert len(data["recipe_tags"]) == count
+
+
+@pytest.mark.django_db
+def test_getting_unmodified_bootstrap(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    path = urls.reverse("bootstrap")
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.bootstrap(request).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+
+    with django_assert_num_queries(1):
+        response = views.bootstrap(request)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_getting_modified_bootstrap(api_rf):
+    user = factories.UserFactory.create()
+    path = urls.reverse("bootstrap")
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.bootstrap(request).headers["ETag"]
+    documents.vocabulary_changed(user.pk)
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.bootstrap(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
@@ -118,3 +118,23 @@ def test_database_error_is_handled(api_rf, mocker):
     response = views.ingredient_associate(request, recipe.id)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     assert response.data["message"] == _("Your information could not be saved.")
+
+
+@pytest.mark.django_db
+def test_uses_are_recorded(api_rf, mocker):
+    record_mock = mocker.patch("main.views.usage.record", autospec=True)
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    request = api_rf.post(
+        urls.reverse("ingredient_associate", kwargs={"recipe_id": recipe.id}),
+        {"description": "sugar", "unit": "cup"},
+    )
+    authenticate(request, user)
+    response = views.ingredient_associate(request, recipe.id)
+    assert response.status_code == status.HTTP_201_CREATED
+    ingredient = models.Ingredient.objects.get(recipe=recipe)
+    assert record_mock.call_args_list == [
+        mocker.call("ingredient_brand", None),
+        mocker.call("ingredient_description", ingredient.description_id),
+        mocker.call("ingredient_unit", ingredient.unit_id),
+    ]
@@ -72,3 +72,20 @@ def test_matching_ingredient_description_found_sorted_by_length(api_rf):
             )
         }
     }
+
+
+@pytest.mark.django_db
+def test_fuzzy_matching_ingredient_descriptions(api_rf):
+    url = rh.add_query_string(
+        urls.reverse("ingredient_description_search"),
+        {"fuzzy": "true", "search_term": "sausag"},
+    )
+    request = api_rf.get(url)
+    user = factories.UserFactory.create()
+    rh.authenticate(request, user)
+    factories.IngredientDescriptionFactory.create(text="pork sausage", user=user)
+    factories.IngredientDescriptionFactory.create(text="sausge", user=user)
+    factories.IngredientDescriptionFactory.create(text="salsa", user=user)
+    response = views.ingredient_description_search(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"data": {"matches": ["pork sausage", "sausge"]}}
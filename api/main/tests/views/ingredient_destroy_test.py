@@ -31,6 +31,9 @@ def test_ingredient_not_found(api_rf, mocker):
 
 
 def test_destroying_ingredient_successfully(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     path = urls.reverse("ingredient_destroy", kwargs={"ingredient_id": 1})
     request = api_rf.post(path)
     user = factories.UserFactory.build()
@@ -44,3 +47,4 @@ def test_destroying_ingredient_successfully(api_rf, mocker):
     response = views.ingredient_destroy(request, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert ingredient.delete.called
+    assert recipes_changed.called
@@ -58,3 +58,24 @@ def test_getting_ingredient_successfully(api_rf, mocker):
     assert response.data["data"]["unit"]["name"] == unit.name
     assert response.data["data"]["brand"]["name"] == brand.name
     assert response.data["data"]["description"]["text"] == description.text
+
+
+def test_getting_unmodified_ingredient(api_rf, mocker):
+    user = factories.UserFactory.build()
+    path = urls.reverse("ingredient", kwargs={"ingredient_id": 1})
+    ingredient = factories.IngredientFactory.build(
+        description=factories.IngredientDescriptionFactory.build(user=user),
+        id=1,
+        recipe=factories.RecipeFactory.build(id=1, user=user),
+    )
+    mocker.patch(
+        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=ingredient
+    )
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.ingredient(request, 1).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.ingredient(request, 1)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
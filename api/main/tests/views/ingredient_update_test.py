@@ -99,3 +99,26 @@ def test_database_error_is_handled(api_rf, mocker):
     response = views.ingredient_update(request, ingredient.id)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     assert response.data["message"] == _("Your information could not be saved.")
+
+
+@pytest.mark.django_db
+def test_uses_are_recorded(api_rf, mocker):
+    record_mock = mocker.patch("main.views.usage.record", autospec=True)
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    ingredient = factories.IngredientFactory.create(
+        description__user=user, recipe=recipe
+    )
+    request = api_rf.post(
+        urls.reverse("ingredient_update", kwargs={"ingredient_id": ingredient.id}),
+        {"brand": "Acme", "description": "sugar"},
+    )
+    authenticate(request, user)
+    response = views.ingredient_update(request, ingredient.id)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    ingredient.refresh_from_db()
+    # The unit wasn't chosen, so it isn't counted.
+    assert record_mock.call_args_list == [
+        mocker.call("ingredient_brand", ingredient.brand_id),
+        mocker.call("ingredient_description", ingredient.description_id),
+    ]
@@ -27,6 +27,9 @@ def test_invalid_request_data(api_rf):
 
 
 def test_creating_recipe_successfully(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     user = factories.UserFactory.build()
     recipe = factories.RecipeFactory.build(id=777, user=user)
     crs_class = mocker.patch(
@@ -41,3 +44,4 @@ def test_creating_recipe_successfully(api_rf, mocker):
     response = views.recipe_create(request)
     assert response.status_code == status.HTTP_201_CREATED
     crs_instance.save.assert_called_with(user=user)
+    recipes_changed.assert_called_once_with(recipe.id)
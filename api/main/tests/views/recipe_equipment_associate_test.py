@@ -91,3 +91,20 @@ def test_returning_already_created_recipe_equipment_with_recipe(api_rf):
     assert response.data == {
         "data": {"id": recipe_equipment.id, "description": recipe_equipment.description}
     }
+
+
+@pytest.mark.django_db
+def test_uses_are_recorded_once_per_recipe(api_rf, mocker):
+    record_mock = mocker.patch("main.views.usage.record", autospec=True)
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    recipe_equipment = factories.RecipeEquipmentFactory.create(user=user)
+    path = urls.reverse("recipe_equipment_associate", kwargs={"recipe_id": recipe.id})
+
+    for _ in range(2):
+        request = api_rf.post(path, {"description": recipe_equipment.description})
+        authenticate(request, user)
+        response = views.recipe_equipment_associate(request, recipe.id)
+        assert response.status_code == status.HTTP_200_OK
+
+    record_mock.assert_called_once_with("recipe_equipment", recipe_equipment.id)
@@ -45,6 +45,11 @@ def test_destroying_recipe_equipment_successfully(api_rf, mocker):
         autospec=True,
         return_value=recipe_equipment,
     )
+    vocabulary_changed = mocker.patch(
+        "main.views.documents.vocabulary_changed", autospec=True
+    )
     response = views.recipe_equipment_destroy(request, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert recipe_equipment.delete.called
+    # Unused by any recipe, so only the vocabulary changed.
+    vocabulary_changed.assert_called_once_with(user.pk)
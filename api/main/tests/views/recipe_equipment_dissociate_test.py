@@ -63,6 +63,9 @@ def test_recipe_equipment_not_found(api_rf, mocker):
 
 
 def test_successfully_dissociating_recipe_equipment_from_recipe(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     path = urls.reverse(
         "recipe_equipment_dissociate", kwargs={"equipment_id": 1, "recipe_id": 1}
     )
@@ -83,3 +86,4 @@ def test_successfully_dissociating_recipe_equipment_from_recipe(api_rf, mocker):
     response = views.recipe_equipment_dissociate(request, 1, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert recipe.recipe_equipment.remove.call_args.args[0] == recipe_equipment
+    assert recipes_changed.called
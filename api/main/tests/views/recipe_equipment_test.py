@@ -48,3 +48,22 @@ def test_getting_recipe_equipment_successfully(api_rf, mocker):
     assert response.data == {
         "data": {"id": recipe_equipment.id, "description": recipe_equipment.description}
     }
+
+
+def test_getting_unmodified_recipe_equipment(api_rf, mocker):
+    user = factories.UserFactory.build()
+    path = urls.reverse("recipe_equipment", kwargs={"equipment_id": 1})
+    recipe_equipment = factories.RecipeEquipmentFactory.build(id=1, user=user)
+    mocker.patch(
+        "main.views.shortcuts.get_object_or_404",
+        autospec=True,
+        return_value=recipe_equipment,
+    )
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe_equipment(request, 1).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipe_equipment(request, 1)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
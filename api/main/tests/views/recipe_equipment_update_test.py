@@ -1,3 +1,4 @@
+import pytest
 from django import http, urls
 from rest_framework import permissions, status
 
@@ -51,6 +52,7 @@ def test_updating_with_invalid_data(api_rf, mocker):
     assert len(response.data["message"]) > 0
 
 
+@pytest.mark.django_db
 def test_updating_successfully(api_rf, mocker):
     user = factories.UserFactory.build()
     recipe_equipment = factories.RecipeEquipmentFactory.build(id=1)
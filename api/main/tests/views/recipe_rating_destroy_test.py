@@ -1,7 +1,8 @@
-from django import http, urls
+import pytest
+from django import urls
 from rest_framework import permissions, status
 
-from main import views
+from main import models, views
 from main.tests import factories
 from main.tests.support import drf_view_helpers as dvh
 from main.tests.support.request_helpers import authenticate
@@ -16,31 +17,36 @@ def test_permission_classes():
     assert dvh.has_permission_classes(views.recipe_rating_destroy, permission_classes)
 
 
-def test_recipe_rating_not_found(api_rf, mocker):
-    path = urls.reverse("recipe_rating_destroy", kwargs={"recipe_id": 1})
+@pytest.mark.django_db
+def test_recipe_rating_not_found(api_rf):
+    recipe = factories.RecipeFactory.create(rating=5)
+    user = factories.UserFactory.create()
+    path = urls.reverse("recipe_rating_destroy", kwargs={"recipe_id": recipe.id})
     request = api_rf.post(path)
-    user = factories.UserFactory.build()
     authenticate(request, user)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404",
-        autospec=True,
-        side_effect=http.Http404,
-    )
-    response = views.recipe_rating_destroy(request, 1)
+    response = views.recipe_rating_destroy(request, recipe.id)
     assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert models.Recipe.objects.get(pk=recipe.id).rating == 5
 
 
-def test_destroying_recipe_rating_successfully(api_rf, mocker):
-    path = urls.reverse("recipe_rating_destroy", kwargs={"recipe_id": 1})
+@pytest.mark.django_db
+def test_destroying_recipe_rating_successfully(
+    api_rf, django_assert_num_queries, mocker
+):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(rating=5, user=user)
+    path = urls.reverse("recipe_rating_destroy", kwargs={"recipe_id": recipe.id})
     request = api_rf.post(path)
-    user = factories.UserFactory.build()
     authenticate(request, user)
-    recipe = factories.RecipeFactory.build(id=1, rating=5, user=user)
-    recipe_save_mock = mocker.patch.object(recipe, "save", autospec=True)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe
-    )
-    response = views.recipe_rating_destroy(request, 1)
+
+    # A single UPDATE, without reading the recipe first, in a savepoint.
+    with django_assert_num_queries(3):
+        response = views.recipe_rating_destroy(request, recipe.id)
+
     assert response.status_code == status.HTTP_204_NO_CONTENT
+    recipe.refresh_from_db()
     assert recipe.rating is None
-    assert recipe_save_mock.called
+    recipes_changed.assert_called_once_with(recipe.id)
@@ -42,3 +42,20 @@ def test_getting_recipe_rating_successfully(api_rf, mocker):
     response = views.recipe_rating(request, 1)
     assert response.status_code == status.HTTP_200_OK
     assert response.data == {"data": {"rating": recipe.rating}}
+
+
+def test_getting_unmodified_recipe_rating(api_rf, mocker):
+    user = factories.UserFactory.build()
+    path = urls.reverse("recipe_rating", kwargs={"recipe_id": 1})
+    recipe = factories.RecipeFactory.build(id=1, rating=5, user=user)
+    mocker.patch(
+        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe
+    )
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe_rating(request, 1).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipe_rating(request, 1)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
@@ -1,4 +1,5 @@
-from django import http, urls
+import pytest
+from django import urls
 from rest_framework import permissions, status
 
 from main import views
@@ -16,52 +17,45 @@ def test_permission_classes():
     assert dvh.has_permission_classes(views.recipe_rating_update, permission_classes)
 
 
-def test_recipe_not_found(api_rf, mocker):
-    user = factories.UserFactory.build()
-    path = urls.reverse("recipe_rating_update", kwargs={"recipe_id": 1})
-    request = api_rf.post(path)
+@pytest.mark.django_db
+def test_recipe_not_found(api_rf):
+    recipe = factories.RecipeFactory.create()
+    user = factories.UserFactory.create()
+    path = urls.reverse("recipe_rating_update", kwargs={"recipe_id": recipe.id})
+    request = api_rf.post(path, {"rating": "1"})
     authenticate(request, user)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404",
-        autospec=True,
-        side_effect=http.Http404,
-    )
-    response = views.recipe_rating_update(request, 1)
+    response = views.recipe_rating_update(request, recipe.id)
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_updating_with_invalid_data(api_rf, mocker):
+def test_updating_with_invalid_data(api_rf):
     user = factories.UserFactory.build()
-    recipe = factories.RecipeFactory.build(id=1, rating=5, user=user)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe
-    )
     request = api_rf.post(
-        urls.reverse("recipe_rating_update", kwargs={"recipe_id": recipe.id}), {}
+        urls.reverse("recipe_rating_update", kwargs={"recipe_id": 1}), {}
     )
     authenticate(request, user)
-    response = views.recipe_rating_update(request, recipe.id)
+    response = views.recipe_rating_update(request, 1)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     assert len(response.data["errors"]) > 0
     assert len(response.data["message"]) > 0
 
 
-def test_updating_successfully(api_rf, mocker):
-    user = factories.UserFactory.build()
-    recipe = factories.RecipeFactory.build(id=1, rating=5, user=user)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe
-    )
-    rrus_class = mocker.patch(
-        "main.views.serializers.RecipeRatingUpdateSerializer", autospec=True
-    )
-    rrus_instance = rrus_class.return_value
-    rrus_instance.is_valid.return_value = True
-    request = api_rf.post(
-        urls.reverse("recipe_rating_update", kwargs={"recipe_id": recipe.id}),
-        {"rating": "1"},
+@pytest.mark.django_db
+def test_updating_successfully(api_rf, django_assert_num_queries, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
     )
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    path = urls.reverse("recipe_rating_update", kwargs={"recipe_id": recipe.id})
+    request = api_rf.post(path, {"rating": "1"})
     authenticate(request, user)
-    response = views.recipe_rating_update(request, recipe.id)
+
+    # A single UPDATE, without reading the recipe first, in a savepoint.
+    with django_assert_num_queries(3):
+        response = views.recipe_rating_update(request, recipe.id)
+
     assert response.status_code == status.HTTP_204_NO_CONTENT
-    assert rrus_instance.save.called
+    recipe.refresh_from_db()
+    assert recipe.rating == 1
+    recipes_changed.assert_called_once_with(recipe.id)
@@ -81,3 +81,20 @@ def test_returning_already_created_recipe_tag_with_recipe(api_rf):
     response = views.recipe_tag_associate(request, recipe.id)
     assert response.status_code == status.HTTP_200_OK
     assert response.data == {"data": {"id": recipe_tag.id, "name": recipe_tag.name}}
+
+
+@pytest.mark.django_db
+def test_uses_are_recorded_once_per_recipe(api_rf, mocker):
+    record_mock = mocker.patch("main.views.usage.record", autospec=True)
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    recipe_tag = factories.RecipeTagFactory.create(user=user)
+    path = urls.reverse("recipe_tag_associate", kwargs={"recipe_id": recipe.id})
+
+    for _ in range(2):
+        request = api_rf.post(path, {"name": recipe_tag.name})
+        authenticate(request, user)
+        response = views.recipe_tag_associate(request, recipe.id)
+        assert response.status_code == status.HTTP_200_OK
+
+    record_mock.assert_called_once_with("recipe_tag", recipe_tag.id)
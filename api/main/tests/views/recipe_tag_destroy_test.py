@@ -39,6 +39,11 @@ def test_destroying_recipe_tag_successfully(api_rf, mocker):
     mocker.patch(
         "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe_tag
     )
+    vocabulary_changed = mocker.patch(
+        "main.views.documents.vocabulary_changed", autospec=True
+    )
     response = views.recipe_tag_destroy(request, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert recipe_tag.delete.called
+    # Unused by any recipe, so only the vocabulary changed.
+    vocabulary_changed.assert_called_once_with(user.pk)
@@ -55,6 +55,9 @@ def test_recipe_tag_not_found(api_rf, mocker):
 
 
 def test_successfully_dissociating_recipe_tag_from_recipe(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     path = urls.reverse("recipe_tag_dissociate", kwargs={"tag_id": 1, "recipe_id": 1})
     request = api_rf.post(path)
     user = factories.UserFactory.build()
@@ -73,3 +76,4 @@ def test_successfully_dissociating_recipe_tag_from_recipe(api_rf, mocker):
     response = views.recipe_tag_dissociate(request, 1, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert recipe.recipe_tags.remove.call_args.args[0] == recipe_tag
+    assert recipes_changed.called
@@ -42,3 +42,20 @@ def test_getting_recipe_tag_successfully(api_rf, mocker):
     response = views.recipe_tag(request, 1)
     assert response.status_code == status.HTTP_200_OK
     assert response.data == {"data": {"id": recipe_tag.id, "name": recipe_tag.name}}
+
+
+def test_getting_unmodified_recipe_tag(api_rf, mocker):
+    user = factories.UserFactory.build()
+    path = urls.reverse("recipe_tag", kwargs={"tag_id": 1})
+    recipe_tag = factories.RecipeTagFactory.build(id=1, user=user)
+    mocker.patch(
+        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe_tag
+    )
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe_tag(request, 1).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipe_tag(request, 1)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
@@ -1,10 +1,12 @@
 import pytest
-from django import http, urls
+from django import db, http, urls
+from django.test import utils as test_utils
 from rest_framework import permissions, status
 
-from main import views
+from main import documents, views
 from main.tests import factories
 from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
 from main.tests.support.request_helpers import authenticate
 
 
@@ -18,16 +20,14 @@ def test_permission_classes():
 
 
 @pytest.mark.django_db
-def test_getting_recipe_successfully(api_rf, mocker):
-    user = factories.UserFactory.build()
-    recipe = factories.RecipeFactory.build(id=777, user=user)
+def test_getting_recipe_successfully(api_rf):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
     request = api_rf.get(urls.reverse("recipe", kwargs={"recipe_id": recipe.id}))
     authenticate(request, user)
-    mocker.patch(
-        "main.views.shortcuts.get_object_or_404", autospec=True, return_value=recipe
-    )
     response = views.recipe(request, recipe.id)
     assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"]
     assert response.data == {
         "data": {
             "id": recipe.id,
@@ -43,6 +43,40 @@ def test_getting_recipe_successfully(api_rf, mocker):
     }
 
 
+@pytest.mark.django_db
+def test_getting_unmodified_recipe(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    path = urls.reverse("recipe", kwargs={"recipe_id": recipe.id})
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe(request, recipe.id).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+
+    with django_assert_num_queries(1):
+        response = views.recipe(request, recipe.id)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_getting_modified_recipe(api_rf):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    path = urls.reverse("recipe", kwargs={"recipe_id": recipe.id})
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe(request, recipe.id).headers["ETag"]
+    documents.recipes_changed(recipe.id)
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipe(request, recipe.id)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
 def test_getting_missing_recipe(api_rf, mocker):
     user = factories.UserFactory.build()
     request = api_rf.get(urls.reverse("recipe", kwargs={"recipe_id": 777}))
@@ -54,3 +88,85 @@ def test_getting_missing_recipe(api_rf, mocker):
     )
     response = views.recipe(request, 777)
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ingredient_count", [1, 10, 500])
+def test_query_count_is_independent_of_ingredient_count(
+    api_rf, django_assert_num_queries, ingredient_count
+):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    factories.IngredientFactory.create_batch(
+        ingredient_count,
+        brand=factories.IngredientBrandFactory.create(user=user),
+        description__user=user,
+        recipe=recipe,
+        unit=factories.IngredientUnitFactory.create(user=user),
+    )
+    recipe.recipe_equipment.add(factories.RecipeEquipmentFactory.create(user=user))
+    recipe.recipe_tags.add(factories.RecipeTagFactory.create(user=user))
+    factories.RecipeTimeFactory.create(recipe=recipe)
+    request = api_rf.get(urls.reverse("recipe", kwargs={"recipe_id": recipe.id}))
+    authenticate(request, user)
+
+    # One query for the recipe's version, then one for the recipe and one for
+    # each of its four relations, or one for the whole document on PostgreSQL.
+    with django_assert_num_queries(2 if db.connection.vendor == "postgresql" else 6):
+        response = views.recipe(request, recipe.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["data"]["ingredients"]) == ingredient_count
+    assert response.data["data"]["ingredients"][0]["brand"] is not None
+
+
+@pytest.mark.django_db
+def test_getting_sparse_recipe(api_rf):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(rating=4, user=user)
+    factories.IngredientFactory.create(description__user=user, recipe=recipe)
+    url = rh.add_query_string(
+        urls.reverse("recipe", kwargs={"recipe_id": recipe.id}),
+        {"fields": "title,rating"},
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+
+    with test_utils.CaptureQueriesContext(db.connection) as context:
+        response = views.recipe(request, recipe.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"data": {"rating": 4, "title": recipe.title}}
+    assert len(context.captured_queries) == 2
+    assert not any("main_ingredient" in q["sql"] for q in context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_getting_sparse_recipe_from_cached_document(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    documents.get_recipe_document(recipe)
+    url = rh.add_query_string(
+        urls.reverse("recipe", kwargs={"recipe_id": recipe.id}),
+        {"fields": "recipe_tags,id"},
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+
+    with django_assert_num_queries(1):
+        response = views.recipe(request, recipe.id)
+
+    assert response.data == {"data": {"id": recipe.id, "recipe_tags": []}}
+
+
+def test_getting_recipe_with_unknown_fields(api_rf):
+    user = factories.UserFactory.build()
+    url = rh.add_query_string(
+        urls.reverse("recipe", kwargs={"recipe_id": 1}), {"fields": "title,user"}
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+    response = views.recipe(request, 1)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]["fields"]) > 0
+    assert len(response.data["message"]) > 0
@@ -46,6 +46,9 @@ def test_invalid_request_data(api_rf, mocker):
 
 
 def test_creating_recipe_time_successfully(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     user = factories.UserFactory.build()
     recipe = factories.RecipeFactory.build(id=1, user=user)
     data = {"minutes": 30, "time_type": "Cook"}
@@ -65,3 +68,4 @@ def test_creating_recipe_time_successfully(api_rf, mocker):
     assert response.status_code == status.HTTP_201_CREATED
     assert "data" in response.data
     crts.save.assert_called_with(recipe=recipe)
+    assert recipes_changed.called
@@ -31,6 +31,9 @@ def test_recipe_time_not_found(api_rf, mocker):
 
 
 def test_destroying_recipe_time_successfully(api_rf, mocker):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     path = urls.reverse("recipe_time_destroy", kwargs={"time_id": 1})
     request = api_rf.post(path)
     user = factories.UserFactory.build()
@@ -44,3 +47,4 @@ def test_destroying_recipe_time_successfully(api_rf, mocker):
     response = views.recipe_time_destroy(request, 1)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert recipe_time.delete.called
+    assert recipes_changed.called
@@ -53,3 +53,24 @@ def test_getting_recipe_time_successfully(api_rf, mocker):
     response = views.recipe_time(request, 1)
     assert response.status_code == status.HTTP_200_OK
     assert response.data == {"data": recipe_time_fields}
+
+
+def test_getting_unmodified_recipe_time(api_rf, mocker):
+    user = factories.UserFactory.build()
+    path = urls.reverse("recipe_time", kwargs={"time_id": 1})
+    recipe_time = factories.RecipeTimeFactory.build(
+        id=1, recipe=factories.RecipeFactory.build(id=1, user=user)
+    )
+    mocker.patch(
+        "main.views.shortcuts.get_object_or_404",
+        autospec=True,
+        return_value=recipe_time,
+    )
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipe_time(request, 1).headers["ETag"]
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipe_time(request, 1)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
@@ -54,6 +54,9 @@ def test_updating_with_invalid_data(api_rf, mocker):
 @pytest.mark.parametrize("hours", ["", "5"])
 @pytest.mark.parametrize("minutes", ["", "5"])
 def test_updating_successfully(api_rf, mocker, days, hours, minutes):
+    recipes_changed = mocker.patch(
+        "main.views.documents.recipes_changed", autospec=True
+    )
     user = factories.UserFactory.build()
     recipe = factories.RecipeFactory.build(user=user)
     recipe_time = factories.RecipeTimeFactory.build(recipe=recipe, id=1)
@@ -78,3 +81,4 @@ def test_updating_successfully(api_rf, mocker, days, hours, minutes):
     response = views.recipe_time_update(request, recipe_time.id)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert rtus_instance.save.called
+    assert recipes_changed.called
@@ -0,0 +1,87 @@
+import pytest
+from django import urls
+from rest_framework import status
+
+from main import documents, models
+from main.tests import factories
+from main.tests.support.request_helpers import authenticate
+
+# Each mutating view, the URL kwargs it's called with, and the data it's sent.
+MUTATIONS = [
+    ("ingredient_associate", {"recipe_id": "recipe"}, {"description": "salt"}),
+    ("ingredient_destroy", {"ingredient_id": "ingredient"}, {}),
+    ("ingredient_update", {"ingredient_id": "ingredient"}, {"description": "salt"}),
+    ("recipe_equipment_associate", {"recipe_id": "recipe"}, {"description": "pan"}),
+    ("recipe_equipment_destroy", {"equipment_id": "equipment"}, {}),
+    (
+        "recipe_equipment_dissociate",
+        {"equipment_id": "equipment", "recipe_id": "recipe"},
+        {},
+    ),
+    ("recipe_equipment_update", {"equipment_id": "equipment"}, {"description": "pan"}),
+    (
+        "recipe_equipment_update_for_recipe",
+        {"equipment_id": "equipment", "recipe_id": "recipe"},
+        {"description": "pan"},
+    ),
+    ("recipe_notes_destroy", {"recipe_id": "recipe"}, {}),
+    ("recipe_notes_update", {"recipe_id": "recipe"}, {"notes": "Stir."}),
+    ("recipe_rating_destroy", {"recipe_id": "recipe"}, {}),
+    ("recipe_rating_update", {"recipe_id": "recipe"}, {"rating": 4}),
+    ("recipe_servings_destroy", {"recipe_id": "recipe"}, {}),
+    ("recipe_servings_update", {"recipe_id": "recipe"}, {"servings": 2}),
+    ("recipe_tag_associate", {"recipe_id": "recipe"}, {"name": "Dinner"}),
+    ("recipe_tag_destroy", {"tag_id": "tag"}, {}),
+    ("recipe_tag_dissociate", {"recipe_id": "recipe", "tag_id": "tag"}, {}),
+    ("recipe_tag_update", {"tag_id": "tag"}, {"name": "Dinner"}),
+    (
+        "recipe_tag_update_for_recipe",
+        {"recipe_id": "recipe", "tag_id": "tag"},
+        {"name": "Dinner"},
+    ),
+    (
+        "recipe_time_create",
+        {"recipe_id": "recipe"},
+        {"minutes": 5, "time_type": "Cook"},
+    ),
+    ("recipe_time_destroy", {"time_id": "time"}, {}),
+    (
+        "recipe_time_update",
+        {"time_id": "time"},
+        {"minutes": 5, "time_type": "Cook"},
+    ),
+    ("recipe_title_update", {"recipe_id": "recipe"}, {"title": "New Title"}),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name,url_kwargs,data", MUTATIONS)
+def test_mutation_bumps_version_and_invalidates_document(
+    api_rf, view_name, url_kwargs, data
+):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    equipment = factories.RecipeEquipmentFactory.create(user=user)
+    tag = factories.RecipeTagFactory.create(user=user)
+    recipe.recipe_equipment.add(equipment)
+    recipe.recipe_tags.add(tag)
+    objects = {
+        "equipment": equipment,
+        "ingredient": factories.IngredientFactory.create(
+            description__user=user, recipe=recipe
+        ),
+        "recipe": recipe,
+        "tag": tag,
+        "time": factories.RecipeTimeFactory.create(recipe=recipe),
+    }
+    kwargs = {k: objects[v].id for k, v in url_kwargs.items()}
+    documents.get_recipe_document(recipe)
+    path = urls.reverse(view_name, kwargs=kwargs)
+    request = api_rf.post(path, data)
+    authenticate(request, user)
+    response = urls.resolve(path).func(request, **kwargs)
+    assert status.is_success(response.status_code)
+    recipe = models.Recipe.objects.get(pk=recipe.id)
+    assert recipe.version == 2
+    documents.get_recipe_document(recipe)
+    assert documents.stats() == {"hits": 0, "misses": 2}
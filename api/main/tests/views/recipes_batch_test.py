@@ -0,0 +1,79 @@
+import pytest
+from django import db, urls
+from django.test import override_settings
+from rest_framework import permissions, status
+
+from main import views
+from main.tests import factories
+from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
+from main.tests.support.request_helpers import authenticate
+
+
+def test_http_method_names():
+    assert dvh.has_http_method_names(views.recipes_batch, ["get", "options"])
+
+
+def test_permission_classes():
+    permission_classes = [permissions.IsAuthenticated]
+    assert dvh.has_permission_classes(views.recipes_batch, permission_classes)
+
+
+@pytest.mark.django_db
+def test_getting_recipes_batch_successfully(api_rf):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(2, user=user)
+    factories.IngredientFactory.create(description__user=user, recipe=recipes[0])
+    other = factories.RecipeFactory.create()
+    ids = [recipes[1].id, other.id, recipes[0].id, 0, recipes[1].id]
+    url = rh.add_query_string(
+        urls.reverse("recipes_batch"), {"ids": ",".join(str(i) for i in ids)}
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+    response = views.recipes_batch(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["missing_ids"] == [other.id, 0]
+    assert [r["id"] for r in response.data["data"]["recipes"]] == [
+        recipes[1].id,
+        recipes[0].id,
+    ]
+    assert len(response.data["data"]["recipes"][1]["ingredients"]) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1, 10, 50])
+def test_getting_recipes_batch_query_count(api_rf, django_assert_num_queries, size):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(size, user=user)
+
+    for recipe in recipes:
+        factories.IngredientFactory.create(description__user=user, recipe=recipe)
+
+    url = rh.add_query_string(
+        urls.reverse("recipes_batch"), {"ids": ",".join(str(r.id) for r in recipes)}
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+
+    # The recipes' versions, then their documents (with a query for each
+    # relation, except on PostgreSQL).
+    with django_assert_num_queries(2 if db.connection.vendor == "postgresql" else 6):
+        views.recipes_batch(request)
+
+
+@override_settings(RECIPES_BATCH_MAX_SIZE=2)
+@pytest.mark.parametrize("ids", [None, "", "1,x", "1,2,3"])
+def test_getting_recipes_batch_with_invalid_ids(api_rf, ids):
+    user = factories.UserFactory.build()
+    url = urls.reverse("recipes_batch")
+
+    if ids is not None:
+        url = rh.add_query_string(url, {"ids": ids})
+
+    request = api_rf.get(url)
+    authenticate(request, user)
+    response = views.recipes_batch(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]["ids"]) > 0
+    assert len(response.data["message"]) > 0
@@ -0,0 +1,93 @@
+import base64
+import json
+
+import pytest
+from django import urls
+from django.test import override_settings
+from rest_framework import permissions, status
+
+from main import search, summaries, views
+from main.tests import factories
+from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
+from main.tests.support.request_helpers import authenticate
+
+
+def search_recipes(api_rf, user, params):
+    request = api_rf.get(rh.add_query_string(urls.reverse("recipes_search"), params))
+    authenticate(request, user)
+    return views.recipes_search(request)
+
+
+def make_cursor(values):
+    data = json.dumps({"ordering": search.ORDERING, "values": values})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def test_http_method_names():
+    assert dvh.has_http_method_names(views.recipes_search, ["get", "options"])
+
+
+def test_permission_classes():
+    permission_classes = [permissions.IsAuthenticated]
+    assert dvh.has_permission_classes(views.recipes_search, permission_classes)
+
+
+@pytest.mark.django_db
+def test_searching_recipes_successfully(api_rf):
+    user = factories.UserFactory.create()
+    notes = factories.RecipeFactory.create(
+        notes="Serve with bread.", title="Soup", user=user
+    )
+    title = factories.RecipeFactory.create(title="Bread", user=user)
+    factories.RecipeFactory.create(title="Cake", user=user)
+    factories.RecipeFactory.create(title="Bread")
+    search.rebuild()
+    summaries.rebuild()
+    response = search_recipes(api_rf, user, {"q": "bread"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["id"] for r in response.data["data"]] == [title.id, notes.id]
+    assert response.data["data"][0]["title"] == "Bread"
+    assert response.data["next_cursor"] is None
+
+
+@override_settings(RECIPES_PAGE_SIZE=2)
+@pytest.mark.django_db
+def test_searching_recipes_in_pages(api_rf):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(5, title="Soup", user=user)
+    search.rebuild()
+    summaries.rebuild()
+    params = {"q": "soup"}
+    ids = []
+
+    while True:
+        response = search_recipes(api_rf, user, params)
+        ids.extend(r["id"] for r in response.data["data"])
+
+        if response.data["next_cursor"] is None:
+            break
+
+        params["cursor"] = response.data["next_cursor"]
+
+    assert ids == [r.id for r in recipes]
+
+
+@pytest.mark.parametrize(
+    "params, field",
+    [
+        ({}, "q"),
+        ({"q": " "}, "q"),
+        ({"q": "a", "cursor": "x"}, "cursor"),
+        ({"q": "a", "cursor": make_cursor([1.5, "abc"])}, "cursor"),
+        ({"q": "a", "cursor": make_cursor(["abc", 1])}, "cursor"),
+        ({"q": "a", "cursor": make_cursor([1.5, [1]])}, "cursor"),
+        ({"q": "a", "cursor": make_cursor([None, 1])}, "cursor"),
+    ],
+)
+def test_searching_recipes_with_invalid_params(api_rf, params, field):
+    user = factories.UserFactory.build()
+    response = search_recipes(api_rf, user, params)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"][field]) > 0
+    assert len(response.data["message"]) > 0
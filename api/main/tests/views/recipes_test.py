@@ -1,13 +1,18 @@
+import base64
 import json
+import tracemalloc
 
-import factory
 import pytest
-from django import urls
+from django import db, urls
+from django.test import override_settings
+from django.test import utils as test_utils
+from django.utils import http
 from rest_framework import permissions, status
 
-from main import views
+from main import documents, models, serializers, summaries, views
 from main.tests import factories
 from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
 from main.tests.support.request_helpers import authenticate
 
 
@@ -21,35 +26,390 @@ def test_permission_classes():
 
 
 @pytest.mark.django_db
-def test_getting_recipes_successfully(api_rf, mocker):
-    user = factories.UserFactory.build()
-    recipes = factories.RecipeFactory.build_batch(
-        id=factory.Sequence(lambda n: n + 1), size=2, user=user
+def test_getting_recipes_successfully(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipes = [
+        factories.RecipeFactory.create(rating=r, title=t, user=user)
+        for r, t in [(None, "b"), (4, "a")]
+    ]
+    recipes[1].recipe_tags.add(
+        factories.RecipeTagFactory.create(name="Dinner", user=user),
+        factories.RecipeTagFactory.create(name="Quick", user=user),
+    )
+    factories.IngredientFactory.create_batch(
+        2, description__user=user, recipe=recipes[1]
     )
+    factories.RecipeTimeFactory.create(days=1, hours=2, minutes=3, recipe=recipes[1])
+    factories.RecipeTimeFactory.create(
+        days=None, hours=None, minutes=4, recipe=recipes[1]
+    )
+    factories.RecipeFactory.create()
+    summaries.refresh(*models.Recipe.objects.values_list("id", flat=True))
     request = api_rf.get(urls.reverse("recipes"))
     authenticate(request, user)
-    recipe_mock = mocker.MagicMock()
-    recipe_mock.objects.filter().all.return_value = recipes
-    mocker.patch("main.views.models.Recipe", new=recipe_mock)
-    response = views.recipes(request)
+
+    # One query for the user's recipes version, and one for the summaries.
+    with django_assert_num_queries(2):
+        response = views.recipes(request)
+
     response.render()
     assert response.status_code == status.HTTP_200_OK
     assert json.loads(response.content) == {
         "data": [
-            {"id": recipes[0].id, "title": recipes[0].title},
-            {"id": recipes[1].id, "title": recipes[1].title},
+            {
+                "id": recipes[1].id,
+                "ingredient_count": 2,
+                "rating": 4,
+                "tag_names": ["Dinner", "Quick"],
+                "title": "a",
+                "total_minutes": 24 * 60 + 2 * 60 + 3 + 4,
+            },
+            {
+                "id": recipes[0].id,
+                "ingredient_count": 0,
+                "rating": None,
+                "tag_names": [],
+                "title": "b",
+                "total_minutes": None,
+            },
         ],
+        "next_cursor": None,
     }
 
 
-def test_getting_empty_recipes(api_rf, mocker):
-    user = factories.UserFactory.build()
+@pytest.mark.django_db
+def test_getting_empty_recipes(api_rf):
+    user = factories.UserFactory.create()
     request = api_rf.get(urls.reverse("recipes"))
     authenticate(request, user)
-    recipe_mock = mocker.MagicMock()
-    recipe_mock.objects.filter().all.return_value = []
-    mocker.patch("main.views.models.Recipe", new=recipe_mock)
     response = views.recipes(request)
     response.render()
     assert response.status_code == status.HTTP_200_OK
-    assert json.loads(response.content) == {"data": []}
+    assert json.loads(response.content) == {"data": [], "next_cursor": None}
+
+
+@pytest.mark.django_db
+def test_getting_unmodified_recipes(api_rf, django_assert_num_queries, freezer):
+    user = factories.UserFactory.create()
+    freezer.tick()
+    path = urls.reverse("recipes")
+    request = api_rf.get(path)
+    authenticate(request, user)
+    response = views.recipes(request)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    for headers in [
+        {"HTTP_IF_NONE_MATCH": etag},
+        {"HTTP_IF_MODIFIED_SINCE": last_modified},
+    ]:
+        request = api_rf.get(path, **headers)
+        authenticate(request, user)
+
+        with django_assert_num_queries(1):
+            response = views.recipes(request)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_getting_recipes_modified_this_second(api_rf, freezer):
+    user = factories.UserFactory.create()
+    path = urls.reverse("recipes")
+    request = api_rf.get(path)
+    authenticate(request, user)
+    assert "Last-Modified" not in views.recipes(request).headers
+
+    # Another write this second would have the same Last-Modified.
+    request = api_rf.get(path, HTTP_IF_MODIFIED_SINCE=http.http_date())
+    authenticate(request, user)
+    assert views.recipes(request).status_code == status.HTTP_200_OK
+
+    freezer.tick()
+    request = api_rf.get(path)
+    authenticate(request, user)
+    assert "Last-Modified" in views.recipes(request).headers
+
+
+@pytest.mark.django_db
+def test_getting_modified_recipes(api_rf):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    path = urls.reverse("recipes")
+    request = api_rf.get(path)
+    authenticate(request, user)
+    etag = views.recipes(request).headers["ETag"]
+    documents.recipes_changed(recipe.id)
+    request = api_rf.get(path, HTTP_IF_NONE_MATCH=etag)
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+    # Each query has its own ETag.
+    request = api_rf.get(rh.add_query_string(path, {"sort": "id"}))
+    authenticate(request, user)
+    assert views.recipes(request).headers["ETag"] != response.headers["ETag"]
+
+
+@override_settings(RECIPES_PAGE_SIZE=2)
+@pytest.mark.django_db
+def test_paginating_recipes(api_rf):
+    user = factories.UserFactory.create()
+    recipes = [
+        factories.RecipeFactory.create(title=t, user=user)
+        for t in ["c", "a", "b", "a", "d"]
+    ]
+    summaries.refresh(*(r.id for r in recipes))
+    expected = sorted(recipes, key=lambda r: (r.title, r.id))
+    pages = []
+    cursor = None
+
+    while True:
+        url = urls.reverse("recipes")
+
+        if cursor is not None:
+            url = rh.add_query_string(url, {"cursor": cursor})
+
+        request = api_rf.get(url)
+        authenticate(request, user)
+        response = views.recipes(request)
+        pages.append([r["id"] for r in response.data["data"]])
+
+        if (cursor := response.data["next_cursor"]) is None:
+            break
+
+    assert pages == [
+        [expected[0].id, expected[1].id],
+        [expected[2].id, expected[3].id],
+        [expected[4].id],
+    ]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "nope",
+        {"ordering": ["title", "pk"], "values": ["a", "abc"]},
+        {"ordering": ["title", "pk"], "values": ["a", [1]]},
+        {"ordering": ["title", "pk"], "values": [None, 1]},
+    ],
+)
+def test_getting_recipes_with_invalid_cursor(api_rf, cursor):
+    user = factories.UserFactory.build()
+
+    if isinstance(cursor, dict):
+        cursor = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    url = rh.add_query_string(urls.reverse("recipes"), {"cursor": cursor})
+    request = api_rf.get(url)
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]["cursor"]) > 0
+
+
+@pytest.mark.django_db
+def test_getting_sparse_recipes(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipes = [factories.RecipeFactory.create(title=t, user=user) for t in "ab"]
+    tag = factories.RecipeTagFactory.create(user=user)
+    recipes[0].recipe_tags.add(tag)
+    factories.IngredientFactory.create(description__user=user, recipe=recipes[0])
+    url = rh.add_query_string(
+        urls.reverse("recipes"), {"fields": "recipe_tags,id,rating"}
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+
+    # One query for the user's recipes version, one for the recipes, and one
+    # for their tags.
+    with django_assert_num_queries(3):
+        response = views.recipes(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        "data": [
+            {
+                "id": recipes[0].id,
+                "rating": None,
+                "recipe_tags": [{"id": tag.id, "name": tag.name}],
+            },
+            {"id": recipes[1].id, "rating": None, "recipe_tags": []},
+        ],
+        "next_cursor": None,
+    }
+
+
+def test_getting_recipes_with_unknown_fields(api_rf):
+    user = factories.UserFactory.build()
+    request = api_rf.get(rh.add_query_string(urls.reverse("recipes"), {"fields": "x"}))
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]["fields"]) > 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query,ids",
+    [
+        ({"sort": "-id"}, [3, 2, 1, 0]),
+        ({"sort": "rating", "rating_min": "2"}, [2, 1]),
+        ({"sort": "-servings", "servings_max": "3"}, [2, 0]),
+        ({"sort": "servings", "servings_min": "2", "servings_max": "3"}, [0, 2]),
+        ({"has_notes": "true"}, [1]),
+        ({"has_notes": "false", "sort": "-title"}, [3, 2, 0]),
+    ],
+)
+def test_sorting_and_filtering_recipes(api_rf, query, ids):
+    user = factories.UserFactory.create()
+    recipes = [
+        factories.RecipeFactory.create(
+            notes=notes, rating=rating, servings=servings, title=title, user=user
+        )
+        for title, notes, rating, servings in [
+            ("a", "", 1, 2),
+            ("b", "Notes.", 4, None),
+            ("c", "", 2, 3),
+            ("d", "", None, 4),
+        ]
+    ]
+    summaries.refresh(*(r.id for r in recipes))
+    request = api_rf.get(rh.add_query_string(urls.reverse("recipes"), query))
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["id"] for r in response.data["data"]] == [recipes[i].id for i in ids]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"sort": "notes"},
+        {"sort": "title", "rating_min": "3"},
+        {"sort": "rating", "has_notes": "true"},
+        {"sort": "id", "servings_min": "1"},
+        {"rating_min": "6"},
+    ],
+)
+def test_getting_recipes_with_unsupported_query(api_rf, query):
+    user = factories.UserFactory.build()
+    request = api_rf.get(rh.add_query_string(urls.reverse("recipes"), query))
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]) > 0
+
+
+@pytest.mark.skipif(db.connection.vendor != "sqlite", reason="requires SQLite")
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"sort": sort, **filters}
+        for sort, plans in serializers.RecipesQuerySerializer.PLANS.items()
+        for filters in [
+            {f: {"has_notes": "true"}.get(f, "2") for f in p} for p in plans
+        ]
+    ],
+)
+@pytest.mark.parametrize("fields", [None, "id,title"])
+def test_recipes_query_plans(api_rf, query, fields):
+    # Every supported query, including later pages, is read from an index in
+    # order, without scanning or sorting the user's recipes. That's true for
+    # summaries, and for recipes (when fields are requested).
+    user = factories.UserFactory.create()
+    factories.RecipeFactory.create_batch(
+        2, notes="Notes.", rating=2, servings=2, user=user
+    )
+    factories.RecipeFactory.create(notes="", rating=None, servings=None, user=user)
+    summaries.refresh(*user.recipes.values_list("id", flat=True))
+
+    if fields is not None:
+        query = {**query, "fields": fields}
+
+    url = rh.add_query_string(urls.reverse("recipes"), query)
+
+    with override_settings(RECIPES_PAGE_SIZE=1):
+        while url is not None:
+            request = api_rf.get(url)
+            authenticate(request, user)
+
+            with test_utils.CaptureQueriesContext(db.connection) as context:
+                response = views.recipes(request)
+
+            # The first query looks up the user's recipes version by primary key.
+            for query_ in context.captured_queries[1:]:
+                with db.connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query_['sql']}")
+                    plan = " ".join(row[-1] for row in cursor.fetchall())
+
+                assert "INDEX main_" in plan
+                assert "TEMP B-TREE" not in plan
+
+            url = response.data["next_cursor"] and rh.add_query_string(
+                urls.reverse("recipes"),
+                {**query, "cursor": response.data["next_cursor"]},
+            )
+
+
+@override_settings(RECIPES_STREAM_CHUNK_SIZE=2)
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [0, 1, 2, 5])
+def test_streaming_recipes(api_rf, count):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(count, user=user, rating=3)
+    factories.RecipeFactory.create(user=user, rating=1)
+    url = rh.add_query_string(
+        urls.reverse("recipes"),
+        {
+            "fields": "id,recipe_tags",
+            "rating_min": "2",
+            "sort": "-rating",
+            "stream": "true",
+        },
+    )
+    request = api_rf.get(url)
+    authenticate(request, user)
+    response = views.recipes(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert json.loads(b"".join(response.streaming_content)) == {
+        "data": [
+            {"id": r.id, "recipe_tags": []}
+            for r in sorted(recipes, key=lambda r: r.id, reverse=True)
+        ]
+    }
+
+
+@override_settings(RECIPES_STREAM_CHUNK_SIZE=100)
+@pytest.mark.django_db
+def test_streaming_recipes_memory(api_rf):
+    user = factories.UserFactory.create()
+
+    def peak_memory(count):
+        models.Recipe.objects.bulk_create(
+            models.Recipe(notes="Notes. " * 50, title=f"recipe {i}", user=user)
+            for i in range(count - models.Recipe.objects.count())
+        )
+        url = rh.add_query_string(
+            urls.reverse("recipes"), {"fields": "notes,title", "stream": "true"}
+        )
+        request = api_rf.get(url)
+        authenticate(request, user)
+        tracemalloc.start()
+
+        try:
+            for _ in views.recipes(request).streaming_content:
+                pass
+
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # Ten times the recipes take about the same memory to stream.
+    small = peak_memory(500)
+    large = peak_memory(5000)
+    assert large < small * 1.5
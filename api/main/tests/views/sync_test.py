@@ -0,0 +1,107 @@
+import pytest
+from django import urls
+from django.test import override_settings
+from rest_framework import permissions, status
+
+from main import changes, views
+from main.tests import factories
+from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
+from main.tests.support.request_helpers import authenticate
+
+
+def sync(api_rf, user, since=None):
+    url = urls.reverse("sync")
+
+    if since is not None:
+        url = rh.add_query_string(url, {"since": since})
+
+    request = api_rf.get(url)
+    authenticate(request, user)
+    return views.sync(request)
+
+
+def test_http_method_names():
+    assert dvh.has_http_method_names(views.sync, ["get", "options"])
+
+
+def test_permission_classes():
+    permission_classes = [permissions.IsAuthenticated]
+    assert dvh.has_permission_classes(views.sync, permission_classes)
+
+
+@pytest.mark.django_db
+def test_syncing_successfully(api_rf):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(3, user=user)
+    factories.IngredientFactory.create(description__user=user, recipe=recipes[0])
+    other = factories.RecipeFactory.create()
+    changes.record(*(r.id for r in recipes), other.id)
+    response = sync(api_rf, user)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert data["deleted_ids"] == []
+    assert not data["has_more"]
+    assert [r["id"] for r in data["recipes"]] == [r.id for r in recipes]
+    assert len(data["recipes"][0]["ingredients"]) == 1
+
+    # Only what changed since the cursor is returned.
+    recipe_id = recipes[2].id
+    recipes[2].delete()
+    changes.record(recipes[1].id, recipe_id)
+    data = sync(api_rf, user, data["cursor"]).data["data"]
+    assert data["deleted_ids"] == [recipe_id]
+    assert [r["id"] for r in data["recipes"]] == [recipes[1].id]
+
+    # The cursor doesn't move when nothing changed.
+    cursor = data["cursor"]
+    data = sync(api_rf, user, cursor).data["data"]
+    assert data == {
+        "cursor": cursor,
+        "deleted_ids": [],
+        "has_more": False,
+        "recipes": [],
+    }
+
+
+@pytest.mark.django_db
+def test_syncing_with_no_changes(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    recipe = factories.RecipeFactory.create(user=user)
+    changes.record(recipe.id)
+    cursor = sync(api_rf, user).data["data"]["cursor"]
+
+    # A single range query on the change log.
+    with django_assert_num_queries(1):
+        response = sync(api_rf, user, cursor)
+
+    assert response.data["data"]["recipes"] == []
+
+
+@override_settings(SYNC_PAGE_SIZE=2)
+@pytest.mark.django_db
+def test_syncing_in_pages(api_rf):
+    user = factories.UserFactory.create()
+    recipes = factories.RecipeFactory.create_batch(5, user=user)
+    changes.record(*(r.id for r in recipes))
+    cursor = None
+    synced = []
+
+    while True:
+        data = sync(api_rf, user, cursor).data["data"]
+        synced.extend(r["id"] for r in data["recipes"])
+        cursor = data["cursor"]
+
+        if not data["has_more"]:
+            break
+
+    assert synced == [r.id for r in recipes]
+
+
+@pytest.mark.parametrize("since", ["", "x", "eyJ4IjogMX0="])
+def test_syncing_with_invalid_cursor(api_rf, since):
+    user = factories.UserFactory.build()
+    response = sync(api_rf, user, since)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(response.data["errors"]["since"]) > 0
+    assert len(response.data["message"]) > 0
@@ -0,0 +1,129 @@
+import pytest
+from django import urls
+from rest_framework import permissions, status
+
+from main import views
+from main.tests import factories
+from main.tests.support import drf_view_helpers as dvh
+from main.tests.support import request_helpers as rh
+
+
+def test_http_method_names():
+    assert dvh.has_http_method_names(views.vocabulary_search, ["get", "options"])
+
+
+def test_permission_classes():
+    permission_classes = [permissions.IsAuthenticated]
+    assert dvh.has_permission_classes(views.vocabulary_search, permission_classes)
+
+
+def test_no_search_term_given(api_rf):
+    url = rh.add_query_string(
+        urls.reverse("vocabulary_search"), {"kinds": "brand,unit"}
+    )
+    request = api_rf.get(url)
+    user = factories.UserFactory.build()
+    rh.authenticate(request, user)
+    response = views.vocabulary_search(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"data": {"matches": {"brand": [], "unit": []}}}
+
+
+def test_unknown_kinds(api_rf):
+    url = rh.add_query_string(
+        urls.reverse("vocabulary_search"), {"kinds": "brand,color,size", "q": "a"}
+    )
+    request = api_rf.get(url)
+    user = factories.UserFactory.build()
+    rh.authenticate(request, user)
+    response = views.vocabulary_search(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.data["errors"] == {"kinds": ["Unknown kinds: color, size."]}
+    assert len(response.data["message"]) > 0
+
+
+@pytest.mark.django_db
+def test_searching_kinds(api_rf, django_assert_num_queries):
+    user = factories.UserFactory.create()
+    factories.IngredientBrandFactory.create(name="Acme Bread", user=user)
+    factories.IngredientDescriptionFactory.create(text="bread flour", user=user)
+    factories.IngredientDescriptionFactory.create(text="breadcrumbs", user=user)
+    factories.IngredientUnitFactory.create(name="loaf", user=user)
+    factories.RecipeTagFactory.create(name="Bread", user=user)
+    factories.RecipeTagFactory.create(name="Bread", user=factories.UserFactory())
+    url = rh.add_query_string(
+        urls.reverse("vocabulary_search"),
+        {"kinds": "description,unit,brand,tag", "q": "BREAD"},
+    )
+
+    # The indexes are loaded with one query, then read from memory.
+    for num_queries in [1, 0]:
+        request = api_rf.get(url)
+        rh.authenticate(request, user)
+
+        with django_assert_num_queries(num_queries):
+            response = views.vocabulary_search(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "data": {
+                "matches": {
+                    "description": ["bread flour", "breadcrumbs"],
+                    "unit": [],
+                    "brand": ["Acme Bread"],
+                    "tag": ["Bread"],
+                }
+            }
+        }
+
+
+@pytest.mark.django_db
+def test_searching_every_kind(api_rf):
+    user = factories.UserFactory.create()
+    factories.RecipeEquipmentFactory.create(description="Bread pan", user=user)
+    url = rh.add_query_string(urls.reverse("vocabulary_search"), {"q": "bread"})
+    request = api_rf.get(url)
+    rh.authenticate(request, user)
+    response = views.vocabulary_search(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        "data": {
+            "matches": {
+                "brand": [],
+                "description": [],
+                "equipment": ["Bread pan"],
+                "tag": [],
+                "unit": [],
+            }
+        }
+    }
+
+
+@pytest.mark.django_db
+def test_fuzzy_search(api_rf):
+    user = factories.UserFactory.create()
+    factories.IngredientDescriptionFactory.create(text="parmesan", user=user)
+    factories.RecipeTagFactory.create(name="Parmesan pasta", user=user)
+    url = rh.add_query_string(
+        urls.reverse("vocabulary_search"),
+        {"fuzzy": "true", "kinds": "description,tag", "q": "parmesean"},
+    )
+    request = api_rf.get(url)
+    rh.authenticate(request, user)
+    response = views.vocabulary_search(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        "data": {"matches": {"description": ["parmesan"], "tag": ["Parmesan pasta"]}}
+    }
+
+
+def test_invalid_fuzzy(api_rf):
+    url = rh.add_query_string(
+        urls.reverse("vocabulary_search"), {"fuzzy": "maybe", "q": "a"}
+    )
+    request = api_rf.get(url)
+    user = factories.UserFactory.build()
+    rh.authenticate(request, user)
+    response = views.vocabulary_search(request)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "fuzzy" in response.data["errors"]
@@ -1,21 +1,25 @@
 from django import urls
+from django.conf import settings
 
-from main import views
+from main import async_views, views
+
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
 
 # fmt: off
 urlpatterns = [
     urls.path("account/destroy/", views.account_destroy, name="account_destroy"),
+    urls.path("bootstrap/", views.bootstrap, name="bootstrap"),
     urls.path("csrf_token/", views.csrf_token, name="csrf_token"),
     urls.path("ingredient/<int:ingredient_id>/", views.ingredient, name="ingredient"),
     urls.path("ingredient/<int:ingredient_id>/destroy/", views.ingredient_destroy, name="ingredient_destroy"),
     urls.path("ingredient/<int:ingredient_id>/update/", views.ingredient_update, name="ingredient_update"),
     urls.path("ingredient/recipe/<int:recipe_id>/associate/", views.ingredient_associate, name="ingredient_associate"),
-    urls.path("ingredient_brand/search/", views.ingredient_brand_search, name="ingredient_brand_search"),
-    urls.path("ingredient_description/search/", views.ingredient_description_search, name="ingredient_description_search"),
-    urls.path("ingredient_unit/search/", views.ingredient_unit_search, name="ingredient_unit_search"),
+    urls.path("ingredient_brand/search/", read_views.ingredient_brand_search, name="ingredient_brand_search"),
+    urls.path("ingredient_description/search/", read_views.ingredient_description_search, name="ingredient_description_search"),
+    urls.path("ingredient_unit/search/", read_views.ingredient_unit_search, name="ingredient_unit_search"),
     urls.path("login/", views.login, name="login"),
     urls.path("logout/", views.logout, name="logout"),
-    urls.path("recipe/<int:recipe_id>/", views.recipe, name="recipe"),
+    urls.path("recipe/<int:recipe_id>/", read_views.recipe, name="recipe"),
     urls.path("recipe/<int:recipe_id>/recipe_time/create/", views.recipe_time_create, name="recipe_time_create"),
     urls.path("recipe/create/", views.recipe_create, name="recipe_create"),
     urls.path("recipe_equipment/<int:equipment_id>/", views.recipe_equipment, name="recipe_equipment"),
@@ -24,7 +28,7 @@ urlpatterns = [
     urls.path("recipe_equipment/<int:equipment_id>/recipe/<int:recipe_id>/update/", views.recipe_equipment_update_for_recipe, name="recipe_equipment_update_for_recipe"),
     urls.path("recipe_equipment/<int:equipment_id>/update/", views.recipe_equipment_update, name="recipe_equipment_update"),
     urls.path("recipe_equipment/recipe/<int:recipe_id>/associate/", views.recipe_equipment_associate, name="recipe_equipment_associate"),
-    urls.path("recipe_equipment/search/", views.recipe_equipment_search, name="recipe_equipment_search"),
+    urls.path("recipe_equipment/search/", read_views.recipe_equipment_search, name="recipe_equipment_search"),
     urls.path("recipe_notes/<int:recipe_id>/", views.recipe_notes, name="recipe_notes"),
     urls.path("recipe_notes/<int:recipe_id>/destroy/", views.recipe_notes_destroy, name="recipe_notes_destroy"),
     urls.path("recipe_notes/<int:recipe_id>/update/", views.recipe_notes_update, name="recipe_notes_update"),
@@ -40,12 +44,16 @@ urlpatterns = [
     urls.path("recipe_tag/<int:tag_id>/recipe/<int:recipe_id>/update/", views.recipe_tag_update_for_recipe, name="recipe_tag_update_for_recipe"),
     urls.path("recipe_tag/<int:tag_id>/update/", views.recipe_tag_update, name="recipe_tag_update"),
     urls.path("recipe_tag/recipe/<int:recipe_id>/associate/", views.recipe_tag_associate, name="recipe_tag_associate"),
-    urls.path("recipe_tag/search/", views.recipe_tag_search, name="recipe_tag_search"),
+    urls.path("recipe_tag/search/", read_views.recipe_tag_search, name="recipe_tag_search"),
     urls.path("recipe_time/<int:time_id>/", views.recipe_time, name="recipe_time"),
     urls.path("recipe_time/<int:time_id>/destroy/", views.recipe_time_destroy, name="recipe_time_destroy"),
     urls.path("recipe_time/<int:time_id>/update/", views.recipe_time_update, name="recipe_time_update"),
     urls.path("recipe_title/<int:recipe_id>/update/", views.recipe_title_update, name="recipe_title_update"),
-    urls.path("recipes/", views.recipes, name="recipes"),
+    urls.path("recipes/", read_views.recipes, name="recipes"),
+    urls.path("recipes/batch/", views.recipes_batch, name="recipes_batch"),
+    urls.path("recipes/search/", read_views.recipes_search, name="recipes_search"),
     urls.path("signup/", views.signup, name="signup"),
     urls.path("signup_confirmation/", views.signup_confirmation, name="signup_confirmation"),
+    urls.path("sync/", views.sync, name="sync"),
+    urls.path("vocabulary/search/", read_views.vocabulary_search, name="vocabulary_search"),
 ]
@@ -0,0 +1,93 @@
+import collections
+import threading
+import time
+
+from django.conf import settings
+
+from main import tasks
+
+# How often vocabulary entries are used, for ranking autocomplete matches.
+#
+# Uses are counted in memory, and flushed to the database in the background
+# (see tasks.increment_usage_counts()) every settings.USAGE_FLUSH_SIZE uses or
+# settings.USAGE_FLUSH_INTERVAL seconds, whichever comes first, so the views
+# never wait on the update. The interval is checked as each request finishes,
+# so counts don't wait on the next use. Each flush is a single UPDATE ... SET
+# usage_count = usage_count + n for each n, rather than a read and a write per
+# entry, so concurrent flushes from other processes don't lose counts.
+#
+# What's left is flushed when the process exits (see MainConfig.ready()), but
+# only on a clean exit with the broker up: counts are lost if the process is
+# killed (SIGKILL) or the broker is down, which is fine for a ranking.
+
+
+class Buffer:
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.pending = 0
+        self.started_at = None
+        self._lock = threading.Lock()
+
+    def add(self, kind, pks):
+        # Returns the buffered counts to flush, if it's time, emptying the
+        # buffer.
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+
+            for pk in pks:
+                self.counts[(kind, pk)] += 1
+                self.pending += 1
+
+            if self.pending >= settings.USAGE_FLUSH_SIZE or self._overdue():
+                return self._take()
+
+            return None
+
+    def take(self):
+        with self._lock:
+            return self._take()
+
+    def take_overdue(self):
+        # Like take(), if the interval has passed since the first buffered use.
+        with self._lock:
+            return self._take() if self._overdue() else None
+
+    def _overdue(self):
+        if self.started_at is None:
+            return False
+
+        elapsed = time.monotonic() - self.started_at
+        return elapsed >= settings.USAGE_FLUSH_INTERVAL
+
+    def _take(self):
+        counts = {}
+
+        for (kind, pk), count in self.counts.items():
+            counts.setdefault(kind, {})[str(pk)] = count
+
+        self.counts.clear()
+        self.pending = 0
+        self.started_at = None
+        return counts
+
+
+buffer = Buffer()
+
+
+def record(kind, *pks):
+    # Counts a use of each of the entries of kind (see
+    # autocomplete.VOCABULARIES). None pks, for optional fields, are skipped.
+    if counts := buffer.add(kind, [pk for pk in pks if pk is not None]):
+        tasks.increment_usage_counts.delay(counts)
+
+
+def flush():
+    if counts := buffer.take():
+        tasks.increment_usage_counts.delay(counts)
+
+
+def flush_overdue(**kwargs):
+    # A request_finished receiver.
+    if counts := buffer.take_overdue():
+        tasks.increment_usage_counts.delay(counts)
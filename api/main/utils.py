@@ -1,4 +1,8 @@
+import hashlib
 import secrets
+import time
+
+from django.utils import cache, http
 
 #  OWASP recommends 128-bit minimum for session IDs.
 SECURE_TOKEN_BYTE_LENGTH = 128 // 8
@@ -6,3 +10,46 @@ SECURE_TOKEN_BYTE_LENGTH = 128 // 8
 
 def build_token():
     return secrets.token_urlsafe(SECURE_TOKEN_BYTE_LENGTH)
+
+
+def build_etag(*parts):
+    digest = hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request, etag, last_modified=None):
+    # Returns None unless the request's preconditions say the client's copy is
+    # current, in which case a 304 (or 412 for If-Match) is returned instead.
+    # last_modified is a datetime, checked against If-Modified-Since.
+    response = cache.get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=_settled_timestamp(last_modified),
+    )
+
+    if response is not None:
+        for header, value in validator_headers(etag, last_modified).items():
+            response[header] = value
+
+    return response
+
+
+def validator_headers(etag, last_modified=None):
+    headers = {"ETag": etag}
+
+    if (timestamp := _settled_timestamp(last_modified)) is not None:
+        headers["Last-Modified"] = http.http_date(timestamp)
+
+    return headers
+
+
+def _settled_timestamp(value):
+    # HTTP dates have one-second resolution, so a later write in the same
+    # second would have the same Last-Modified, and If-Modified-Since would
+    # miss it. Until that second has passed, there's no Last-Modified, and only
+    # the ETag is checked.
+    if value is None:
+        return None
+
+    timestamp = int(value.timestamp())
+    return timestamp if timestamp < int(time.time()) else None
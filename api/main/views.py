@@ -6,19 +6,30 @@ from django import db, http, shortcuts
 from django.conf import settings
 from django.contrib import auth
 from django.db import transaction
-from django.db.models import functions
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators import csrf
 from rest_framework import decorators as rf_decorators
 from rest_framework import permissions, response, status
 
-from main import client, models, serializers, tasks
+from main import (
+    autocomplete,
+    client,
+    compilers,
+    documents,
+    models,
+    pagination,
+    search,
+    serializers,
+    streaming,
+    tasks,
+    usage,
+    utils,
+)
 
 logger = logging.getLogger(__name__)
 
-MAX_AUTOCOMPLETE_MATCHES = 5
-
 
 def bad_request(request, exception=None):
     return http.JsonResponse(
@@ -86,11 +97,56 @@ def account_destroy(request):
         "deleting account for user ID %(user_id)s, username %(username)s",
         {"user_id": request.user.id, "username": request.user.username},
     )
+    user_id = request.user.pk
     request.user.delete()
+    search.user_deleted(user_id)
+    autocomplete.user_deleted(user_id)
     auth.logout(request)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@rf_decorators.api_view(http_method_names=["GET"])
+@rf_decorators.permission_classes([permissions.IsAuthenticated])
+def bootstrap(request):
+    # Everything the app needs to start, in a fixed number of queries: the
+    # first page of the recipes list (continued from recipes_next_cursor with
+    # the recipes view), and the user's vocabularies.
+    version, modified_at = _recipes_version(request.user)
+    etag = utils.build_etag("bootstrap", request.user.pk, version)
+
+    if not_modified := utils.not_modified(request, etag, modified_at):
+        return not_modified
+
+    recipes, next_cursor = pagination.paginate(
+        models.RecipeSummary.objects.filter(user=request.user),
+        ("title", "pk"),
+        None,
+        settings.RECIPES_PAGE_SIZE,
+    )
+    vocabularies = {
+        "ingredient_brands": (models.IngredientBrand, "name"),
+        "ingredient_units": (models.IngredientUnit, "name"),
+        "recipe_equipment": (models.RecipeEquipment, "description"),
+        "recipe_tags": (models.RecipeTag, "name"),
+    }
+    data = {
+        key: [
+            {"id": i, field: v}
+            for i, v in model.objects.filter(user=request.user)
+            .order_by(field, "id")
+            .values_list("id", field)
+        ]
+        for key, (model, field) in vocabularies.items()
+    }
+    represent = compilers.compile_serializer(serializers.RecipesSerializer)
+    data["recipes"] = [represent(r) for r in recipes]
+    data["recipes_next_cursor"] = next_cursor
+
+    return response.Response(
+        {"data": data}, headers=utils.validator_headers(etag, modified_at)
+    )
+
+
 @csrf.ensure_csrf_cookie
 @rf_decorators.api_view(http_method_names=["GET"])
 def csrf_token(request):
@@ -101,11 +157,20 @@ def csrf_token(request):
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def ingredient(request, ingredient_id):
     ingredient = shortcuts.get_object_or_404(
-        models.Ingredient, pk=ingredient_id, recipe__user=request.user
+        models.Ingredient.objects.select_related(
+            "brand", "description", "recipe", "unit"
+        ).defer("recipe__notes"),
+        pk=ingredient_id,
+        recipe__user=request.user,
     )
 
+    etag = utils.build_etag("ingredient", ingredient.id, ingredient.recipe.version)
+
+    if not_modified := utils.not_modified(request, etag):
+        return not_modified
+
     serializer = serializers.IngredientSerializer(ingredient)
-    return response.Response({"data": serializer.data})
+    return response.Response({"data": serializer.data}, headers={"ETag": etag})
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -163,6 +228,16 @@ def ingredient_associate(request, recipe_id):
             status=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
+    documents.recipes_changed(recipe.id)
+    autocomplete.entries_saved(
+        ("ingredient_brand", ingredient.brand),
+        ("ingredient_description", ingredient.description),
+        ("ingredient_unit", ingredient.unit),
+    )
+    usage.record("ingredient_brand", ingredient.brand_id)
+    usage.record("ingredient_description", ingredient.description_id)
+    usage.record("ingredient_unit", ingredient.unit_id)
+
     return response.Response(
         {"data": {"id": ingredient.id, **serializer.data}},
         status=(
@@ -176,29 +251,13 @@ def ingredient_associate(request, recipe_id):
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def ingredient_brand_search(request):
-    if not (search_term := request.query_params.get("search_term")):
-        return response.Response({"data": {"matches": []}})
-
-    recipe_brand = models.IngredientBrand.objects.filter(
-        name__icontains=search_term, user=request.user
-    ).order_by(functions.Length("name").asc())[:MAX_AUTOCOMPLETE_MATCHES]
-
-    return response.Response({"data": {"matches": [r.name for r in recipe_brand]}})
+    return _vocabulary_search(request, "ingredient_brand")
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def ingredient_description_search(request):
-    if not (search_term := request.query_params.get("search_term")):
-        return response.Response({"data": {"matches": []}})
-
-    recipe_description = models.IngredientDescription.objects.filter(
-        text__icontains=search_term, user=request.user
-    ).order_by(functions.Length("text").asc())[:MAX_AUTOCOMPLETE_MATCHES]
-
-    return response.Response(
-        {"data": {"matches": [r.text for r in recipe_description]}}
-    )
+    return _vocabulary_search(request, "ingredient_description")
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -209,20 +268,14 @@ def ingredient_destroy(request, ingredient_id):
     )
 
     ingredient.delete()
+    documents.recipes_changed(ingredient.recipe_id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def ingredient_unit_search(request):
-    if not (search_term := request.query_params.get("search_term")):
-        return response.Response({"data": {"matches": []}})
-
-    recipe_unit = models.IngredientUnit.objects.filter(
-        name__icontains=search_term, user=request.user
-    ).order_by(functions.Length("name").asc())[:MAX_AUTOCOMPLETE_MATCHES]
-
-    return response.Response({"data": {"matches": [r.name for r in recipe_unit]}})
+    return _vocabulary_search(request, "ingredient_unit")
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -277,6 +330,22 @@ def ingredient_update(request, ingredient_id):
             status=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
+    documents.recipes_changed(ingredient.recipe_id)
+    autocomplete.entries_saved(
+        ("ingredient_brand", ingredient.brand),
+        ("ingredient_description", ingredient.description),
+        ("ingredient_unit", ingredient.unit),
+    )
+
+    # Only the entries the request chose count as used.
+    if "brand" in serializer.validated_data:
+        usage.record("ingredient_brand", ingredient.brand_id)
+
+    if "unit" in serializer.validated_data:
+        usage.record("ingredient_unit", ingredient.unit_id)
+
+    usage.record("ingredient_description", ingredient.description_id)
+
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -345,9 +414,27 @@ def logout(request):
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def recipe(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeSerializer(recipe)
-    return response.Response({"data": serializer.data})
+    try:
+        fields = documents.parse_fields(request.query_params.get("fields"))
+    except ValueError as error:
+        return response.Response(
+            {
+                "errors": {"fields": [_("Unknown fields: %s.") % error]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    recipe = shortcuts.get_object_or_404(
+        models.Recipe.objects.only("id", "version"), pk=recipe_id, user=request.user
+    )
+    etag = utils.build_etag("recipe", recipe.id, recipe.version)
+
+    if not_modified := utils.not_modified(request, etag):
+        return not_modified
+
+    data = documents.get_recipe_document(recipe, fields)
+    return response.Response({"data": data}, headers={"ETag": etag})
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -365,6 +452,7 @@ def recipe_create(request):
         )
 
     recipe = serializer.save(user=request.user)
+    documents.recipes_changed(recipe.id)
     return response.Response(
         {"data": {"id": recipe.id}}, status=status.HTTP_201_CREATED
     )
@@ -376,8 +464,15 @@ def recipe_equipment(request, equipment_id):
     recipe_equipment = shortcuts.get_object_or_404(
         models.RecipeEquipment, pk=equipment_id, user=request.user
     )
+    etag = utils.build_etag(
+        "recipe_equipment", recipe_equipment.id, recipe_equipment.description
+    )
+
+    if not_modified := utils.not_modified(request, etag):
+        return not_modified
+
     serializer = serializers.RecipeEquipmentSerializer(recipe_equipment)
-    return response.Response({"data": serializer.data})
+    return response.Response({"data": serializer.data}, headers={"ETag": etag})
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -403,10 +498,13 @@ def recipe_equipment_associate(request, recipe_id):
 
     if not recipe_equipment:
         recipe_equipment = serializer.save(user=request.user)
+        autocomplete.entries_saved(("recipe_equipment", recipe_equipment))
         created = True
 
     if not recipe_equipment.recipes.contains(recipe):
         recipe_equipment.recipes.add(recipe)
+        documents.recipes_changed(recipe.id)
+        usage.record("recipe_equipment", recipe_equipment.id)
 
     serializer = serializers.RecipeEquipmentAssociateSerializer(recipe_equipment)
 
@@ -422,7 +520,15 @@ def recipe_equipment_destroy(request, equipment_id):
     recipe_equipment = shortcuts.get_object_or_404(
         models.RecipeEquipment, pk=equipment_id, user=request.user
     )
+    recipe_ids = list(recipe_equipment.recipes.values_list("id", flat=True))
     recipe_equipment.delete()
+    autocomplete.entries_deleted("recipe_equipment", request.user.pk, equipment_id)
+
+    if recipe_ids:
+        documents.recipes_changed(*recipe_ids)
+    else:
+        documents.vocabulary_changed(request.user.pk)
+
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -434,22 +540,14 @@ def recipe_equipment_dissociate(request, equipment_id, recipe_id):
         models.RecipeEquipment, pk=equipment_id, recipes=recipe, user=request.user
     )
     recipe.recipe_equipment.remove(recipe_equipment)
+    documents.recipes_changed(recipe.id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def recipe_equipment_search(request):
-    if not (search_term := request.query_params.get("search_term")):
-        return response.Response({"data": {"matches": []}})
-
-    recipe_equipment = models.RecipeEquipment.objects.filter(
-        description__icontains=search_term, user=request.user
-    ).order_by(functions.Length("description").asc())[:MAX_AUTOCOMPLETE_MATCHES]
-
-    return response.Response(
-        {"data": {"matches": [r.description for r in recipe_equipment]}}
-    )
+    return _vocabulary_search(request, "recipe_equipment")
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -472,6 +570,13 @@ def recipe_equipment_update(request, equipment_id):
         )
 
     serializer.save()
+    autocomplete.entries_saved(("recipe_equipment", recipe_equipment))
+
+    if recipe_ids := list(recipe_equipment.recipes.values_list("id", flat=True)):
+        documents.recipes_changed(*recipe_ids)
+    else:
+        documents.vocabulary_changed(request.user.pk)
+
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -500,121 +605,92 @@ def recipe_equipment_update_for_recipe(request, equipment_id, recipe_id):
         )
         recipe.recipe_equipment.add(recipe_equipment)
 
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
-
+    if was_saved:
+        autocomplete.entries_saved(("recipe_equipment", recipe_equipment))
 
-@rf_decorators.api_view(http_method_names=["GET"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_notes(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeNotesSerializer(recipe)
-    return response.Response({"data": serializer.data})
-
-
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_notes_destroy(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    recipe.notes = ""
-    recipe.save()
+    documents.recipes_changed(recipe.id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_notes_update(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeNotesUpdateSerializer(
-        data=request.data, instance=recipe
-    )
-
-    if not serializer.is_valid():
-        return response.Response(
-            {
-                "errors": serializer.errors,
-                "message": _("The information you provided was invalid."),
-            },
-            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+# The views for single recipe fields (notes, rating, etc.) are built by these.
+# Reads load only the field, and writes are a single UPDATE scoped to the
+# user's recipes, without loading the recipe first.
+def _recipe_field_view(field, serializer_class):
+    @rf_decorators.api_view(http_method_names=["GET"])
+    @rf_decorators.permission_classes([permissions.IsAuthenticated])
+    def view(request, recipe_id):
+        recipe = shortcuts.get_object_or_404(
+            models.Recipe.objects.only("id", field, "version"),
+            pk=recipe_id,
+            user=request.user,
         )
+        etag = utils.build_etag(f"recipe_{field}", recipe.id, recipe.version)
 
-    recipe = serializer.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+        if not_modified := utils.not_modified(request, etag):
+            return not_modified
 
+        serializer = serializer_class(recipe)
+        return response.Response({"data": serializer.data}, headers={"ETag": etag})
 
-@rf_decorators.api_view(http_method_names=["GET"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_rating(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeRatingSerializer(recipe)
-    return response.Response({"data": serializer.data})
+    return view
 
 
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_rating_destroy(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    recipe.rating = None
-    recipe.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+def _recipe_field_destroy_view(field, empty_value):
+    @rf_decorators.api_view(http_method_names=["POST"])
+    @rf_decorators.permission_classes([permissions.IsAuthenticated])
+    def view(request, recipe_id):
+        _update_recipe(request, recipe_id, **{field: empty_value})
+        return response.Response(status=status.HTTP_204_NO_CONTENT)
 
+    return view
 
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_rating_update(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeRatingUpdateSerializer(
-        data=request.data, instance=recipe
-    )
 
-    if not serializer.is_valid():
-        return response.Response(
-            {
-                "errors": serializer.errors,
-                "message": _("The information you provided was invalid."),
-            },
-            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        )
+def _recipe_field_update_view(serializer_class):
+    @rf_decorators.api_view(http_method_names=["POST"])
+    @rf_decorators.permission_classes([permissions.IsAuthenticated])
+    def view(request, recipe_id):
+        serializer = serializer_class(data=request.data)
 
-    recipe = serializer.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+        if not serializer.is_valid():
+            return response.Response(
+                {
+                    "errors": serializer.errors,
+                    "message": _("The information you provided was invalid."),
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
 
+        _update_recipe(request, recipe_id, **serializer.validated_data)
+        return response.Response(status=status.HTTP_204_NO_CONTENT)
 
-@rf_decorators.api_view(http_method_names=["GET"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_servings(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeServingsSerializer(recipe)
-    return response.Response({"data": serializer.data})
+    return view
 
 
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_servings_destroy(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    recipe.servings = None
-    recipe.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+def _update_recipe(request, recipe_id, **values):
+    recipes = models.Recipe.objects.filter(pk=recipe_id, user=request.user)
 
+    # Together, so the summary, search entry and change log can't be left
+    # behind the recipe.
+    with transaction.atomic():
+        if not recipes.update(**values):
+            raise http.Http404
 
-@rf_decorators.api_view(http_method_names=["POST"])
-@rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_servings_update(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeServingsUpdateSerializer(
-        data=request.data, instance=recipe
-    )
+        documents.recipes_changed(recipe_id)
 
-    if not serializer.is_valid():
-        return response.Response(
-            {
-                "errors": serializer.errors,
-                "message": _("The information you provided was invalid."),
-            },
-            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        )
 
-    recipe = serializer.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+recipe_notes = _recipe_field_view("notes", serializers.RecipeNotesSerializer)
+recipe_notes_destroy = _recipe_field_destroy_view("notes", "")
+recipe_notes_update = _recipe_field_update_view(serializers.RecipeNotesUpdateSerializer)
+recipe_rating = _recipe_field_view("rating", serializers.RecipeRatingSerializer)
+recipe_rating_destroy = _recipe_field_destroy_view("rating", None)
+recipe_rating_update = _recipe_field_update_view(
+    serializers.RecipeRatingUpdateSerializer
+)
+recipe_servings = _recipe_field_view("servings", serializers.RecipeServingsSerializer)
+recipe_servings_destroy = _recipe_field_destroy_view("servings", None)
+recipe_servings_update = _recipe_field_update_view(
+    serializers.RecipeServingsUpdateSerializer
+)
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
@@ -623,8 +699,13 @@ def recipe_tag(request, tag_id):
     recipe_tag = shortcuts.get_object_or_404(
         models.RecipeTag, pk=tag_id, user=request.user
     )
+    etag = utils.build_etag("recipe_tag", recipe_tag.id, recipe_tag.name)
+
+    if not_modified := utils.not_modified(request, etag):
+        return not_modified
+
     serializer = serializers.RecipeTagSerializer(recipe_tag)
-    return response.Response({"data": serializer.data})
+    return response.Response({"data": serializer.data}, headers={"ETag": etag})
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -650,10 +731,13 @@ def recipe_tag_associate(request, recipe_id):
 
     if not recipe_tag:
         recipe_tag = serializer.save(user=request.user)
+        autocomplete.entries_saved(("recipe_tag", recipe_tag))
         created = True
 
     if not recipe_tag.recipes.contains(recipe):
         recipe_tag.recipes.add(recipe)
+        documents.recipes_changed(recipe.id)
+        usage.record("recipe_tag", recipe_tag.id)
 
     serializer = serializers.RecipeTagAssociateSerializer(recipe_tag)
 
@@ -669,7 +753,15 @@ def recipe_tag_destroy(request, tag_id):
     recipe_tag = shortcuts.get_object_or_404(
         models.RecipeTag, pk=tag_id, user=request.user
     )
+    recipe_ids = list(recipe_tag.recipes.values_list("id", flat=True))
     recipe_tag.delete()
+    autocomplete.entries_deleted("recipe_tag", request.user.pk, tag_id)
+
+    if recipe_ids:
+        documents.recipes_changed(*recipe_ids)
+    else:
+        documents.vocabulary_changed(request.user.pk)
+
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -681,6 +773,7 @@ def recipe_tag_dissociate(request, tag_id, recipe_id):
         models.RecipeTag, pk=tag_id, recipes=recipe, user=request.user
     )
     recipe.recipe_tags.remove(recipe_tag)
+    documents.recipes_changed(recipe.id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -704,6 +797,13 @@ def recipe_tag_update(request, tag_id):
         )
 
     serializer.save()
+    autocomplete.entries_saved(("recipe_tag", recipe_tag))
+
+    if recipe_ids := list(recipe_tag.recipes.values_list("id", flat=True)):
+        documents.recipes_changed(*recipe_ids)
+    else:
+        documents.vocabulary_changed(request.user.pk)
+
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -732,30 +832,34 @@ def recipe_tag_update_for_recipe(request, tag_id, recipe_id):
         )
         recipe.recipe_tags.add(recipe_tag)
 
+    if was_saved:
+        autocomplete.entries_saved(("recipe_tag", recipe_tag))
+
+    documents.recipes_changed(recipe.id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def recipe_tag_search(request):
-    if not (search_term := request.query_params.get("search_term")):
-        return response.Response({"data": {"matches": []}})
-
-    recipe_tags = models.RecipeTag.objects.filter(
-        name__icontains=search_term, user=request.user
-    ).order_by(functions.Length("name").asc())[:MAX_AUTOCOMPLETE_MATCHES]
-
-    return response.Response({"data": {"matches": [r.name for r in recipe_tags]}})
+    return _vocabulary_search(request, "recipe_tag")
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
 def recipe_time(request, time_id):
     recipe_time = shortcuts.get_object_or_404(
-        models.RecipeTime, pk=time_id, recipe__user=request.user
+        models.RecipeTime.objects.select_related("recipe").defer("recipe__notes"),
+        pk=time_id,
+        recipe__user=request.user,
     )
+    etag = utils.build_etag("recipe_time", recipe_time.id, recipe_time.recipe.version)
+
+    if not_modified := utils.not_modified(request, etag):
+        return not_modified
+
     serializer = serializers.RecipeTimeSerializer(recipe_time)
-    return response.Response({"data": serializer.data})
+    return response.Response({"data": serializer.data}, headers={"ETag": etag})
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -779,6 +883,7 @@ def recipe_time_create(request, recipe_id):
         )
 
     serializer.save(recipe=recipe)
+    documents.recipes_changed(recipe.id)
     return response.Response({"data": serializer.data}, status=status.HTTP_201_CREATED)
 
 
@@ -789,6 +894,7 @@ def recipe_time_destroy(request, time_id):
         models.RecipeTime, pk=time_id, recipe__user=request.user
     )
     recipe_time.delete()
+    documents.recipes_changed(recipe_time.recipe_id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -818,37 +924,224 @@ def recipe_time_update(request, time_id):
         )
 
     recipe_time = serializer.save()
+    documents.recipes_changed(recipe_time.recipe_id)
     return response.Response(status=status.HTTP_204_NO_CONTENT)
 
 
-@rf_decorators.api_view(http_method_names=["POST"])
+recipe_title_update = _recipe_field_update_view(serializers.RecipeTitleUpdateSerializer)
+
+
+@rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipe_title_update(request, recipe_id):
-    recipe = shortcuts.get_object_or_404(models.Recipe, pk=recipe_id, user=request.user)
-    serializer = serializers.RecipeTitleUpdateSerializer(
-        data=request.data, instance=recipe
+def recipes(request):
+    try:
+        fields = documents.parse_fields(request.query_params.get("fields"))
+    except ValueError as error:
+        return response.Response(
+            {
+                "errors": {"fields": [_("Unknown fields: %s.") % error]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    query = serializers.RecipesQuerySerializer(data=request.query_params.dict())
+
+    if not query.is_valid():
+        return response.Response(
+            {
+                "errors": query.errors,
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    query = query.validated_data
+    # "pk" rather than "id", since summaries' primary key is their recipe.
+    sort = query["sort"].replace("id", "pk")
+    direction = "-" if sort.startswith("-") else ""
+    ordering = (sort,) if sort.lstrip("-") == "pk" else (sort, f"{direction}pk")
+    cursor = request.query_params.get("cursor")
+
+    try:
+        if cursor is not None:
+            cursor_fields = pagination.ordering_fields(models.RecipeSummary, ordering)
+            cursor = pagination.decode_cursor(cursor, ordering, cursor_fields)
+    except ValueError:
+        return response.Response(
+            {
+                "errors": {"cursor": [_("The cursor is invalid.")]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    # Every write to the user's recipes bumps their version, so the list can be
+    # revalidated with one lookup. The query string picks what's listed, so
+    # it's part of the ETag.
+    version, modified_at = _recipes_version(request.user)
+    etag = utils.build_etag(
+        "recipes", request.user.pk, version, request.META.get("QUERY_STRING", "")
     )
 
-    if not serializer.is_valid():
+    if not_modified := utils.not_modified(request, etag, modified_at):
+        return not_modified
+
+    headers = utils.validator_headers(etag, modified_at)
+
+    if fields is None:
+        recipes = models.RecipeSummary.objects.filter(user=request.user)
+        represent = compilers.compile_serializer(serializers.RecipesSerializer)
+
+        if "has_notes" in query:
+            recipes = recipes.filter(has_notes=query["has_notes"])
+    else:
+        # The sort fields are loaded too, for the next cursor.
+        loaded = {*fields, *(f.lstrip("-") for f in ordering if f.lstrip("-") != "pk")}
+        recipes = documents.document_queryset(loaded).filter(user=request.user)
+        represent = compilers.compile_serializer(serializers.RecipeSerializer, fields)
+
+        if "has_notes" in query:
+            notes = Q(notes="")
+            recipes = recipes.filter(~notes if query["has_notes"] else notes)
+
+    if "rating_min" in query:
+        recipes = recipes.filter(rating__gte=query["rating_min"])
+
+    if "servings_max" in query:
+        recipes = recipes.filter(servings__lte=query["servings_max"])
+
+    if "servings_min" in query:
+        recipes = recipes.filter(servings__gte=query["servings_min"])
+
+    if query["stream"]:
+        chunks = pagination.iterate(
+            recipes, ordering, cursor, settings.RECIPES_STREAM_CHUNK_SIZE
+        )
+        return http.StreamingHttpResponse(
+            streaming.json_envelope(
+                ([represent(r) for r in chunk] for chunk in chunks),
+                request.accepted_renderer,
+            ),
+            content_type=request.accepted_renderer.media_type,
+            headers=headers,
+        )
+
+    recipes, next_cursor = pagination.paginate(
+        recipes, ordering, cursor, settings.RECIPES_PAGE_SIZE
+    )
+    return response.Response(
+        {"data": [represent(r) for r in recipes], "next_cursor": next_cursor},
+        headers=headers,
+    )
+
+
+def _recipes_version(user):
+    # For conditional requests on views of the user's recipes.
+    return (
+        models.User.objects.filter(pk=user.pk)
+        .values_list("recipes_version", "recipes_modified_at")
+        .get()
+    )
+
+
+@rf_decorators.api_view(http_method_names=["GET"])
+@rf_decorators.permission_classes([permissions.IsAuthenticated])
+def recipes_batch(request):
+    try:
+        ids = list(
+            dict.fromkeys(
+                int(i) for i in request.query_params.get("ids", "").split(",")
+            )
+        )
+    except ValueError:
+        ids = []
+
+    if not ids or len(ids) > settings.RECIPES_BATCH_MAX_SIZE:
         return response.Response(
             {
-                "errors": serializer.errors,
+                "errors": {
+                    "ids": [
+                        _("Provide between 1 and %d recipe IDs.")
+                        % settings.RECIPES_BATCH_MAX_SIZE
+                    ]
+                },
                 "message": _("The information you provided was invalid."),
             },
             status=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
-    recipe = serializer.save()
-    return response.Response(status=status.HTTP_204_NO_CONTENT)
+    # Recipes that don't exist, and ones owned by other users, are reported the
+    # same way.
+    found = models.Recipe.objects.filter(pk__in=ids, user=request.user).only(
+        "id", "version"
+    )
+    found = {r.id: r for r in found}
+    recipes = [found[i] for i in ids if i in found]
+
+    return response.Response(
+        {
+            "data": {
+                "missing_ids": [i for i in ids if i not in found],
+                "recipes": documents.get_recipe_documents(recipes),
+            }
+        }
+    )
 
 
 @rf_decorators.api_view(http_method_names=["GET"])
 @rf_decorators.permission_classes([permissions.IsAuthenticated])
-def recipes(request):
-    # TODO paginate recipes
-    recipes = models.Recipe.objects.filter(user=request.user).all()
-    serializer = serializers.RecipesSerializer(recipes, many=True)
-    return response.Response({"data": serializer.data})
+def recipes_search(request):
+    query = request.query_params.get("q", "").strip()
+
+    if not query:
+        return response.Response(
+            {
+                "errors": {"q": [_("Enter something to search for.")]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    cursor = request.query_params.get("cursor")
+
+    try:
+        if cursor is not None:
+            cursor = pagination.decode_cursor(
+                cursor, search.ORDERING, search.ORDERING_FIELDS
+            )
+    except ValueError:
+        return response.Response(
+            {
+                "errors": {"cursor": [_("The cursor is invalid.")]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    # One extra match is read, to tell whether there's a next page.
+    page_size = settings.RECIPES_PAGE_SIZE
+    matches = search.search(request.user, query, cursor, page_size + 1)
+    next_cursor = None
+
+    if len(matches) > page_size:
+        matches = matches[:page_size]
+        next_cursor = pagination.encode_cursor(matches[-1], search.ORDERING)
+
+    found = models.RecipeSummary.objects.filter(
+        pk__in=[m.recipe_id for m in matches], user=request.user
+    )
+    found = {s.recipe_id: s for s in found}
+    represent = compilers.compile_serializer(serializers.RecipesSerializer)
+
+    return response.Response(
+        {
+            "data": [
+                represent(found[m.recipe_id]) for m in matches if m.recipe_id in found
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
 
 
 @rf_decorators.api_view(http_method_names=["POST"])
@@ -933,3 +1226,117 @@ def signup_confirmation(request):
         {"message": _("Your signup was successfully confirmed.")},
         status=status.HTTP_200_OK,
     )
+
+
+@rf_decorators.api_view(http_method_names=["GET"])
+@rf_decorators.permission_classes([permissions.IsAuthenticated])
+def sync(request):
+    # Returns the recipes changed or deleted since the cursor from a previous
+    # sync (or all of them, without one), and the cursor to sync from next.
+    ordering = ("pk",)
+    since = request.query_params.get("since")
+
+    try:
+        if since is None:
+            cursor = None
+        else:
+            cursor_fields = pagination.ordering_fields(models.RecipeChange, ordering)
+            cursor = pagination.decode_cursor(since, ordering, cursor_fields)
+    except ValueError:
+        return response.Response(
+            {
+                "errors": {"since": [_("The cursor is invalid.")]},
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    changes, next_cursor = pagination.paginate(
+        models.RecipeChange.objects.filter(user=request.user),
+        ordering,
+        cursor,
+        settings.SYNC_PAGE_SIZE,
+    )
+
+    if changes:
+        since = pagination.encode_cursor(changes[-1], ordering)
+
+    changed_ids = [c.recipe_id for c in changes if not c.deleted]
+    found = (
+        models.Recipe.objects.filter(pk__in=changed_ids, user=request.user).only(
+            "id", "version"
+        )
+        if changed_ids
+        else []
+    )
+    found = {r.id: r for r in found}
+    recipes = [found[i] for i in changed_ids if i in found]
+
+    return response.Response(
+        {
+            "data": {
+                "cursor": since,
+                "deleted_ids": [c.recipe_id for c in changes if c.deleted],
+                "has_more": next_cursor is not None,
+                "recipes": documents.get_recipe_documents(recipes),
+            }
+        }
+    )
+
+
+@rf_decorators.api_view(http_method_names=["GET"])
+@rf_decorators.permission_classes([permissions.IsAuthenticated])
+def vocabulary_search(request):
+    # Matches from several vocabularies at once, by kind name (see
+    # autocomplete.KIND_NAMES), for forms that autocomplete more than one.
+    # Their indexes are loaded with one query, if they aren't in memory.
+    query = serializers.VocabularySearchQuerySerializer(
+        data=request.query_params.dict()
+    )
+
+    if not query.is_valid():
+        return response.Response(
+            {
+                "errors": query.errors,
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    names = query.validated_data.get("kinds", list(autocomplete.KIND_NAMES))
+
+    if not (search_term := request.query_params.get("q")):
+        return response.Response({"data": {"matches": {n: [] for n in names}}})
+
+    kinds = [autocomplete.KIND_NAMES[n] for n in names]
+    matches = autocomplete.search(
+        request.user, search_term, kinds, fuzzy=query.validated_data["fuzzy"]
+    )
+    return response.Response(
+        {"data": {"matches": {n: matches[k] for n, k in zip(names, kinds)}}}
+    )
+
+
+def _vocabulary_search(request, kind):
+    # A vocabulary_search() for one kind, as the autocomplete views had before
+    # it.
+    query = serializers.VocabularySearchQuerySerializer(
+        data=request.query_params.dict()
+    )
+
+    if not query.is_valid():
+        return response.Response(
+            {
+                "errors": query.errors,
+                "message": _("The information you provided was invalid."),
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    if not (search_term := request.query_params.get("search_term")):
+        return response.Response({"data": {"matches": []}})
+
+    matches = autocomplete.search(
+        request.user, search_term, [kind], fuzzy=query.validated_data["fuzzy"]
+    )
+    return response.Response({"data": {"matches": matches[kind]}})
@@ -15,20 +15,30 @@ function RecipeList() {
 
   useEffect(() => {
     (async () => {
-      const response = await get({ route: "recipes" });
+      // The recipes come a page at a time, each with the cursor for the next.
+      const loaded = [];
+      let cursor = null;
 
-      // istanbul ignore next
-      if (isUnmounted()) {
-        return;
-      }
+      do {
+        const response = await get({ route: "recipes", routeData: { cursor } });
 
-      setIsLoading(false);
+        // istanbul ignore next
+        if (isUnmounted()) {
+          return;
+        }
+
+        if (response.isError) {
+          setIsLoading(false);
+          setLoadingError(response.message);
+          return;
+        }
 
-      if (response.isError) {
-        setLoadingError(response.message);
-      }
+        loaded.push(...response.data);
+        cursor = response.next_cursor;
+      } while (cursor);
 
-      setRecipes(response.data);
+      setIsLoading(false);
+      setRecipes(loaded);
     })();
   }, [get, isUnmounted]);
 
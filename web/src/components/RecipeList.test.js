@@ -73,3 +73,27 @@ describe("when the API returns a non-empty list of recipes", () => {
     expect(links.map((l) => l.text)).toEqual(recipes.map((r) => r.title));
   });
 });
+
+describe("when the API returns more than one page of recipes", () => {
+  it("requests every page and renders all of the recipes", async () => {
+    const recipes = [
+      { id: 1, title: "Recipe #1" },
+      { id: 2, title: "Recipe #2" },
+      { id: 3, title: "Recipe #3" },
+    ];
+    get
+      .mockResolvedValueOnce({ data: recipes.slice(0, 2), next_cursor: "abc" })
+      .mockResolvedValueOnce({ data: recipes.slice(2), next_cursor: null });
+    let container;
+    await act(async () => {
+      container = render(buildComponent());
+    });
+    expect(get.mock.calls.map((c) => c[0].routeData)).toEqual([
+      { cursor: null },
+      { cursor: "abc" },
+    ]);
+    const recipeList = container.getByTestId("recipe-list__list");
+    const links = within(recipeList).queryAllByRole("link");
+    expect(links.map((l) => l.text)).toEqual(recipes.map((r) => r.title));
+  });
+});
@@ -34,7 +34,7 @@ export const API_ROUTES = {
   recipeRating: ({ recipeId }) => `/api/recipe_rating/${recipeId}/`,
   recipeRatingDestroy: ({ recipeId }) => `/api/recipe_rating/${recipeId}/destroy/`,
   recipeRatingUpdate: ({ recipeId }) => `/api/recipe_rating/${recipeId}/update/`,
-  recipes: () => "/api/recipes/",
+  recipes: ({ cursor } = {}) => cursor ? `/api/recipes/?cursor=${encodeURIComponent(cursor)}` : "/api/recipes/",
   recipeServings: ({ recipeId }) => `/api/recipe_servings/${recipeId}/`,
   recipeServingsDestroy: ({ recipeId }) => `/api/recipe_servings/${recipeId}/destroy/`,
   recipeServingsUpdate: ({ recipeId }) => `/api/recipe_servings/${recipeId}/update/`,